@@ -0,0 +1,115 @@
+import math
+
+from django.db import connections
+from django.db.models import Aggregate, Case, When, Value, Count, FloatField, CharField
+from django.db.models.functions import Trunc
+
+DEFAULT_GROUP_BY = ("type", "request__channel")
+DEFAULT_PERCENTILES = (0.5, 0.95, 0.99)
+DEFAULT_BOUNDS = (1, 5, 10, 30, 60, 300, 900, 1800, 3600)  # seconds
+
+
+class PercentileCont(Aggregate):
+    """
+    PostgreSQL's continuous percentile aggregate: PERCENTILE_CONT(p) WITHIN GROUP (ORDER BY expression).
+    """
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def completed_tasks(since, until):
+    """
+    Returns the COMPLETED Validation Tasks that ended in [since, until), annotated with duration_seconds.
+    """
+
+    from .models import ValidationTask
+
+    return ValidationTask.objects.filter(
+        status=ValidationTask.Status.COMPLETED,
+        ended__gte=since,
+        ended__lt=until,
+        started__isnull=False,
+    ).with_duration()
+
+
+def _label(percentile):
+
+    return f"p{percentile * 100:g}".replace(".", "_")
+
+
+def duration_percentiles(since, until, percentiles=DEFAULT_PERCENTILES, group_by=DEFAULT_GROUP_BY):
+    """
+    Returns [{**group, count, p50, p95, ...}] of task durations (seconds) per group, eg. per task type and channel.
+    Uses PERCENTILE_CONT on PostgreSQL; elsewhere reads the two values around each percentile
+    per group with an ordered, offset query and interpolates linearly (same result as PERCENTILE_CONT).
+    """
+
+    tasks = completed_tasks(since, until)
+    labels = {_label(p): p for p in percentiles}
+
+    if connections[tasks.db].vendor == "postgresql":
+        return list(
+            tasks.values(*group_by)
+            .annotate(count=Count("id"), **{label: PercentileCont("duration_seconds", p) for label, p in labels.items()})
+            .order_by(*group_by)
+        )
+
+    rows = list(tasks.values(*group_by).annotate(count=Count("id")).order_by(*group_by))
+    for row in rows:
+        durations = tasks.filter(**{key: row[key] for key in group_by}).order_by("duration_seconds").values_list("duration_seconds", flat=True)
+        for label, p in labels.items():
+            position = p * (row["count"] - 1)
+            lower = math.floor(position)
+            values = list(durations[lower:lower + 2])
+            upper = values[1] if len(values) > 1 else values[0]
+            row[label] = values[0] + (upper - values[0]) * (position - lower)
+    return rows
+
+
+def duration_histogram(since, until, bounds=DEFAULT_BOUNDS, group_by=DEFAULT_GROUP_BY):
+    """
+    Returns [{**group, bucket, count}] of task durations per group, in buckets '<1', '1-5', ..., '>=3600' (seconds).
+    Buckets are assigned in the database.
+    """
+
+    labels = [f"<{bounds[0]}"] + [f"{lower}-{upper}" for lower, upper in zip(bounds, bounds[1:])]
+    bucket = Case(
+        *[When(duration_seconds__lt=upper, then=Value(label)) for upper, label in zip(bounds, labels)],
+        default=Value(f">={bounds[-1]}"),
+        output_field=CharField(),
+    )
+    order = {label: i for i, label in enumerate(labels + [f">={bounds[-1]}"])}
+    rows = list(
+        completed_tasks(since, until)
+        .annotate(bucket=bucket)
+        .values(*group_by, "bucket")
+        .annotate(count=Count("id"))
+        .order_by(*group_by)
+    )
+    return sorted(rows, key=lambda row: tuple(str(row[key]) for key in group_by) + (order[row["bucket"]],))
+
+
+def throughput(since, until, group_by=DEFAULT_GROUP_BY):
+    """
+    Returns [{**group, minute, count}]: the number of tasks completed per minute and group.
+    """
+
+    from .models import ValidationTask
+
+    return list(
+        ValidationTask.objects.filter(
+            status=ValidationTask.Status.COMPLETED,
+            ended__gte=since,
+            ended__lt=until,
+        )
+        .annotate(minute=Trunc("ended", "minute"))
+        .values(*group_by, "minute")
+        .annotate(count=Count("id"))
+        .order_by("minute", *group_by)
+    )
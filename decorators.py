@@ -1,11 +1,14 @@
 import functools
 import logging
+import time
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 
-from apps.ifc_validation_models.models import set_user_context  # TODO: for now needs to be absolute!
+from apps.ifc_validation_models.models import set_user_context, ConcurrentModificationError  # TODO: for now needs to be absolute!
 from .settings import DJANGO_DB_USER_CONTEXT
+from .locks import keyed_lock
 
 logger = logging.getLogger()
 
@@ -84,4 +87,53 @@ def requires_django_exclusive_table_lock(model, lock = 'ACCESS EXCLUSIVE'):
             return view_func(*args, **kwargs)
         return wrapper
     
-    return require_lock_decorator
\ No newline at end of file
+    return require_lock_decorator
+
+
+# instructs a function to require a lock on a single key (eg. one Validation Request) rather than a full table
+def requires_django_keyed_lock(model, key):
+    """
+    Decorator for keyed locks (see locks.keyed_lock); calls with different keys never block each other.
+    key is either a fixed value or a callable that derives it from the arguments of the decorated function.
+
+    example:
+        @requires_django_keyed_lock(ValidationRequest, key=lambda request_id, **kwargs: request_id)
+        def process(request_id, **kwargs)
+            ...
+    """
+    def require_lock_decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with keyed_lock(model, key(*args, **kwargs) if callable(key) else key):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return require_lock_decorator
+
+
+# instructs a function to be retried when it lost a race with a concurrent state change
+def retry_on_conflict(attempts=3, delay=0.05):
+    """
+    Decorator to retry a function that raised ConcurrentModificationError, waiting delay * attempt seconds in between.
+    Every attempt runs in its own atomic block and should (re)load the instances it changes.
+
+    example:
+        @retry_on_conflict(attempts=5)
+        def complete(task_id):
+            ValidationTask.objects.get(id=task_id).mark_as_completed()
+    """
+    def retry_decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    with transaction.atomic():
+                        return func(*args, **kwargs)
+                except ConcurrentModificationError as err:
+                    if attempt == attempts:
+                        raise
+                    logger.debug(f"Attempt {attempt} of {func.__name__} failed: {err}")
+                    time.sleep(delay * attempt)
+        return wrapper
+
+    return retry_decorator
@@ -0,0 +1,41 @@
+import functools
+
+try:
+    from ifcopenshell import ifcopenshell_wrapper
+except ImportError:  # optional; without it, counts that need the IFC class hierarchy are not derived
+    ifcopenshell_wrapper = None
+
+# entities counted as geometries of a Model: one per shape representation of a product
+GEOMETRY_TYPES = frozenset({"IfcShapeRepresentation"})
+
+# Model schema -> schema name known to IfcOpenShell
+SCHEMA_NAMES = {
+    "IFC4X3": "IFC4X3_ADD2",
+}
+
+
+@functools.cache
+def subtypes(schema, root):
+    """
+    Returns the names of root and all of its (indirect) subtypes in an IFC schema (eg. IfcElement in IFC4),
+    or None when IfcOpenShell is not installed or does not know the schema.
+    """
+
+    if ifcopenshell_wrapper is None or not schema:
+        return None
+    try:
+        declaration = ifcopenshell_wrapper.schema_by_name(SCHEMA_NAMES.get(schema, schema)).declaration_by_name(root)
+    except (RuntimeError, IndexError):
+        return None
+
+    names, pending = set(), [declaration]
+    while pending:
+        declaration = pending.pop()
+        names.add(declaration.name())
+        pending.extend(declaration.subtypes())
+    return frozenset(names)
+
+
+def element_types(schema):
+
+    return subtypes(schema, "IfcElement")
@@ -0,0 +1,189 @@
+import copy
+import json
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.query_utils import DeferredAttribute
+
+INLINE = "inline"
+COMPRESSED = "compressed"
+
+BATCH_SIZE = 2_000
+
+
+def storage():
+    """
+    Returns where new Model Instance fields are stored: 'inline' (JSON column) or 'compressed' (side table).
+    Configured via settings.INSTANCE_FIELDS_STORAGE.
+    """
+
+    from .settings import INSTANCE_FIELDS_STORAGE
+
+    if INSTANCE_FIELDS_STORAGE not in (INLINE, COMPRESSED):
+        raise ValueError(f"Unknown instance fields storage '{INSTANCE_FIELDS_STORAGE}' (expected one of {INLINE}, {COMPRESSED}).")
+    if INSTANCE_FIELDS_STORAGE == COMPRESSED:
+        check_whitelist()
+    return INSTANCE_FIELDS_STORAGE
+
+
+def check_whitelist():
+    """
+    Raises ImproperlyConfigured when whitelist fragments filter on 'instance__fields': these only match inline fields,
+    so offloading fields would silently change which Validation Outcomes are whitelisted.
+    """
+
+    from .models import WhiteListQueryFragment
+
+    fragments = WhiteListQueryFragment.objects.filter(column=WhiteListQueryFragment.OutcomeColumn.INSTANCE_FIELDS)
+    if fragments.exists():
+        raise ImproperlyConfigured(
+            f"Model Instance fields cannot be offloaded while whitelist fragments filter on instance fields "
+            f"(ids: {', '.join(str(id) for id in fragments.values_list('id', flat=True))}); "
+            f"remove these fragments or use '{INLINE}' storage."
+        )
+
+
+def compress(fields):
+
+    return zlib.compress(json.dumps(fields, separators=(",", ":")).encode())
+
+
+def decompress(data):
+
+    return json.loads(zlib.decompress(data))
+
+
+def _set_loaded(instance, fields):
+
+    instance.__dict__["fields"] = fields
+    if hasattr(instance, "_loaded_values"):
+        instance._loaded_values["fields"] = copy.deepcopy(fields)
+
+
+def prefetch(instances, using=None):
+    """
+    Loads the offloaded fields of a list of Model Instances, with one query per BATCH_SIZE instances.
+    """
+
+    from .models import ModelInstanceFields
+
+    pending = {instance.id: instance for instance in instances if instance.fields_offloaded and instance.__dict__.get("fields") is None}
+    ids = list(pending)
+    for start in range(0, len(ids), BATCH_SIZE):
+        rows = ModelInstanceFields.objects.using(using).filter(instance_id__in=ids[start:start + BATCH_SIZE]).values_list("instance_id", "data")
+        for instance_id, data in rows:
+            _set_loaded(pending[instance_id], decompress(data))
+
+
+class OffloadedFieldsDescriptor(DeferredAttribute):
+    """
+    Returns the fields of a Model Instance; offloaded fields are fetched from the side table
+    (and decompressed) on first access.
+    """
+
+    def __get__(self, instance, cls=None):
+
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if value is None and instance.pk is not None and instance.fields_offloaded and not getattr(instance, "_storing_fields", False):
+            prefetch([instance], using=instance._state.db)
+            value = instance.__dict__[self.field.attname]
+        return value
+
+    def __set__(self, instance, value):
+
+        # a data descriptor, so that __get__ is also called once the (None) value is loaded
+        instance.__dict__[self.field.attname] = value
+
+
+def store(pairs, using=None, overwrite=True):
+    """
+    Writes (Model Instance id, fields) pairs to the side table, compressed; returns the number of bytes stored.
+    Existing rows are overwritten, or kept as they are when overwrite=False.
+    """
+
+    from .models import ModelInstanceFields
+
+    rows = []
+    for instance_id, fields in pairs:
+        data = compress(fields)
+        rows.append(ModelInstanceFields(instance_id=instance_id, data=data, size=len(data)))
+    if overwrite:
+        ModelInstanceFields.objects.using(using).bulk_create(
+            rows, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=["instance"], update_fields=["data", "size"],
+        )
+    else:
+        ModelInstanceFields.objects.using(using).bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    return sum(row.size for row in rows)
+
+
+def clone(instances, model_id, using=None):
+    """
+    Bulk creates copies of a list of Model Instances in another Model; returns the copies, in the same order.
+    Fields are stored as storage() says: offloaded fields are copied from the side table as they are (still compressed),
+    with one query per BATCH_SIZE instances, and only decompressed or compressed when the storage differs.
+    """
+
+    from .models import ModelInstance, ModelInstanceFields
+    from .result_reuse import clone_values
+
+    offload = storage() == COMPRESSED
+    ids = [instance.id for instance in instances if instance.fields_offloaded]
+    stored = {}
+    for start in range(0, len(ids), BATCH_SIZE):
+        rows = ModelInstanceFields.objects.using(using).filter(instance_id__in=ids[start:start + BATCH_SIZE]).values_list("instance_id", "data")
+        stored.update((instance_id, bytes(data)) for instance_id, data in rows)
+
+    clones, data = [], []
+    for instance in instances:
+        fields = instance.__dict__.get("fields")  # not through the descriptor, which would load offloaded fields one by one
+        compressed = stored.get(instance.id)
+        if offload and fields is not None:
+            compressed = compress(fields)
+        elif not offload and compressed is not None:
+            fields = decompress(compressed)
+        offloaded = offload and compressed is not None
+        clones.append(ModelInstance(**clone_values(instance, model_id=model_id, fields=None if offloaded else fields, fields_offloaded=offloaded)))
+        data.append(compressed if offloaded else None)
+
+    ModelInstance.objects.using(using).bulk_create(clones)
+    ModelInstanceFields.objects.using(using).bulk_create(
+        [ModelInstanceFields(instance_id=clone.id, data=d, size=len(d)) for clone, d in zip(clones, data) if d is not None],
+        batch_size=BATCH_SIZE,
+    )
+    return clones
+
+
+def offload(queryset, batch_size=BATCH_SIZE, inline=False):
+    """
+    Moves the fields of the selected Model Instances to the side table (or back inline), in batches of batch_size,
+    one transaction per batch; returns (instances moved, JSON bytes, compressed bytes).
+    """
+
+    from .models import ModelInstance, ModelInstanceFields
+
+    if not inline:
+        check_whitelist()
+
+    moved = raw_bytes = stored_bytes = 0
+    queryset = queryset.filter(fields_offloaded=inline)
+    if not inline:
+        queryset = queryset.filter(fields__isnull=False)
+
+    while ids := list(queryset.order_by("id").values_list("id", flat=True)[:batch_size]):
+        with transaction.atomic(using=queryset.db):
+            instances = list(ModelInstance.objects.using(queryset.db).filter(id__in=ids).only("id", "fields", "fields_offloaded"))
+            if inline:
+                prefetch(instances, using=queryset.db)
+                for instance in instances:
+                    instance.fields_offloaded = False
+                ModelInstance.objects.using(queryset.db).bulk_update(instances, ["fields", "fields_offloaded"])
+                ModelInstanceFields.objects.using(queryset.db).filter(instance_id__in=ids).delete()
+            else:
+                stored_bytes += store(((instance.id, instance.fields) for instance in instances), using=queryset.db)
+                raw_bytes += sum(len(json.dumps(instance.fields, separators=(",", ":"))) for instance in instances)
+                ModelInstance._base_manager.using(queryset.db).filter(id__in=ids).update(fields=None, fields_offloaded=True)
+        moved += len(ids)
+    return moved, raw_bytes, stored_bytes
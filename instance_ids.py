@@ -0,0 +1,153 @@
+import bisect
+import mmap
+import operator
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from itertools import islice
+
+try:
+    import numpy
+except ImportError:  # optional; falls back to array buffers and bisect
+    numpy = None
+
+MAGIC = b"IFCIDS01"
+HEADER = struct.Struct("=8sQ")  # magic, number of instances; keeps the buffers that follow 8-byte aligned
+MISSING = 0  # Model Instance ids start at 1
+LOAD_CHUNK_SIZE = 50_000
+
+
+def _is_strictly_increasing(values):
+
+    if numpy is not None:
+        return bool(numpy.all(values[1:] > values[:-1]))
+    return all(map(operator.lt, values, islice(values, 1, None)))
+
+
+class InstanceIdResolver(Mapping):
+    """
+    Maps the stepfile ids of a Model to Model Instance ids, kept in two sorted int64 buffers (16 bytes per instance,
+    a small fraction of a dict of boxed ints). Batches of stepfile ids are resolved with a binary search,
+    vectorized when NumPy is installed. A resolver can be saved to a file and memory-mapped, so that
+    worker processes share the pages of a single copy.
+    """
+
+    def __init__(self, stepfile_ids, ids, buffer=None):
+
+        self.stepfile_ids = stepfile_ids  # sorted, unique
+        self.ids = ids
+        self._buffer = buffer  # the mmap backing the buffers, if any
+
+    @classmethod
+    def from_arrays(cls, stepfile_ids, ids):
+        """
+        Returns a resolver for parallel array('q') buffers of stepfile ids and Model Instance ids (in any order).
+        Of duplicate stepfile ids, the last one wins.
+        """
+
+        if numpy is not None:
+            stepfile_ids = numpy.asarray(stepfile_ids, dtype=numpy.int64)
+            ids = numpy.asarray(ids, dtype=numpy.int64)
+            if not _is_strictly_increasing(stepfile_ids):
+                order = numpy.argsort(stepfile_ids, kind="stable")
+                stepfile_ids, ids = stepfile_ids[order], ids[order]
+                last = numpy.append(stepfile_ids[1:] != stepfile_ids[:-1], True)
+                stepfile_ids, ids = stepfile_ids[last], ids[last]
+            return cls(stepfile_ids, ids)
+
+        if not _is_strictly_increasing(stepfile_ids):
+            pairs = sorted(dict(zip(stepfile_ids, ids)).items())
+            stepfile_ids = array("q", (stepfile_id for stepfile_id, _ in pairs))
+            ids = array("q", (id for _, id in pairs))
+        return cls(stepfile_ids, ids)
+
+    @classmethod
+    def load(cls, model, using=None):
+        """
+        Returns a resolver for the Model Instances of a Model (or Model id), read in chunks ordered by stepfile id.
+        """
+
+        from .models import ModelInstance
+
+        model_id = getattr(model, "id", model)
+        stepfile_ids, ids = array("q"), array("q")
+        rows = (
+            ModelInstance.objects.using(using)
+            .filter(model_id=model_id)
+            .order_by("stepfile_id")
+            .values_list("stepfile_id", "id")
+            .iterator(chunk_size=LOAD_CHUNK_SIZE)
+        )
+        for stepfile_id, id in rows:
+            stepfile_ids.append(stepfile_id)
+            ids.append(id)
+        return cls.from_arrays(stepfile_ids, ids)
+
+    def save(self, path):
+        """
+        Writes the buffers to a file; the file is replaced atomically, so it can be opened by other processes at any time.
+        """
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self)))
+            f.write(memoryview(self.stepfile_ids))
+            f.write(memoryview(self.ids))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Returns a resolver backed by a read-only memory map of a file written by save().
+        """
+
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a saved InstanceIdResolver.")
+
+        start, middle, end = HEADER.size, HEADER.size + 8 * count, HEADER.size + 16 * count
+        if numpy is not None:
+            stepfile_ids = numpy.frombuffer(buffer, dtype=numpy.int64, count=count, offset=start)
+            ids = numpy.frombuffer(buffer, dtype=numpy.int64, count=count, offset=middle)
+        else:
+            view = memoryview(buffer)
+            stepfile_ids, ids = view[start:middle].cast("q"), view[middle:end].cast("q")
+        return cls(stepfile_ids, ids, buffer)
+
+    @property
+    def nbytes(self):
+
+        return memoryview(self.stepfile_ids).nbytes + memoryview(self.ids).nbytes
+
+    def __len__(self):
+
+        return len(self.stepfile_ids)
+
+    def __iter__(self):
+
+        return (int(stepfile_id) for stepfile_id in self.stepfile_ids)
+
+    def __getitem__(self, stepfile_id):
+
+        i = bisect.bisect_left(self.stepfile_ids, stepfile_id)
+        if i == len(self.stepfile_ids) or self.stepfile_ids[i] != stepfile_id:
+            raise KeyError(stepfile_id)
+        return int(self.ids[i])
+
+    def resolve(self, stepfile_ids, missing=MISSING):
+        """
+        Returns the Model Instance ids of a batch of stepfile ids, as a NumPy or array('q') buffer,
+        with missing for stepfile ids that are not in the Model.
+        """
+
+        if numpy is None:
+            return array("q", (self.get(stepfile_id, missing) for stepfile_id in stepfile_ids))
+
+        stepfile_ids = numpy.asarray(stepfile_ids, dtype=numpy.int64)
+        if not len(self):
+            return numpy.full(stepfile_ids.shape, missing, dtype=numpy.int64)
+        positions = numpy.minimum(numpy.searchsorted(self.stepfile_ids, stepfile_ids), len(self) - 1)
+        return numpy.where(self.stepfile_ids[positions] == stepfile_ids, self.ids[positions], missing)
@@ -0,0 +1,199 @@
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+from django.db.transaction import TransactionManagementError
+
+try:
+    import fcntl
+except ImportError:  # eg. Windows
+    fcntl = None
+
+
+@dataclass
+class KeyedLockMetrics:
+    """
+    Counters reported by keyed locks; wait times are in seconds.
+    """
+
+    acquisitions: int = 0
+    contended: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self):
+
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+    def as_dict(self):
+
+        return {**asdict(self), "mean_wait": self.mean_wait}
+
+
+_metrics = KeyedLockMetrics()
+_metrics_lock = threading.Lock()
+
+
+def _record(wait, contended):
+
+    with _metrics_lock:
+        _metrics.acquisitions += 1
+        _metrics.contended += int(contended)
+        _metrics.total_wait += wait
+        _metrics.max_wait = max(_metrics.max_wait, wait)
+
+
+def metrics():
+    """
+    Returns acquisition/contention counters and wait times of all keyed locks in this process.
+    """
+
+    with _metrics_lock:
+        return _metrics.as_dict()
+
+
+def reset_metrics():
+
+    global _metrics
+    with _metrics_lock:
+        _metrics = KeyedLockMetrics()
+
+
+def lock_id(model, key):
+    """
+    Maps (model, key) to a signed 64-bit integer, as used by PostgreSQL advisory locks.
+    """
+
+    name = f"{model._meta.db_table}:{key}".encode()
+    return int.from_bytes(hashlib.blake2b(name, digest_size=8).digest(), "big", signed=True)
+
+
+def _advisory_lock(using, id):
+
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [id])
+        if cursor.fetchone()[0]:
+            return False
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [id])
+        return True
+
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+_held = threading.local()
+
+
+def lock_stripe(id):
+    """
+    Maps a lock id to one of settings.LOCK_FILES lock files (stripes), so that LOCK_DIR does not grow with the number of keys.
+    Keys sharing a stripe exclude each other, which is harmless as locks are only held briefly.
+    """
+
+    from .settings import LOCK_FILES
+
+    return id % LOCK_FILES
+
+
+@contextlib.contextmanager
+def _file_lock(stripe):
+
+    from .settings import LOCK_DIR
+
+    if fcntl is None:
+        with _thread_locks_guard:
+            lock = _thread_locks.setdefault(stripe, threading.Lock())
+        contended = not lock.acquire(blocking=False)
+        if contended:
+            lock.acquire()
+        try:
+            yield contended
+        finally:
+            lock.release()
+        return
+
+    with open(os.path.join(LOCK_DIR, f"{stripe:04x}.lock"), "a") as fd:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            contended = False
+        except BlockingIOError:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            contended = True
+        try:
+            yield contended
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def keyed_lock(model, key, using=None):
+    """
+    Context manager that runs its body in a transaction holding an exclusive lock on (model, key),
+    eg. a single Validation Request, instead of locking the whole table.
+    Uses pg_advisory_xact_lock on PostgreSQL, otherwise a file lock on one of settings.LOCK_FILES files
+    in settings.LOCK_DIR (see lock_stripe); either way the lock is held until the transaction has ended.
+    A file lock cannot outlive the transaction that keyed_lock() opened itself, so on other backends
+    keyed_lock() raises TransactionManagementError inside a transaction that was not opened by keyed_lock().
+    Locks are re-entrant: nesting keyed_lock() for the same key in one thread does not block.
+
+    example:
+        with keyed_lock(ValidationRequest, request.id):
+            ...
+    """
+
+    using = using or DEFAULT_DB_ALIAS
+    id = lock_id(model, key)
+    start = time.monotonic()
+    stripe = lock_stripe(id)
+    held = getattr(_held, "stripes", {})
+    reentrant = any(stripe in stripes for stripes in held.values())  # also for another key on a stripe that is held
+
+    if connections[using].vendor == "postgresql":
+        with transaction.atomic(using=using):
+            contended = _advisory_lock(using, id)
+            _record(time.monotonic() - start, contended)
+            yield
+    elif using in held:
+        # nested in a keyed_lock() transaction: keep the lock until that transaction has ended
+        if not reentrant:
+            contended = held[using].enter_context(_file_lock(stripe))
+            _record(time.monotonic() - start, contended)
+            held[using].stripes.add(stripe)
+        with transaction.atomic(using=using):
+            yield
+    elif connections[using].in_atomic_block:
+        raise TransactionManagementError(
+            f"keyed_lock() cannot be used inside a transaction on {connections[using].vendor}, "
+            f"as its lock would be released before that transaction has ended."
+        )
+    else:
+        with _HeldStripes() as stripes:
+            if not reentrant:
+                contended = stripes.enter_context(_file_lock(stripe))
+                _record(time.monotonic() - start, contended)
+                stripes.stripes.add(stripe)
+            _held.stripes = {**held, using: stripes}
+            try:
+                with transaction.atomic(using=using):
+                    yield
+            finally:
+                _held.stripes = held
+
+
+class _HeldStripes(contextlib.ExitStack):
+    """
+    File locks held by the outermost keyed_lock() of a thread, released together when its transaction has ended.
+    """
+
+    def __init__(self):
+
+        super().__init__()
+        self.stripes = set()
+
+    def __contains__(self, stripe):
+
+        return stripe in self.stripes
@@ -0,0 +1,56 @@
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.ifc_validation_models.models import Model, ModelInstance, INSTANCE_UPSERT_BATCH_SIZE
+from apps.ifc_validation_models.instance_ids import InstanceIdResolver
+from apps.ifc_validation_models.settings import DJANGO_DB_USER_CONTEXT
+
+
+class Command(BaseCommand):
+    help = "Measure the throughput of creating Model Instances row-by-row and with bulk_upsert(); all changes are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--instances", type=int, default=100_000, help="number of Model Instances to upsert")
+        parser.add_argument("--batch-size", type=int, default=INSTANCE_UPSERT_BATCH_SIZE, help="rows per INSERT ... ON CONFLICT chunk")
+        parser.add_argument("--row-by-row", type=int, default=2_000, help="number of Model Instances to create one by one, as a baseline")
+
+    def timed(self, label, count, func):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"  {label:<28} {count:>9} rows in {elapsed:8.2f}s = {count / elapsed if elapsed else 0:>10.0f} rows/s")
+        return result
+
+    def handle(self, *args, **opts):
+        user = get_user_model().objects.get(username=DJANGO_DB_USER_CONTEXT)
+        rows = [(i, "IfcWall", {"Name": f"Wall #{i}", "GlobalId": f"{i:022d}"}) for i in range(1, opts["instances"] + 1)]
+        baseline = rows[:opts["row_by_row"]]
+
+        self.stdout.write(f"Database: {connection.vendor}, batch size {opts['batch_size']}")
+        with transaction.atomic():
+            model = Model.objects.create(file_name="benchmark.ifc", size=0, uploaded_by=user)
+
+            def row_by_row():
+                for stepfile_id, ifc_type, fields in baseline:
+                    ModelInstance.objects.get_or_create(model=model, stepfile_id=stepfile_id, defaults={"ifc_type": ifc_type, "fields": fields})
+            self.timed("row-by-row get_or_create", len(baseline), row_by_row)
+            model.instances.all().delete()
+
+            upsert = ModelInstance.objects.bulk_upsert
+            self.timed("bulk_upsert (insert)", len(rows), lambda: upsert(model, rows, batch_size=opts["batch_size"]))
+            self.timed("bulk_upsert (do nothing)", len(rows), lambda: upsert(model, rows, batch_size=opts["batch_size"]))
+            id_map = self.timed("bulk_upsert (do update)", len(rows), lambda: upsert(model, rows, update=True, batch_size=opts["batch_size"]))
+            resolver = self.timed("InstanceIdResolver.load", len(rows), lambda: InstanceIdResolver.load(model))
+            self.timed("resolve (batch)", len(rows), lambda: resolver.resolve([stepfile_id for stepfile_id, _, _ in rows]))
+
+            as_dict = dict(resolver.items())
+            dict_bytes = sys.getsizeof(as_dict) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in as_dict.items())
+            self.stdout.write(f"  resolver: {resolver.nbytes / 1024:.0f} KiB, equivalent dict: {dict_bytes / 1024:.0f} KiB")
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(f"Mapped {len(id_map)} stepfile id(s); all changes were rolled back."))
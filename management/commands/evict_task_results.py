@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.ifc_validation_models.models import TaskResult
+from apps.ifc_validation_models.settings import TASK_RESULT_RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    help = "Evict per-task cached results by retention policy, or invalidate those of a Gherkin Feature (version)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--unused-days", type=int, default=TASK_RESULT_RETENTION_DAYS, help="evict entries not reused for this many days")
+        parser.add_argument("--max-entries", type=int, help="keep at most this many (most recently used) entries")
+        parser.add_argument("--feature", help="only invalidate the entries with results of this Gherkin Feature")
+        parser.add_argument("--feature-version", type=int, help="only invalidate the entries of this version of --feature")
+
+    def handle(self, *args, **opts):
+        if opts["feature"]:
+            deleted = TaskResult.objects.invalidate_feature(opts["feature"], opts["feature_version"])
+            self.stdout.write(self.style.SUCCESS(f"Invalidated {deleted} Task Result(s) of '{opts['feature']}'."))
+            return
+
+        deleted = TaskResult.objects.evict(
+            unused_for=datetime.timedelta(days=opts["unused_days"]),
+            max_entries=opts["max_entries"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Evicted {deleted} Task Result(s)."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.ifc_validation_models.models import ModelInstance
+from apps.ifc_validation_models.instance_fields import offload, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Move the fields of existing Model Instances to the compressed side table (or back inline), in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", type=int, action="append", help="only the Model Instances of this Model id (repeatable)")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Model Instances per batch (and transaction)")
+        parser.add_argument("--inline", action="store_true", help="move offloaded fields back into the Model Instance table")
+
+    def handle(self, *args, **opts):
+        instances = ModelInstance.objects.all()
+        if opts["model"]:
+            instances = instances.filter(model_id__in=opts["model"])
+
+        moved, raw_bytes, stored_bytes = offload(instances, batch_size=opts["batch_size"], inline=opts["inline"])
+        if opts["inline"]:
+            self.stdout.write(self.style.SUCCESS(f"Moved the fields of {moved} Model Instance(s) back inline."))
+        else:
+            ratio = raw_bytes / stored_bytes if stored_bytes else 0
+            self.stdout.write(self.style.SUCCESS(
+                f"Offloaded the fields of {moved} Model Instance(s): {raw_bytes} bytes of JSON stored in {stored_bytes} bytes ({ratio:.1f}x)."
+            ))
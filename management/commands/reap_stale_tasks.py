@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.ifc_validation_models.reaper import reap_stale_tasks, FAIL, REQUEUE, PAST_TENSE
+
+
+class Command(BaseCommand):
+    help = "Fail or requeue INITIATED Validation Tasks that exceeded TASK_TIMEOUT_LIMIT or whose worker process died."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--action", choices=[FAIL, REQUEUE], default=FAIL, help="what to do with stale tasks")
+        parser.add_argument("--timeout", type=float, help="seconds after which an INITIATED task is stale, default is TASK_TIMEOUT_LIMIT")
+        parser.add_argument("--check-pids", action="store_true", help="also reap tasks whose process_id no longer exists on this machine")
+        parser.add_argument("--interval", type=float, help="keep reaping every INTERVAL seconds instead of once")
+
+    def handle(self, *args, **opts):
+        while True:
+            result = reap_stale_tasks(action=opts["action"], timeout=opts["timeout"], check_pids=opts["check_pids"])
+            self.stdout.write(
+                f"Found {result.found} stale Validation Task(s) "
+                f"({len(result.timed_out)} timed out, {len(result.dead_process)} without process, "
+                f"max {result.max_overdue:.0f}s overdue); "
+                f"{PAST_TENSE[opts['action']]} {len(result.tasks)} Validation Task(s) and {len(result.requests)} Validation Request(s) "
+                f"in {result.elapsed * 1000:.1f} ms."
+            )
+            if opts["interval"] is None:
+                break
+            time.sleep(opts["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Done."))
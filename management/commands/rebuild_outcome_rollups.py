@@ -0,0 +1,25 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.ifc_validation_models.models import OutcomeRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Outcome Rollups for a range of days from the Validation Outcomes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", required=True, type=datetime.date.fromisoformat, help="first day to rebuild (YYYY-MM-DD)")
+        parser.add_argument("--until", type=datetime.date.fromisoformat, help="last day to rebuild (YYYY-MM-DD), default is today")
+        parser.add_argument("--workers", type=int, default=1, help="number of days rebuilt in parallel")
+
+    def handle(self, *args, **opts):
+        since = opts["since"]
+        until = opts["until"] or timezone.localdate()
+        if until < since:
+            raise CommandError(f"--until ({until}) is before --since ({since}).")
+
+        rows = OutcomeRollup.rebuild(since, until, workers=opts["workers"])
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup(s) for {since} - {until}."))
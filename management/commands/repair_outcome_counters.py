@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.ifc_validation_models.models import ValidationRequest, ValidationTask
+
+
+class Command(BaseCommand):
+    help = "Recompute the Outcome counters of Validation Tasks and Validation Requests (eg. after a whitelist change)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="number of Validation Requests per transaction")
+        parser.add_argument("--since-id", type=int, default=0, help="only repair Validation Requests with a higher id")
+
+    def handle(self, *args, **opts):
+        chunk_size = opts["chunk_size"]
+        request_ids = list(
+            ValidationRequest.objects
+            .filter(id__gt=opts["since_id"])
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        tasks = 0
+        for start in range(0, len(request_ids), chunk_size):
+            chunk = request_ids[start:start + chunk_size]
+            with transaction.atomic():
+                tasks += ValidationTask.objects.filter(request_id__in=chunk).recompute_outcome_counters(include_requests=False)
+                ValidationRequest.objects.filter(id__in=chunk).recompute_outcome_counters()
+            self.stdout.write(f"Repaired Validation Requests #{chunk[0]} - #{chunk[-1]}")
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired {len(request_ids)} Validation Request(s) and {tasks} Validation Task(s)."))
@@ -0,0 +1,49 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.ifc_validation_models.models import ValidationRequest
+from apps.ifc_validation_models.scheduling import SchedulingPolicy, SimulatedRequest, FIFO, MB, simulate
+
+
+class Command(BaseCommand):
+    help = "Replay historic Validation Requests against FIFO and a scheduling policy and compare waiting times."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", required=True, type=datetime.date.fromisoformat, help="first day to replay (YYYY-MM-DD)")
+        parser.add_argument("--until", type=datetime.date.fromisoformat, help="last day to replay (YYYY-MM-DD), default is today")
+        parser.add_argument("--workers", type=int, default=4, help="number of simulated workers")
+        parser.add_argument("--throughput", type=float, default=10, help="simulated processing speed (MB/s)")
+        parser.add_argument("--webui-priority", type=float, default=300, help="priority of WEBUI requests (seconds)")
+        parser.add_argument("--size-weight", type=float, default=60, help="penalty per doubling of the file size (seconds)")
+        parser.add_argument("--fair-share-weight", type=float, default=120, help="penalty per running request of a user (seconds)")
+
+    def handle(self, *args, **opts):
+        since = opts["since"]
+        until = opts["until"] or timezone.localdate()
+        if until < since:
+            raise CommandError(f"--until ({until}) is before --since ({since}).")
+
+        requests = [
+            SimulatedRequest(*values)
+            for values in ValidationRequest.objects
+            .filter(created__date__gte=since, created__date__lte=until)
+            .values_list("id", "created", "channel", "size", "created_by_id")
+        ]
+        policy = SchedulingPolicy(
+            channel_priority={ValidationRequest.Channel.WEBUI: opts["webui_priority"]},
+            size_weight=opts["size_weight"],
+            fair_share_weight=opts["fair_share_weight"],
+        )
+
+        for name, candidate in (("FIFO", FIFO), ("policy", policy)):
+            result = simulate(candidate, requests, workers=opts["workers"], throughput=opts["throughput"] * MB)
+            self.stdout.write(f"{name}: makespan {result.makespan:.0f}s")
+            for channel, stats in sorted(result.summary(by="channel").items()):
+                self.stdout.write(
+                    f"  {channel:<6} n={stats['count']:<6} mean={stats['mean_wait']:.1f}s "
+                    f"p95={stats['p95_wait']:.1f}s max={stats['max_wait']:.1f}s"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Replayed {len(requests)} Validation Request(s) for {since} - {until}."))
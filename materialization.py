@@ -0,0 +1,211 @@
+import json
+import logging
+import tempfile
+from array import array
+from collections import Counter
+from dataclasses import dataclass, asdict
+
+from .instance_ids import InstanceIdResolver, MISSING
+
+logger = logging.getLogger(__name__)
+
+EAGER = "eager"
+LAZY = "lazy"
+
+OUTCOME_CHUNK_SIZE = 5_000
+
+
+class InstanceSource:
+    """
+    A temporary, per-Model store of the entities of a file (stepfile_id, ifc_type, fields), spooled to a temporary file
+    as JSON lines with an in-memory offset index, so that Model Instances can be created from it later on.
+    """
+
+    def __init__(self, directory=None):
+
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.count = 0
+        self.nbytes = 0
+        self.type_counts = Counter()  # IFC Type name -> number of entities
+        self._stepfile_ids, self._offsets = array("q"), array("q")
+        self._index = None
+
+    def add(self, stepfile_id, ifc_type, fields=None):
+
+        line = json.dumps([ifc_type, fields], separators=(",", ":")).encode() + b"\n"
+        self.file.seek(0, 2)
+        self._stepfile_ids.append(stepfile_id)
+        self._offsets.append(self.file.tell())
+        self.file.write(line)
+        self._index = None
+        self.count += 1
+        self.nbytes += len(line)
+        self.type_counts[ifc_type] += 1
+
+    def _read(self, offset):
+
+        self.file.seek(offset)
+        line = self.file.readline()
+        ifc_type, fields = json.loads(line)
+        return ifc_type, fields, len(line)
+
+    def fetch(self, stepfile_ids):
+        """
+        Returns [(stepfile_id, ifc_type, fields, size in bytes)] of the stepfile ids that are in the source, read in file order.
+        """
+
+        if self._index is None:
+            self._index = InstanceIdResolver.from_arrays(self._stepfile_ids, self._offsets)
+        found = sorted((self._index[stepfile_id], stepfile_id) for stepfile_id in set(stepfile_ids) if stepfile_id in self._index)
+        return [(stepfile_id, *self._read(offset)) for offset, stepfile_id in found]
+
+    def __iter__(self):
+
+        self.file.seek(0)
+        for stepfile_id, line in zip(self._stepfile_ids, self.file):
+            ifc_type, fields = json.loads(line)
+            yield stepfile_id, ifc_type, fields
+
+    def close(self):
+
+        self.file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+
+@dataclass
+class MaterializationMetrics:
+    """
+    Counters of an InstanceMaterializer; bytes are the size of the entities in the source (JSON).
+    """
+
+    source_rows: int = 0
+    source_bytes: int = 0
+    materialized_rows: int = 0
+    materialized_bytes: int = 0
+
+    @property
+    def rows_avoided(self):
+
+        return self.source_rows - self.materialized_rows
+
+    @property
+    def bytes_avoided(self):
+
+        return self.source_bytes - self.materialized_bytes
+
+    def as_dict(self):
+
+        return {**asdict(self), "rows_avoided": self.rows_avoided, "bytes_avoided": self.bytes_avoided}
+
+
+class InstanceMaterializer:
+    """
+    Creates the Model Instances of a Model from an InstanceSource, either all of them up front (eager)
+    or only those referenced by a Validation Outcome, when the first Outcome referencing them is created (lazy).
+    The mode defaults to settings.INSTANCE_MATERIALIZATION.
+    Either way, the type histogram of the Model counts all entities of the source; in lazy mode it is filled from the source
+    and the Model is flagged as not (fully) materialized.
+    """
+
+    def __init__(self, model, source, mode=None):
+
+        from .settings import INSTANCE_MATERIALIZATION
+
+        self.model = model
+        self.source = source
+        self.mode = mode or INSTANCE_MATERIALIZATION
+        if self.mode not in (EAGER, LAZY):
+            raise ValueError(f"Unknown instance materialization mode '{self.mode}' (expected one of {EAGER}, {LAZY}).")
+        self.ids = {}  # lazy: stepfile_id -> Model Instance id, of the (referenced) instances materialized so far
+        self.resolver = None  # eager: InstanceIdResolver of all instances
+        self.types_counted = False
+        self.metrics = MaterializationMetrics(source_rows=source.count, source_bytes=source.nbytes)
+
+    def materialize_all(self):
+
+        from .models import Model, ModelInstance
+
+        self.resolver = ModelInstance.objects.bulk_upsert(self.model, self.source)
+        # all entities of the file are in, so counts derived from the type histogram are complete
+        (self.model if isinstance(self.model, Model) else Model.objects.get(id=self.model)).derive_instance_counts()
+        self.metrics.materialized_rows = self.metrics.source_rows
+        self.metrics.materialized_bytes = self.metrics.source_bytes
+
+    def count_types(self):
+        """
+        Lazy mode: fills the type histogram of the Model from the source (once) and derives its instance counts.
+        """
+
+        from .models import Model, ModelTypeHistogram
+
+        if self.types_counted:
+            return
+        model = self.model if isinstance(self.model, Model) else Model.objects.get(id=self.model)
+        model.instances_materialized = False
+        model.save(update_fields=["instances_materialized", "updated"])
+        ModelTypeHistogram.objects.set_counts(model, self.source.type_counts)
+        model.derive_instance_counts()
+        self.types_counted = True
+
+    def resolve(self, stepfile_ids):
+        """
+        Returns {stepfile_id: Model Instance id} for a batch of stepfile ids, creating the missing Model Instances
+        (in lazy mode) in a single bulk upsert; stepfile ids that are not in the source are left out.
+        """
+
+        from .models import ModelInstance
+
+        if self.mode == EAGER:
+            if self.resolver is None:
+                self.materialize_all()
+            ids = self.resolver.resolve(stepfile_ids)
+            return {stepfile_id: int(id) for stepfile_id, id in zip(stepfile_ids, ids) if id != MISSING}
+
+        self.count_types()
+        missing = {stepfile_id for stepfile_id in stepfile_ids if stepfile_id not in self.ids}
+        if missing:
+            rows = self.source.fetch(missing)
+            resolver = ModelInstance.objects.bulk_upsert(self.model, ((s, t, f) for s, t, f, _ in rows), count_types=False)
+            self.ids.update(resolver.items())
+            self.metrics.materialized_rows += len(rows)
+            self.metrics.materialized_bytes += sum(size for *_, size in rows)
+        return {stepfile_id: self.ids[stepfile_id] for stepfile_id in stepfile_ids if stepfile_id in self.ids}
+
+    def create_outcomes(self, outcomes, batch_size=OUTCOME_CHUNK_SIZE):
+        """
+        Bulk creates Validation Outcomes from (stepfile_id or None, ValidationOutcome) pairs in chunks,
+        linking each Outcome to the Model Instance of its stepfile id; returns the number of Outcomes created.
+        """
+
+        from .models import ValidationOutcome
+
+        if self.mode == LAZY:
+            self.count_types()  # also when no Outcome references an instance
+        created = 0
+        chunk = []
+
+        def flush():
+            ids = self.resolve([stepfile_id for stepfile_id, _ in chunk if stepfile_id is not None])
+            for stepfile_id, outcome in chunk:
+                if stepfile_id is not None:
+                    outcome.instance_id = ids.get(stepfile_id)
+            ValidationOutcome.objects.bulk_create([outcome for _, outcome in chunk])
+            chunk.clear()
+
+        for pair in outcomes:
+            chunk.append(pair)
+            created += 1
+            if len(chunk) == batch_size:
+                flush()
+        if chunk:
+            flush()
+
+        logger.info(f"Materialized {self.metrics.materialized_rows} of {self.metrics.source_rows} Model Instance(s) ({self.mode}) for {created} Validation Outcome(s).")
+        return created
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0028_alter_whitelistentry_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validationtask',
+            name='is_rolled_up',
+            field=models.BooleanField(default=False, help_text='Flag to indicate the Outcomes of this Validation Task are included in the Outcome Rollups.'),
+        ),
+        migrations.CreateModel(
+            name='OutcomeRollup',
+            fields=[
+                ('id', models.BigAutoField(help_text='Identifier of the Outcome Rollup (auto-generated).', primary_key=True, serialize=False)),
+                ('schema', models.CharField(blank=True, default='', help_text='Schema of the Models (empty if unknown).', max_length=25)),
+                ('task_type', models.CharField(choices=[('MAGIC_AND_CLAMAV', 'File magic and anti-virus checks'), ('SYNTAX', 'STEP Physical File Syntax'), ('HEADER_SYNTAX', 'STEP Physical File Syntax (HEADER section)'), ('SCHEMA', 'Schema (EXPRESS language)'), ('MVD', 'Model View Definitions'), ('BSDD', 'bSDD Compliance'), ('INFO', 'Parse Info'), ('PREREQ', 'Prerequisites'), ('HEADER', 'Header Validation'), ('NORMATIVE_IA', 'Implementer Agreements (IA)'), ('NORMATIVE_IP', 'Informal Propositions (IP)'), ('INDUSTRY', 'Industry Practices'), ('INST_COMPLETION', 'Instance Completion'), ('DIGITAL_SIGNATURES', 'Digital Signatures')], help_text='Type of the Validation Task.', max_length=25)),
+                ('feature', models.CharField(blank=True, default='', help_text='Name of the Gherkin Feature (empty if none).', max_length=1024)),
+                ('day', models.DateField(db_index=True, help_text='Day the Validation Tasks ended.')),
+                ('severity', models.PositiveSmallIntegerField(choices=[(1, 'Executed'), (2, 'Passed'), (3, 'Warning'), (4, 'Error'), (0, 'N/A')], help_text='Severity of the Validation Outcomes.')),
+                ('outcome_code', models.CharField(choices=[('P00010', 'Passed'), ('N00010', 'Not Applicable'), ('E00001', 'Syntax Error'), ('E00002', 'Schema Error'), ('E00010', 'Type Error'), ('E00020', 'Value Error'), ('E00030', 'Geometry Error'), ('E00040', 'Cardinality Error'), ('E00050', 'Duplicate Error'), ('E00060', 'Placement Error'), ('E00070', 'Units Error'), ('E00080', 'Quantity Error'), ('E00090', 'Enumerated Value Error'), ('E00100', 'Relationship Error'), ('E00110', 'Naming Error'), ('E00120', 'Reference Error'), ('E00130', 'Resource Error'), ('E00140', 'Deprecation Error'), ('E00150', 'Shape Representation Error'), ('E00160', 'Instance Structure Error'), ('W00010', 'Alignment Contains Business Logic Only'), ('W00020', 'Alignment Contains Geometry Only'), ('W00030', 'Warning'), ('X00040', 'Executed')], help_text='Code of the Validation Outcomes.', max_length=10)),
+                ('count', models.PositiveIntegerField(default=0, help_text='Number of Validation Outcomes.')),
+                ('produced_by', models.ForeignKey(blank=True, help_text='What tool was used to create the Models (optional).', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ifc_validation_models.authoringtool')),
+            ],
+            options={
+                'verbose_name': 'Outcome Rollup',
+                'verbose_name_plural': 'Outcome Rollups',
+                'db_table': 'ifc_outcome_rollup',
+                'indexes': [models.Index(fields=['schema', 'day'], name='ifc_outcome_schema_dc9051_idx'), models.Index(fields=['task_type', 'day'], name='ifc_outcome_task_ty_1fd193_idx')],
+                'constraints': [models.UniqueConstraint(fields=('produced_by', 'schema', 'task_type', 'feature', 'day', 'severity', 'outcome_code'), name='unique_outcome_rollup_key'), models.UniqueConstraint(condition=models.Q(('produced_by__isnull', True)), fields=('schema', 'task_type', 'feature', 'day', 'severity', 'outcome_code'), name='unique_outcome_rollup_key_null')],
+            },
+        ),
+    ]
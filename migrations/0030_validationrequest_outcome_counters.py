@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0029_outcomerollup_validationtask_is_rolled_up'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validationrequest',
+            name='error_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Outcomes with (effective) severity Error.'),
+        ),
+        migrations.AddField(
+            model_name='validationrequest',
+            name='passed_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Outcomes with severity Passed or Executed.'),
+        ),
+        migrations.AddField(
+            model_name='validationrequest',
+            name='warning_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Outcomes with (effective) severity Warning.'),
+        ),
+        migrations.AddField(
+            model_name='validationrequest',
+            name='whitelisted_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Warning or Error Outcomes that are whitelisted.'),
+        ),
+        migrations.AddField(
+            model_name='validationtask',
+            name='error_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Outcomes with (effective) severity Error.'),
+        ),
+        migrations.AddField(
+            model_name='validationtask',
+            name='passed_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Outcomes with severity Passed or Executed.'),
+        ),
+        migrations.AddField(
+            model_name='validationtask',
+            name='warning_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Outcomes with (effective) severity Warning.'),
+        ),
+        migrations.AddField(
+            model_name='validationtask',
+            name='whitelisted_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of Warning or Error Outcomes that are whitelisted.'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0030_validationrequest_outcome_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validationrequest',
+            name='row_version',
+            field=models.PositiveIntegerField(default=0, help_text='Version of the row, incremented on every state change.'),
+        ),
+        migrations.AddField(
+            model_name='validationtask',
+            name='row_version',
+            field=models.PositiveIntegerField(default=0, help_text='Version of the row, incremented on every state change.'),
+        ),
+    ]
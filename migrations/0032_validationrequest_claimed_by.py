@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0031_validationrequest_row_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validationrequest',
+            name='claimed_by',
+            field=models.CharField(blank=True, help_text='Identifier of the worker that claimed this Validation Request.', max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='validationrequest',
+            index=models.Index(fields=['status', 'created'], name='ifc_validat_status_e9aa0d_idx'),
+        ),
+    ]
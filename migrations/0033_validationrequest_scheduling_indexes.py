@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0032_validationrequest_claimed_by'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='validationrequest',
+            index=models.Index(fields=['status', 'channel', 'created'], name='ifc_validat_status_40d276_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='validationrequest',
+            index=models.Index(fields=['status', 'size'], name='ifc_validat_status_b381fc_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0033_validationrequest_scheduling_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='validationtask',
+            index=models.Index(fields=['status', 'started'], name='ifc_validat_status_1b82b5_idx'),
+        ),
+    ]
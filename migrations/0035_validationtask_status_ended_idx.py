@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0034_validationtask_status_started_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='validationtask',
+            index=models.Index(fields=['status', 'ended'], name='ifc_validat_status_3cefcf_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0035_validationtask_status_ended_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validationrequest',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 hash of the file content.', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='validationrequest',
+            name='reused_from',
+            field=models.ForeignKey(blank=True, help_text='Validation Request whose results were reused for this Validation Request (identical file and Version).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reuses', to='ifc_validation_models.validationrequest'),
+        ),
+        migrations.AddField(
+            model_name='validationrequest',
+            name='validator_version',
+            field=models.ForeignKey(blank=True, help_text='Version of the Validation Service that validated this Validation Request.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='ifc_validation_models.version'),
+        ),
+        migrations.AddIndex(
+            model_name='validationrequest',
+            index=models.Index(fields=['content_hash', 'validator_version', 'status'], name='ifc_validat_content_486b12_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0036_validationrequest_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskResult',
+            fields=[
+                ('id', models.BigAutoField(help_text='Identifier of the Task Result (auto-generated).', primary_key=True, serialize=False)),
+                ('content_hash', models.CharField(help_text='SHA-256 hash of the file content.', max_length=64)),
+                ('task_type', models.CharField(choices=[('MAGIC_AND_CLAMAV', 'File magic and anti-virus checks'), ('SYNTAX', 'STEP Physical File Syntax'), ('HEADER_SYNTAX', 'STEP Physical File Syntax (HEADER section)'), ('SCHEMA', 'Schema (EXPRESS language)'), ('MVD', 'Model View Definitions'), ('BSDD', 'bSDD Compliance'), ('INFO', 'Parse Info'), ('PREREQ', 'Prerequisites'), ('HEADER', 'Header Validation'), ('NORMATIVE_IA', 'Implementer Agreements (IA)'), ('NORMATIVE_IP', 'Informal Propositions (IP)'), ('INDUSTRY', 'Industry Practices'), ('INST_COMPLETION', 'Instance Completion'), ('DIGITAL_SIGNATURES', 'Digital Signatures')], help_text='Type of the Validation Task.', max_length=25)),
+                ('features_key', models.CharField(help_text='SHA-256 hash of the (sorted) versions of the Gherkin Features that were run.', max_length=64)),
+                ('hits', models.PositiveIntegerField(default=0, help_text='Number of times the results were reused.')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Timestamp this Task Result was created.')),
+                ('last_used', models.DateTimeField(db_index=True, default=django.utils.timezone.now, help_text='Timestamp this Task Result was last stored or reused.')),
+                ('checker_version', models.ForeignKey(help_text='Version of the checker that produced the results.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ifc_validation_models.version')),
+                ('source_task', models.ForeignKey(help_text='Validation Task that produced the results.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ifc_validation_models.validationtask')),
+            ],
+            options={
+                'verbose_name': 'Task Result',
+                'verbose_name_plural': 'Task Results',
+                'db_table': 'ifc_task_result',
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskResultFeature',
+            fields=[
+                ('id', models.BigAutoField(help_text='Identifier of the Task Result Feature (auto-generated).', primary_key=True, serialize=False)),
+                ('feature', models.CharField(help_text='Name of the Gherkin Feature.', max_length=1024)),
+                ('feature_version', models.PositiveSmallIntegerField(blank=True, help_text='Version number of the Gherkin Feature.', null=True)),
+                ('entry', models.ForeignKey(help_text='Task Result that contains results of this Gherkin Feature.', on_delete=django.db.models.deletion.CASCADE, related_name='features', to='ifc_validation_models.taskresult')),
+            ],
+            options={
+                'verbose_name': 'Task Result Feature',
+                'verbose_name_plural': 'Task Result Features',
+                'db_table': 'ifc_task_result_feature',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskresult',
+            constraint=models.UniqueConstraint(fields=('content_hash', 'task_type', 'checker_version', 'features_key'), name='unique_task_result'),
+        ),
+        migrations.AddIndex(
+            model_name='taskresultfeature',
+            index=models.Index(fields=['feature', 'feature_version'], name='ifc_task_re_feature_316ef1_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:32
+
+import apps.ifc_validation_models.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0037_taskresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelInstanceFields',
+            fields=[
+                ('instance', models.OneToOneField(help_text='What Model Instance these fields belong to.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stored_fields', serialize=False, to='ifc_validation_models.modelinstance')),
+                ('data', models.BinaryField(help_text='Fields of the Instance, as zlib-compressed JSON.')),
+                ('size', models.PositiveIntegerField(help_text='Size of the compressed fields (bytes).')),
+            ],
+            options={
+                'verbose_name': 'Model Instance Fields',
+                'verbose_name_plural': 'Model Instance Fields',
+                'db_table': 'ifc_model_instance_fields',
+            },
+        ),
+        migrations.AddField(
+            model_name='modelinstance',
+            name='fields_offloaded',
+            field=models.BooleanField(default=False, help_text='Whether the fields of the Instance are stored (compressed) in the side table instead of inline.'),
+        ),
+        migrations.AlterField(
+            model_name='modelinstance',
+            name='fields',
+            field=apps.ifc_validation_models.models.OffloadableJSONField(blank=True, help_text='Fields of the Instance.', null=True),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    # one UPDATE per distinct IFC Type (a few hundred at most), rather than per Model Instance
+    IfcType = apps.get_model("ifc_validation_models", "IfcType")
+    ModelInstance = apps.get_model("ifc_validation_models", "ModelInstance")
+
+    names = ModelInstance.objects.order_by().values_list("ifc_type", flat=True).distinct()
+    IfcType.objects.bulk_create([IfcType(name=name) for name in names], ignore_conflicts=True)
+    for id, name in IfcType.objects.values_list("id", "name"):
+        ModelInstance.objects.filter(ifc_type=name).update(type_id=id)
+
+
+def backwards(apps, schema_editor):
+    IfcType = apps.get_model("ifc_validation_models", "IfcType")
+    ModelInstance = apps.get_model("ifc_validation_models", "ModelInstance")
+
+    for id, name in IfcType.objects.values_list("id", "name"):
+        ModelInstance.objects.filter(type_id=id).update(ifc_type=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0038_modelinstancefields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IfcType',
+            fields=[
+                ('id', models.SmallAutoField(help_text='Identifier of the IFC Type (auto-generated).', primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Name of the IFC Type (eg. IfcWall).', max_length=50, unique=True)),
+            ],
+            options={
+                'verbose_name': 'IFC Type',
+                'verbose_name_plural': 'IFC Types',
+                'db_table': 'ifc_type',
+            },
+        ),
+        migrations.AddField(
+            model_name='modelinstance',
+            name='type',
+            field=models.ForeignKey(help_text='IFC Type.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='ifc_validation_models.ifctype'),
+        ),
+        migrations.AlterField(
+            model_name='modelinstance',
+            name='ifc_type',
+            field=models.CharField(help_text='IFC Type.', max_length=50, null=True),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='modelinstance',
+            name='ifc_type',
+        ),
+        migrations.AlterField(
+            model_name='modelinstance',
+            name='type',
+            field=models.ForeignKey(help_text='IFC Type.', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='ifc_validation_models.ifctype'),
+        ),
+    ]
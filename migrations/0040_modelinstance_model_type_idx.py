@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def forwards(apps, schema_editor):
+    # a single GROUP BY over the (model, type) index
+    ModelInstance = apps.get_model("ifc_validation_models", "ModelInstance")
+    ModelTypeHistogram = apps.get_model("ifc_validation_models", "ModelTypeHistogram")
+
+    rows = ModelInstance.objects.values("model_id", "type_id").annotate(n=Count("id")).order_by().iterator(chunk_size=2000)
+    ModelTypeHistogram.objects.bulk_create(
+        (ModelTypeHistogram(model_id=row["model_id"], type_id=row["type_id"], count=row["n"]) for row in rows),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0039_ifctype'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelTypeHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, help_text='Number of Model Instances of this IFC Type in the Model.')),
+            ],
+            options={
+                'verbose_name': 'Model Type Histogram',
+                'verbose_name_plural': 'Model Type Histograms',
+                'db_table': 'ifc_model_type_histogram',
+            },
+        ),
+        migrations.AlterField(
+            model_name='modelinstance',
+            name='model',
+            field=models.ForeignKey(db_index=False, help_text='What Model this Model Instance is a part of.', on_delete=django.db.models.deletion.CASCADE, related_name='instances', to='ifc_validation_models.model'),
+        ),
+        migrations.AlterField(
+            model_name='modelinstance',
+            name='type',
+            field=models.ForeignKey(db_index=False, help_text='IFC Type.', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='ifc_validation_models.ifctype'),
+        ),
+        migrations.AddIndex(
+            model_name='modelinstance',
+            index=models.Index(fields=['model', 'type'], name='ifc_model_i_model_i_d2ce5a_idx'),
+        ),
+        migrations.AddField(
+            model_name='modeltypehistogram',
+            name='model',
+            field=models.ForeignKey(db_index=False, help_text='What Model these Model Instances are part of.', on_delete=django.db.models.deletion.CASCADE, related_name='type_histogram', to='ifc_validation_models.model'),
+        ),
+        migrations.AddField(
+            model_name='modeltypehistogram',
+            name='type',
+            field=models.ForeignKey(db_index=False, help_text='IFC Type of these Model Instances.', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='ifc_validation_models.ifctype'),
+        ),
+        migrations.AddConstraint(
+            model_name='modeltypehistogram',
+            constraint=models.UniqueConstraint(fields=('model', 'type'), name='unique_model_type_histogram'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ifc_validation_models', '0040_modelinstance_model_type_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='model',
+            name='instances_materialized',
+            field=models.BooleanField(default=True, help_text='Whether all entities of the file are stored as Model Instances; if not (lazy materialization), the type histogram counts the entities of the file rather than the Model Instances.'),
+        ),
+        migrations.AlterField(
+            model_name='model',
+            name='number_of_elements',
+            field=models.PositiveIntegerField(blank=True, help_text='Number of elements within the Model (when derived from the type histogram: the number of IfcElement subtype entities, only with IfcOpenShell).', null=True),
+        ),
+        migrations.AlterField(
+            model_name='model',
+            name='number_of_geometries',
+            field=models.PositiveIntegerField(blank=True, help_text='Number of geometries within the Model (when derived from the type histogram: the number of IfcShapeRepresentation entities).', null=True),
+        ),
+    ]
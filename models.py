@@ -1,18 +1,40 @@
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from dataclasses import dataclass
+import datetime
 from enum import Enum
 import functools
+import hashlib
 import operator
 import os
+import re
 import threading
 
-from django.db import models
-from django.db.models import Q, F, QuerySet, TextField, Case, When, Value, IntegerField, CharField, Max
-from django.db.models.functions import Cast, Coalesce
+from django.db import models, transaction, connection, connections, DatabaseError
+from django.db.models.fields.files import FieldFile
+from django.db.models.constants import OnConflict
+from django.db.models.sql import UpdateQuery
+from django.db.models import Q, F, QuerySet, TextField, Case, When, Value, IntegerField, CharField, Max, Count, Sum
+from django.db.models.functions import Cast, Coalesce, Greatest, Trunc, TruncDate
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.utils import timezone
 from django.contrib.auth.models import User
 
+try:
+    import numpy
+except ImportError:  # optional; batch id encoding then falls back to plain Python
+    numpy = None
+
+from . import progress as progress_writer
+from . import status_cache
+from . import result_reuse
+from .instance_ids import InstanceIdResolver
+from . import instance_fields
+from . import ifc_schema
+
 local = threading.local()
 
 PRIMEMODULO = 1000000000
@@ -20,6 +42,12 @@ COPRIMESECRET = int(os.environ.get("COPRIMESECRET", "383446691"))
 INVERSE_COPRIME = pow(COPRIMESECRET, -1, mod=PRIMEMODULO)
 
 
+OUTCOME_COUNTER_FIELDS = ("error_count", "warning_count", "passed_count", "whitelisted_count")
+OUTCOME_COUNTER_BATCH_SIZE = 10_000
+INSTANCE_UPSERT_BATCH_SIZE = 5_000
+CLAIM_ATTEMPTS = 3
+
+
 def set_user_context(user):
     """
     Stores a Django user context to use when updating (eg. in worker process or unit test)
@@ -43,6 +71,20 @@ def get_user_context():
         raise ImproperlyConfigured(msg)
 
 
+class ConcurrentModificationError(DatabaseError):
+    """
+    Raised when an instance is saved after its row was changed by someone else since it was loaded.
+    """
+
+    def __init__(self, instance):
+
+        self.instance = instance
+        super().__init__(
+            f"{type(instance).__name__} #{instance.pk} was modified concurrently "
+            f"(expected row version {instance.row_version}); reload it and try again."
+        )
+
+
 class SanitizedCharField(models.CharField):
     """
     A CharField that sanitizes input by replacing null characters.
@@ -55,6 +97,39 @@ class SanitizedCharField(models.CharField):
         return value
 
 
+class OffloadableJSONField(models.JSONField):
+    """
+    A JSONField whose value may be stored compressed in a side table; it is then loaded on first access.
+    """
+
+    descriptor_class = instance_fields.OffloadedFieldsDescriptor
+
+
+class DurationSeconds(models.Func):
+    """
+    Number of seconds between two datetime expressions, DurationSeconds(start, end), as a float.
+    """
+
+    output_field = models.FloatField()
+    arity = 2
+
+    templates = {
+        "sqlite": "ROUND((julianday(<end>) - julianday(<start>)) * 86400.0, 3)",  # julianday is accurate to ~ms
+        "postgresql": "EXTRACT(EPOCH FROM (<end> - <start>))::double precision",
+        "mysql": "(TIMESTAMPDIFF(MICROSECOND, <start>, <end>) / 1000000.0)",
+    }
+
+    def as_sql(self, compiler, connection, **extra_context):
+
+        try:
+            template = self.templates[connection.vendor]
+        except KeyError:
+            raise NotImplementedError(f"DurationSeconds is not supported on {connection.vendor}.")
+        (start_sql, start_params), (end_sql, end_params) = (compiler.compile(e) for e in self.get_source_expressions())
+        params = (*start_params, *end_params) if template.index("<start>") < template.index("<end>") else (*end_params, *start_params)
+        return template.replace("<start>", start_sql).replace("<end>", end_sql), params
+
+
 class SoftDeletableModel(models.Model):
     """An abstract base class that provides soft-deletable Models."""
 
@@ -90,6 +165,45 @@ class SoftDeletableModel(models.Model):
         abstract = True
 
 
+class VersionedModel(models.Model):
+    """
+    An abstract Model that provides optimistic concurrency control for state changes.
+    Saving any of VERSIONED_FIELDS is a compare-and-set on the row version (UPDATE ... WHERE id=? AND row_version=?)
+    and raises ConcurrentModificationError when the row was changed concurrently.
+    """
+
+    VERSIONED_FIELDS = ("status",)
+
+    row_version = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Version of the row, incremented on every state change.",
+    )
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+
+        if not any(field.name in self.VERSIONED_FIELDS for field, _, _ in values):
+            values = [v for v in values if v[0].name != "row_version"]
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+        expected = self.row_version
+        row_version = self._meta.get_field("row_version")
+        values = [v for v in values if v[0] is not row_version] + [(row_version, None, F("row_version") + 1)]
+        updated = super()._do_update(
+            base_qs.filter(row_version=expected), using, pk_val, values, update_fields, forced_update
+        )
+        if updated:
+            self.row_version = expected + 1
+            if hasattr(self, "_loaded_values"):
+                self._loaded_values["row_version"] = self.row_version
+        elif base_qs.filter(pk=pk_val).exists():
+            raise ConcurrentModificationError(self)
+        return updated
+
+
 class TimestampedBaseQuerySet(models.query.QuerySet):
     """
     An abstract QuerySet that provides self-updating created & modified fields.
@@ -98,13 +212,87 @@ class TimestampedBaseQuerySet(models.query.QuerySet):
     class Meta:
         abstract = True
 
-    def update(self, *args, **kwargs):
+    def update(self, *args, per_instance_save=False, **kwargs):
+        """
+        Updates all selected rows in a single UPDATE statement that also sets the 'updated' timestamp.
+        Pass per_instance_save=True to first call save() on every instance, for callers relying on side effects of save().
+        """
 
         # see: https://docs.djangoproject.com/en/dev/topics/db/queries/#updating-multiple-objects-at-once
-        for item in self:
-            item.save()
+        if per_instance_save:
+            for item in self:
+                item.save()
+
+        return super().update(*args, **self.with_audit_fields(kwargs))
+
+    def _private_ids(self, public_ids):
+
+        if not issubclass(self.model, IdObfuscator):
+            raise TypeError(f"{self.model.__name__} has no public ids.")
+        return self.model.to_private_ids(public_ids)
+
+    def filter_public(self, public_ids):
+        """
+        Selects the rows with these public ids (eg. 'r123...'), decoded in batch, in a single IN query.
+        Raises ValueError for public ids with the prefix of another model or that are not numeric.
+        """
+
+        return self.filter(pk__in=self._private_ids(list(public_ids)))
+
+    def in_bulk_public(self, public_ids, strict=False):
+        """
+        Returns {public id: instance} for a list of public ids, in input order, fetched with a single IN query;
+        unknown ids are left out, or raise DoesNotExist (listing them) when strict=True.
+        Raises ValueError for public ids with the prefix of another model or that are not numeric.
+        """
+
+        public_ids = list(public_ids)
+        private_ids = self._private_ids(public_ids)
+        found = self.in_bulk(private_ids)
+
+        instances, unknown = {}, []
+        for public_id, private_id in zip(public_ids, private_ids):
+            if private_id in found:
+                instances[public_id] = found[private_id]
+            else:
+                unknown.append(public_id)
+        if strict and unknown:
+            raise self.model.DoesNotExist(f"Unknown {self.model._meta.verbose_name} id(s): {', '.join(unknown[:10])}")
+        return instances
+
+    def with_audit_fields(self, values):
+
+        values.setdefault("updated", timezone.now())
+        if issubclass(self.model, VersionedModel) and any(name in self.model.VERSIONED_FIELDS for name in values):
+            values.setdefault("row_version", F("row_version") + 1)
+        return values
+
+    def update_returning_ids(self, **kwargs):
+        """
+        Same as update(), but returns the ids of the updated rows.
+        Runs a single UPDATE ... RETURNING statement where the database supports it (PostgreSQL, Sqlite 3.35+),
+        otherwise locks and selects the rows before updating them.
+        """
+
+        values = self.with_audit_fields(kwargs)
+        db_connection = connections[self.db]
+        pk_column = db_connection.ops.quote_name(self.model._meta.pk.column)
+
+        if db_connection.vendor in ("postgresql", "sqlite") and db_connection.features.can_return_columns_from_insert:
+            query = self.query.chain(UpdateQuery)
+            query.add_update_values(values)
+            query.annotations = {}
+            compiler = query.get_compiler(self.db)
+            compiler.pre_sql_setup()
+            sql, params = compiler.as_sql()
+            with transaction.mark_for_rollback_on_error(using=self.db), db_connection.cursor() as cursor:
+                cursor.execute(f"{sql} RETURNING {pk_column}", params)
+                return [row[0] for row in cursor.fetchall()]
 
-        super().update(*args, **kwargs)
+        with transaction.atomic(using=self.db):
+            ids = list(self.select_for_update().values_list("pk", flat=True))
+            self.model._base_manager.using(self.db).filter(pk__in=ids).update(**values)
+        return ids
 
 
 class TimestampedBaseModel(models.Model):
@@ -128,12 +316,68 @@ class TimestampedBaseModel(models.Model):
 
     objects = TimestampedBaseQuerySet.as_manager()
 
+    # fields that are written on every update, even if they are not dirty
+    ALWAYS_UPDATED_FIELDS = ("updated",)
+
+    # opt-in: whether loaded instances remember their field values (see get_dirty_fields) so that save() only writes
+    # the changed fields; off by default, as it snapshots (and deep copies the JSON fields of) every row that is loaded
+    TRACK_DIRTY_FIELDS = False
+
     class Meta:
         abstract = True
 
         # ordered in reverse-chronological order by default
         ordering = ["-created", "-updated"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+
+        instance = super().from_db(db, field_names, values)
+        if cls.TRACK_DIRTY_FIELDS:
+            instance._loaded_values = {}
+            instance._take_snapshot(
+                name for name, value in zip(field_names, values) if value is not models.DEFERRED
+            )
+        return instance
+
+    def _take_snapshot(self, attnames=None):
+        """
+        Remembers the current values of the given (by default: all loaded) fields as their last known database values.
+        """
+
+        fields = {f.attname: f for f in self._meta.concrete_fields}
+        if attnames is None:
+            attnames = [attname for attname in fields if attname in self.__dict__]
+        for attname in attnames:
+            value = self.__dict__.get(attname)
+            if isinstance(value, FieldFile):
+                value = value.name
+            elif isinstance(fields[attname], models.JSONField):
+                # JSON values are mutable and can be changed in-place, hence the deep copy
+                value = copy.deepcopy(value)
+            self._loaded_values[attname] = value
+
+    def get_dirty_fields(self):
+        """
+        Returns the names of the fields changed since the instance was loaded or last saved,
+        or None if the instance was not loaded from the database or the model does not track dirty fields.
+        """
+
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return None
+
+        dirty = []
+        for f in self._meta.concrete_fields:
+            if f.primary_key:
+                continue
+            if f.attname in loaded:
+                if getattr(self, f.attname) != loaded[f.attname]:
+                    dirty.append(f.name)
+            elif f.attname in self.__dict__:
+                dirty.append(f.name)  # deferred field that was assigned
+        return dirty
+
     def save(self, *args, **kwargs):
 
         # create vs update
@@ -142,10 +386,37 @@ class TimestampedBaseModel(models.Model):
         else:
             self.updated = timezone.now()
 
+        # only write the fields that changed (plus eg. 'updated')
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None and not args:
+            dirty = self.get_dirty_fields()
+            if dirty is not None:
+                kwargs["update_fields"] = list(dict.fromkeys([*dirty, *self.ALWAYS_UPDATED_FIELDS]))
+
         super().save(*args, **kwargs)
 
+        if self.TRACK_DIRTY_FIELDS:
+            if not hasattr(self, "_loaded_values"):
+                self._loaded_values = {}
+            update_fields = kwargs.get("update_fields")
+            self._take_snapshot(
+                None if update_fields is None else [self._meta.get_field(name).attname for name in update_fields]
+            )
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if self.TRACK_DIRTY_FIELDS:
+            if not hasattr(self, "_loaded_values"):
+                self._loaded_values = {}
+            self._take_snapshot(
+                None if fields is None else [self._meta.get_field(name).attname for name in fields]
+            )
+
 
 class IdObfuscator:
+
+    PUBLIC_ID_DIGITS = re.compile(r"[0-9]+")  # the body of a public id, after its prefix; int() alone would accept eg. ' 12', '-5' or '1_000'
+
     @property
     def public_id(self):
         return self.to_public_id(
@@ -160,8 +431,53 @@ class IdObfuscator:
 
     @staticmethod
     def to_private_id(pub_id):
+        if not isinstance(pub_id, str) or not IdObfuscator.PUBLIC_ID_DIGITS.fullmatch(pub_id[1:]):
+            raise ValueError(f"Invalid public id: {pub_id}")
         return int(pub_id[1:]) * INVERSE_COPRIME % PRIMEMODULO
 
+    @classmethod
+    def to_public_ids(cls, priv_ids, override_cls=None):
+        """
+        Batch version of to_public_id() for a list, array('q') or NumPy array of ids; None ids stay None.
+        With NumPy, the modular arithmetic is vectorized.
+        """
+
+        prefix = id_prefix_mapping[override_cls or cls]
+        if numpy is not None:
+            ids = numpy.asarray(priv_ids)
+            if ids.dtype.kind in "iu":
+                # reduce first, so that the product fits into 64 bits
+                return [prefix + str(v) for v in (ids.astype(numpy.int64) % PRIMEMODULO * COPRIMESECRET % PRIMEMODULO).tolist()]
+        return [None if id is None else prefix + str(id * COPRIMESECRET % PRIMEMODULO) for id in priv_ids]
+
+    @classmethod
+    def to_private_ids(cls, pub_ids, override_cls=None):
+        """
+        Batch version of to_private_id(); raises ValueError for public ids without
+        the prefix of this class (or of override_cls) or whose body is not made of ASCII digits only.
+        """
+
+        prefix = id_prefix_mapping.get(override_cls or cls)
+        pub_ids = list(pub_ids)
+        valid = IdObfuscator.PUBLIC_ID_DIGITS.fullmatch
+        try:
+            if prefix is not None and {pub_id[:1] for pub_id in pub_ids} - {prefix}:
+                raise ValueError
+            if not all(valid(pub_id[1:]) for pub_id in pub_ids):
+                raise ValueError
+            values = [int(pub_id[1:]) % PRIMEMODULO for pub_id in pub_ids]
+        except (TypeError, ValueError):
+            invalid = [
+                pub_id for pub_id in pub_ids
+                if not isinstance(pub_id, str) or not valid(pub_id[1:]) or (prefix is not None and pub_id[:1] != prefix)
+            ]
+            raise ValueError(f"Invalid public id(s) for {(override_cls or cls).__name__}: {', '.join(map(str, invalid[:10]))}")
+
+        if numpy is not None:
+            # values are below PRIMEMODULO, so the product fits into 64 bits
+            return (numpy.array(values, dtype=numpy.int64) * INVERSE_COPRIME % PRIMEMODULO).tolist()
+        return [value * INVERSE_COPRIME % PRIMEMODULO for value in values]
+
 
 class AuditBaseQuerySet(TimestampedBaseQuerySet):
     """
@@ -171,13 +487,10 @@ class AuditBaseQuerySet(TimestampedBaseQuerySet):
     class Meta:
         abstract = True
 
-    def update(self, *args, **kwargs):
-
-        # see: https://docs.djangoproject.com/en/dev/topics/db/queries/#updating-multiple-objects-at-once
-        for item in self:
-            item.save()
+    def with_audit_fields(self, values):
 
-        super().update(*args, **kwargs)
+        values.setdefault("updated_by", get_user_context())
+        return super().with_audit_fields(values)
 
 
 class AuditedBaseModel(TimestampedBaseModel):
@@ -207,6 +520,8 @@ class AuditedBaseModel(TimestampedBaseModel):
 
     objects = AuditBaseQuerySet.as_manager()
 
+    ALWAYS_UPDATED_FIELDS = ("updated", "updated_by")
+
     class Meta:
         abstract = True
 
@@ -537,13 +852,13 @@ class Model(TimestampedBaseModel, IdObfuscator):
     number_of_elements = models.PositiveIntegerField(
         null=True,
         blank=True,
-        help_text="Number of elements within the Model."
+        help_text="Number of elements within the Model (when derived from the type histogram: the number of IfcElement subtype entities, only with IfcOpenShell)."
     )
 
     number_of_geometries = models.PositiveIntegerField(
         null=True,
         blank=True,
-        help_text="Number of geometries within the Model."
+        help_text="Number of geometries within the Model (when derived from the type histogram: the number of IfcShapeRepresentation entities)."
     )
 
     number_of_properties = models.PositiveIntegerField(
@@ -552,6 +867,11 @@ class Model(TimestampedBaseModel, IdObfuscator):
         help_text="Number of properties within the Model."
     )
 
+    instances_materialized = models.BooleanField(
+        default=True,
+        help_text="Whether all entities of the file are stored as Model Instances; if not (lazy materialization), the type histogram counts the entities of the file rather than the Model Instances.",
+    )
+
     schema = models.CharField(
         max_length=25,
         null=True,
@@ -568,13 +888,16 @@ class Model(TimestampedBaseModel, IdObfuscator):
         if not getattr(self, "request", None):
             return {}
 
-        rows = (
-            self.request.tasks
-            .with_aggregate_status()
-            .order_by("created", "-id")
-            .values_list("type", "aggregate_status")
-        )
-        return dict(rows)
+        def compute():
+            rows = (
+                self.request.tasks
+                .with_aggregate_status()
+                .order_by("created", "-id")
+                .values_list("type", "aggregate_status")
+            )
+            return dict(rows)
+
+        return status_cache.get_status_cache().get_or_compute(status_cache.MODEL, self.id, compute)
 
     def _status_for(self, task_type) -> str:
         return self._latest_task_status_by_type.get(task_type, Model.Status.NOT_VALIDATED)
@@ -753,6 +1076,49 @@ class Model(TimestampedBaseModel, IdObfuscator):
 
         return f"#{self.id} - {self.created.date()} - {self.file_name}"
 
+    def type_counts(self):
+        """
+        Returns {IFC Type name: number of Model Instances} from the stored type histogram.
+        The histogram counts all entities of the file, also when only some were materialized (see instances_materialized).
+        """
+
+        return dict(self.type_histogram.values_list("type__name", "count"))
+
+    def count_of(self, *types):
+        """
+        Returns the number of Model Instances of (any of) these IFC Types, from the stored type histogram.
+        """
+
+        return self.type_histogram.filter(type__name__in=types).aggregate(n=Coalesce(Sum("count"), 0))["n"]
+
+    def refresh_type_counts(self):
+        """
+        Recomputes the type histogram from the Model Instances (eg. after rows were written bypassing the ORM);
+        returns {IFC Type name: number of Model Instances}. Not for partially materialized Models, see ModelTypeHistogram.objects.refresh().
+        """
+
+        return ModelTypeHistogram.objects.refresh(self)
+
+    def derive_instance_counts(self, overwrite=False):
+        """
+        Derives number_of_geometries and (with IfcOpenShell) number_of_elements from the type histogram.
+        Only meaningful once the histogram counts all entities of the file (see InstanceMaterializer);
+        values that were already set (eg. by the worker) are kept, unless overwrite=True.
+        """
+
+        counts = self.type_counts()
+        update_fields = []
+        if overwrite or self.number_of_geometries is None:
+            self.number_of_geometries = sum(counts.get(name, 0) for name in ifc_schema.GEOMETRY_TYPES)
+            update_fields.append("number_of_geometries")
+        element_types = ifc_schema.element_types(self.schema)
+        if element_types is not None and (overwrite or self.number_of_elements is None):
+            self.number_of_elements = sum(count for name, count in counts.items() if name in element_types)
+            update_fields.append("number_of_elements")
+        if update_fields:
+            self.save(update_fields=update_fields + ["updated"])
+        return counts
+
     def reset_status(self):
 
         self.status_bsdd = Model.Status.NOT_VALIDATED
@@ -769,11 +1135,254 @@ class Model(TimestampedBaseModel, IdObfuscator):
         self.save()
 
 
+class IfcType(models.Model):
+    """
+    A lookup table of the IFC Types of Model Instances (eg. IfcWall).
+    Names and ids are cached per process; types are never renamed or deleted, so the cache needs no invalidation.
+    Types created in a transaction are only cached once it commits.
+    """
+
+    _ids = {}  # name -> id
+    _names = {}  # id -> name
+    _uncommitted = set()  # names created in a transaction that has not committed (yet)
+    _lock = threading.Lock()
+
+    id = models.SmallAutoField(
+        primary_key=True,
+        help_text="Identifier of the IFC Type (auto-generated).",
+    )
+
+    name = models.CharField(
+        max_length=50,
+        null=False,
+        blank=False,
+        unique=True,
+        help_text="Name of the IFC Type (eg. IfcWall).",
+    )
+
+    class Meta:
+        db_table = "ifc_type"
+        verbose_name = "IFC Type"
+        verbose_name_plural = "IFC Types"
+
+    def __str__(self):
+
+        return self.name
+
+    @classmethod
+    def _remember(cls, pairs):
+
+        with cls._lock:
+            for name, id in pairs:
+                if name not in cls._uncommitted:
+                    cls._ids[name] = id
+                    cls._names[id] = name
+
+    @classmethod
+    def ids_of(cls, names, create=True):
+        """
+        Returns {name: id} for IFC Type names, creating the missing IFC Types (in one statement) unless create=False.
+        """
+
+        names = set(names)
+        ids = {name: cls._ids[name] for name in names if name in cls._ids}
+        missing = names - ids.keys()
+        if missing:
+            found = dict(cls.objects.filter(name__in=missing).values_list("name", "id"))
+            if create and missing - found.keys():
+                created = missing - found.keys()
+                cls.objects.bulk_create([cls(name=name) for name in created], ignore_conflicts=True)
+                found = dict(cls.objects.filter(name__in=missing).values_list("name", "id"))
+                if connection.in_atomic_block:
+                    with cls._lock:
+                        cls._uncommitted.update(created)
+
+                    def committed():
+                        with cls._lock:
+                            cls._uncommitted.difference_update(created)
+                        cls._remember((name, found[name]) for name in created)
+                    transaction.on_commit(committed)
+            cls._remember(found.items())
+            ids.update(found)
+        return ids
+
+    @classmethod
+    def id_of(cls, name):
+
+        return cls._ids.get(name) or cls.ids_of([name])[name]
+
+    @classmethod
+    def name_of(cls, id):
+
+        name = cls._names.get(id)
+        if name is None:
+            name = cls.objects.values_list("name", flat=True).get(id=id)
+            cls._remember([(name, id)])
+        return name
+
+
+class ModelInstanceQuerySet(TimestampedBaseQuerySet):
+
+    def of_type(self, *names):
+        """
+        Selects the Model Instances of (any of) these IFC Types, comparing type ids rather than names.
+        """
+
+        return self.filter(type_id__in=IfcType.ids_of(names, create=False).values())
+
+    def bulk_upsert(self, model, rows, update=False, batch_size=INSTANCE_UPSERT_BATCH_SIZE, count_types=True):
+        """
+        Creates the Model Instances of a Model from (stepfile_id, ifc_type, fields) tuples, in chunks of batch_size,
+        with INSERT ... ON CONFLICT (model_id, stepfile_id) DO NOTHING RETURNING id, stepfile_id.
+        With update=True, the rows that already existed are then locked and updated (type, fields).
+        Returns an InstanceIdResolver (stepfile_id -> Model Instance id) for all rows, including those that already existed.
+        The type histogram of the Model is updated once, for the rows returned as inserted and the (locked) rows that changed type,
+        so that concurrent upserts of the same rows count them once (unless count_types=False, or the Model is only
+        partially materialized). The ids of rows that already existed are read with a single query per chunk.
+        On databases that cannot return rows from a bulk insert, rows are inserted with bulk_create() and all ids are
+        read back; the histogram is then updated from a (not locked) read of the existing rows.
+        """
+
+        model_id = model.id if isinstance(model, Model) else model
+        offload = instance_fields.storage() == instance_fields.COMPRESSED
+        count_types = count_types and ModelTypeHistogram.objects.using(self.db).counts_instances(model)
+        returning = connections[self.db].features.can_return_rows_from_bulk_insert
+        stepfile_ids, ids = array("q"), array("q")
+        type_counts = Counter()
+
+        def add(stepfile_id, id):
+            stepfile_ids.append(stepfile_id)
+            ids.append(id)
+
+        def flush(chunk):
+            now = timezone.now()
+            type_ids = IfcType.ids_of(ifc_type for ifc_type, _ in chunk.values())
+            instances = {
+                stepfile_id: ModelInstance(
+                    model_id=model_id,
+                    stepfile_id=stepfile_id,
+                    type_id=type_ids[ifc_type],
+                    fields=None if offload else fields,
+                    fields_offloaded=offload and fields is not None,
+                    updated=now if update else None,
+                )
+                for stepfile_id, (ifc_type, fields) in chunk.items()
+            }
+
+            if returning:
+                inserted = self._insert_ignoring_conflicts(list(instances.values()))
+            else:
+                previous_type_ids = dict(self.filter(model_id=model_id, stepfile_id__in=list(chunk)).values_list("stepfile_id", "type_id"))
+                self.bulk_create(list(instances.values()), ignore_conflicts=True)
+                inserted = {}
+                for stepfile_id, id in self.filter(model_id=model_id, stepfile_id__in=[s for s in chunk if s not in previous_type_ids]).values_list("stepfile_id", "id"):
+                    inserted[stepfile_id] = id
+
+            offloaded = []  # (id, stepfile_id) of instances with fields in the side table
+            for stepfile_id, id in inserted.items():
+                add(stepfile_id, id)
+                type_counts[instances[stepfile_id].type_id] += 1
+                if instances[stepfile_id].fields_offloaded:
+                    offloaded.append((id, stepfile_id))
+
+            existing = [stepfile_id for stepfile_id in chunk if stepfile_id not in inserted]
+            if existing:
+                rows = self.filter(model_id=model_id, stepfile_id__in=existing)
+                if update:
+                    rows = rows.select_for_update()
+                for stepfile_id, id, type_id, fields_offloaded in rows.values_list("stepfile_id", "id", "type_id", "fields_offloaded"):
+                    add(stepfile_id, id)
+                    instance = instances[stepfile_id]
+                    if update:
+                        instance.id = id
+                        if type_id != instance.type_id:
+                            type_counts[type_id] -= 1
+                            type_counts[instance.type_id] += 1
+                        fields_offloaded = instance.fields_offloaded
+                    if fields_offloaded and chunk[stepfile_id][1] is not None:
+                        offloaded.append((id, stepfile_id))
+                if update:
+                    self.bulk_update([instances[stepfile_id] for stepfile_id in existing], ["type", "fields", "fields_offloaded", "updated"])
+
+            if offloaded:
+                instance_fields.store(((id, chunk[stepfile_id][1]) for id, stepfile_id in offloaded), using=self.db, overwrite=update)
+            chunk.clear()
+
+        chunk = {}  # stepfile_id -> (ifc_type, fields); the last occurrence of a duplicate stepfile_id wins
+        with transaction.atomic(using=self.db):
+            for stepfile_id, ifc_type, fields in rows:
+                chunk[stepfile_id] = (ifc_type, fields)
+                if len(chunk) == batch_size:
+                    flush(chunk)
+            if chunk:
+                flush(chunk)
+            if count_types:
+                ModelTypeHistogram.objects.using(self.db).add_many(model_id, type_counts)
+        return InstanceIdResolver.from_arrays(stepfile_ids, ids)
+
+    def _insert_ignoring_conflicts(self, instances):
+        """
+        Inserts Model Instances with INSERT ... ON CONFLICT DO NOTHING RETURNING id, stepfile_id, in as few statements
+        as the database allows; returns {stepfile_id: id} of the rows actually inserted (not those that already existed).
+        """
+
+        connection = connections[self.db]
+        opts = ModelInstance._meta
+        fields = [field for field in opts.concrete_fields if not field.primary_key]
+        returning_fields = [opts.pk, opts.get_field("stepfile_id")]
+        batch_size = max(connection.ops.bulk_batch_size(fields, instances), 1)
+        inserted = {}
+        for start in range(0, len(instances), batch_size):
+            rows = self._insert(instances[start:start + batch_size], fields, returning_fields=returning_fields, on_conflict=OnConflict.IGNORE)
+            inserted.update((stepfile_id, id) for id, stepfile_id in filter(None, rows))
+        return inserted
+
+    def _type_counts(self):
+
+        counts = {}  # model id -> {IFC Type id: number of Model Instances}
+        for model_id, type_id, n in self.order_by().values_list("model_id", "type_id").annotate(n=Count("id")):
+            counts.setdefault(model_id, {})[type_id] = n
+        return counts
+
+    def update(self, *args, **kwargs):
+
+        if not {"model", "model_id", "type", "type_id"} & set(kwargs):
+            return super().update(*args, **kwargs)
+
+        # moves between Models or IFC Types: recompute the type histograms of the Models involved
+        model_ids = set(self.order_by().values_list("model_id", flat=True).distinct())
+        model = kwargs.get("model", kwargs.get("model_id"))
+        if model is not None:
+            model_ids.add(getattr(model, "pk", model))
+        with transaction.atomic(using=self.db):
+            updated = super().update(*args, **kwargs)
+            for model_id in model_ids:
+                ModelTypeHistogram.objects.using(self.db).refresh(model_id)  # skips partially materialized Models
+        return updated
+
+    def delete(self):
+        """
+        Deletes the selected Model Instances and subtracts them from the type histograms of their Models.
+        """
+
+        counts = self._type_counts()
+        counted = set(Model.objects.using(self.db).filter(id__in=list(counts), instances_materialized=True).values_list("id", flat=True)) if counts else ()
+        with transaction.atomic(using=self.db):
+            deleted = super().delete()
+            for model_id, type_counts in counts.items():
+                if model_id not in counted:
+                    continue
+                ModelTypeHistogram.objects.using(self.db).add_many(model_id, {type_id: -n for type_id, n in type_counts.items()})
+        return deleted
+
+
 class ModelInstance(TimestampedBaseModel, IdObfuscator):
     """
     A model to store and track Model Instances.
     """
 
+    objects = ModelInstanceQuerySet.as_manager()
+
     id = models.AutoField(
         primary_key=True,
         help_text="Identifier of the Model Instance (auto-generated)."
@@ -785,7 +1394,7 @@ class ModelInstance(TimestampedBaseModel, IdObfuscator):
         related_name="instances",
         blank=False,
         null=False,
-        db_index=True,
+        db_index=False,  # covered by (model, stepfile_id) and (model, type)
         help_text="What Model this Model Instance is a part of.",
     )
 
@@ -796,20 +1405,27 @@ class ModelInstance(TimestampedBaseModel, IdObfuscator):
         help_text="id assigned within the Step File (eg. #11)",
     )
 
-    ifc_type = models.CharField(
-        max_length=50,
+    type = models.ForeignKey(
+        to=IfcType,
+        on_delete=models.PROTECT,
+        related_name="+",
         null=False,
         blank=False,
-        db_index=True,
-        help_text="IFC Type."
+        db_index=False,  # see Meta.indexes
+        help_text="IFC Type.",
     )
 
-    fields = models.JSONField(
+    fields = OffloadableJSONField(
         null=True,
         blank=True,
         help_text="Fields of the Instance."
     )
 
+    fields_offloaded = models.BooleanField(
+        default=False,
+        help_text="Whether the fields of the Instance are stored (compressed) in the side table instead of inline.",
+    )
+
     class Meta:
         db_table = "ifc_model_instance"
         verbose_name = "Model Instance"
@@ -820,70 +1436,444 @@ class ModelInstance(TimestampedBaseModel, IdObfuscator):
                 fields=["model_id", "stepfile_id"], name="modelid_stepfileid"
             )
         ]
+        indexes = [
+            models.Index(fields=["model", "type"]),
+        ]  # only add multi-column indexes here
 
     def __str__(self):
 
         return f"#{self.id} - {self.ifc_type} - {self.model.file_name}"
 
+    @property
+    def ifc_type(self):
 
-class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
-    """
-    A model to store and track Validation Requests.
-    """
+        return None if self.type_id is None else IfcType.name_of(self.type_id)
 
-    class Status(models.TextChoices):
+    @ifc_type.setter
+    def ifc_type(self, name):
+
+        self.type_id = None if name is None else IfcType.id_of(name)
+
+    def save(self, *args, **kwargs):
+
+        # keep the type histogram of the Model up to date
+        adding = self._state.adding
+        previous_type_id = getattr(self, "_loaded_type_id", None)
+        changed = adding or (previous_type_id is not None and previous_type_id != self.type_id)
+        with transaction.atomic():
+            self._save(*args, **kwargs)
+            if changed and ModelTypeHistogram.objects.counts_instances(self.model_id):
+                if adding:
+                    ModelTypeHistogram.objects.add(self.model_id, self.type_id, 1)
+                else:
+                    ModelTypeHistogram.objects.add_many(self.model_id, {previous_type_id: -1, self.type_id: 1})
+        self._loaded_type_id = self.type_id
+
+    def delete(self, *args, **kwargs):
+
+        type_id = getattr(self, "_loaded_type_id", None) or self.type_id
+        with transaction.atomic():
+            counted = ModelTypeHistogram.objects.counts_instances(self.model_id)
+            result = super().delete(*args, **kwargs)
+            if counted:
+                ModelTypeHistogram.objects.add(self.model_id, type_id, -1)
+        return result
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+
+        # Model Instances do not track dirty fields (too costly for bulk reads); only the type is remembered
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_type_id = instance.__dict__.get("type_id")
+        return instance
+
+    def _save(self, *args, **kwargs):
+
+        # fields are written to the side table (settings.INSTANCE_FIELDS_STORAGE), or stay there once offloaded;
+        # offloaded fields that were never loaded are unchanged
+        dirty = kwargs.get("update_fields")
+        if dirty is None and not self._state.adding and self.fields_offloaded and self.__dict__.get("fields") is None:
+            dirty = ()
+        if dirty is not None and "fields" not in dirty:
+            return super().save(*args, **kwargs)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = [*kwargs["update_fields"], "fields_offloaded"]
+
+        fields = self.__dict__.get("fields")
+
+        was_offloaded = self.fields_offloaded
+        self.fields_offloaded = fields is not None and (was_offloaded or instance_fields.storage() == instance_fields.COMPRESSED)
+        if self.fields_offloaded:
+            self.__dict__["fields"] = None
+        self._storing_fields = True  # the (NULL) column is written as is, rather than loaded from the side table
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                if self.fields_offloaded:
+                    instance_fields.store([(self.id, fields)])
+                elif was_offloaded:
+                    ModelInstanceFields.objects.filter(instance_id=self.id).delete()
+        finally:
+            self._storing_fields = False
+            instance_fields._set_loaded(self, fields)
+
+
+class ModelTypeHistogramQuerySet(models.QuerySet):
+
+    def counts_instances(self, model):
         """
-        The overall status of a Validation Request.
+        Returns whether the histogram of a Model (or Model id) follows its Model Instances;
+        for partially materialized Models, it counts the entities of the file instead (see set_counts()).
         """
-        PENDING   = 'PENDING', 'Pending'
-        INITIATED = 'INITIATED', 'Initiated'
-        FAILED    = 'FAILED', 'Failed'
-        COMPLETED = 'COMPLETED', 'Completed'
 
-    class Channel(models.TextChoices):
+        if isinstance(model, Model):
+            return model.instances_materialized
+        return Model.objects.using(self.db).filter(id=model, instances_materialized=True).exists()
+
+    def set_counts(self, model, counts):
         """
-        The channel used to create a Validation Request.
+        Replaces the histogram of a Model (or Model id) by {IFC Type name: n}, eg. the entities of a file.
         """
-        WEBUI   = 'WEBUI', 'WebUi'
-        API     = 'API', 'Api'
 
-    id = models.AutoField(
-        primary_key=True,
-        help_text="Identifier of the Validation Request (auto-generated).",
-    )
+        model_id = getattr(model, "id", model)
+        type_ids = IfcType.ids_of(counts)
+        with transaction.atomic(using=self.db):
+            self.filter(model_id=model_id).delete()
+            self.bulk_create([ModelTypeHistogram(model_id=model_id, type_id=type_ids[name], count=n) for name, n in counts.items() if n])
 
-    file_name = models.CharField(
-        max_length=1024,
-        null=False,
-        blank=False,
-        verbose_name="file name",
-        help_text="Name of the file.",
-    )
+    def copy(self, source, model):
+        """
+        Copies the histogram of a Model (or Model id) to another one, eg. when cloning its Model Instances.
+        """
 
-    file_removed = models.DateTimeField(
-        null=True,
-        db_index=True,
-        help_text="Timestamp the file was removed.",
-    )
+        rows = self.filter(model_id=getattr(source, "id", source)).values_list("type_id", "count")
+        self.bulk_create([ModelTypeHistogram(model_id=getattr(model, "id", model), type_id=type_id, count=n) for type_id, n in rows])
 
-    file = models.FileField(
-        null=False,
-        max_length=2048,
-        help_text="Path of the file."
-    )
+    def add(self, model_id, type_id, n):
+        """
+        Adds n (which may be negative) to the number of Model Instances of an IFC Type in a Model.
+        """
 
-    size = models.PositiveIntegerField(
-        null=False,
-        help_text="Size of the file (bytes)"
-    )
+        self.add_many(model_id, {type_id: n})
 
-    status = models.CharField(
-        max_length=10,
-        choices=Status.choices,
-        default=Status.PENDING,
-        db_index=True,
-        null=False,
-        blank=False,
+    def add_many(self, model_id, counts):
+        """
+        Adds {IFC Type id: n} (n may be negative) to the histogram of a Model as an atomic upsert, safe for concurrent callers:
+        missing rows are inserted with a zero count (ignoring conflicts), then all counts are changed in a single UPDATE.
+        Rows that drop to zero are removed.
+        """
+
+        counts = {type_id: n for type_id, n in counts.items() if n}
+        if not counts:
+            return
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(
+                [ModelTypeHistogram(model_id=model_id, type_id=type_id, count=0) for type_id, n in counts.items() if n > 0],
+                ignore_conflicts=True,
+            )
+            self.filter(model_id=model_id, type_id__in=counts).update(
+                count=Greatest(F("count") + Case(*[When(type_id=type_id, then=Value(n)) for type_id, n in counts.items()], default=Value(0)), Value(0))
+            )
+            if any(n < 0 for n in counts.values()):
+                self.filter(model_id=model_id, type_id__in=counts, count=0).delete()
+
+    def refresh(self, model):
+        """
+        Recomputes the type histogram of a Model (or Model id) with a single GROUP BY over the (model, type) index;
+        returns {IFC Type name: number of Model Instances}.
+        The histogram of a partially materialized Model is returned as it is, as it also counts the entities not materialized.
+        """
+
+        model_id = getattr(model, "id", model)
+        if not self.counts_instances(model_id):
+            return dict(self.filter(model_id=model_id).values_list("type__name", "count"))
+        rows = list(ModelInstance.objects.filter(model_id=model_id).values("type_id").annotate(n=Count("id")).order_by())
+        with transaction.atomic(using=self.db):
+            self.filter(model_id=model_id).delete()
+            self.bulk_create([ModelTypeHistogram(model_id=model_id, type_id=row["type_id"], count=row["n"]) for row in rows])
+        return {IfcType.name_of(row["type_id"]): row["n"] for row in rows}
+
+
+class ModelTypeHistogram(models.Model):
+    """
+    A model to store the number of Model Instances per IFC Type of a Model, filled during instance ingestion.
+    """
+
+    objects = ModelTypeHistogramQuerySet.as_manager()
+
+    model = models.ForeignKey(
+        to=Model,
+        on_delete=models.CASCADE,
+        related_name="type_histogram",
+        db_index=False,  # covered by the unique constraint
+        help_text="What Model these Model Instances are part of.",
+    )
+
+    type = models.ForeignKey(
+        to=IfcType,
+        on_delete=models.PROTECT,
+        related_name="+",
+        db_index=False,
+        help_text="IFC Type of these Model Instances.",
+    )
+
+    count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of Model Instances of this IFC Type in the Model.",
+    )
+
+    class Meta:
+        db_table = "ifc_model_type_histogram"
+        verbose_name = "Model Type Histogram"
+        verbose_name_plural = "Model Type Histograms"
+
+        constraints = [
+            models.UniqueConstraint(fields=["model", "type"], name="unique_model_type_histogram")
+        ]
+
+
+class ModelInstanceFields(models.Model):
+    """
+    A model to store the fields of Model Instances compressed (zlib, JSON), outside of the Model Instance table.
+    """
+
+    instance = models.OneToOneField(
+        to=ModelInstance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stored_fields",
+        help_text="What Model Instance these fields belong to.",
+    )
+
+    data = models.BinaryField(
+        help_text="Fields of the Instance, as zlib-compressed JSON.",
+    )
+
+    size = models.PositiveIntegerField(
+        help_text="Size of the compressed fields (bytes).",
+    )
+
+    class Meta:
+        db_table = "ifc_model_instance_fields"
+        verbose_name = "Model Instance Fields"
+        verbose_name_plural = "Model Instance Fields"
+
+
+class ValidationRequestQuerySet(AuditBaseQuerySet):
+    """
+    Queryset-level equivalents of the ValidationRequest.mark_as_*() transitions.
+    Each runs a single UPDATE that skips requests in a final status and returns the ids of the updated requests.
+    """
+
+    def _transition(self, **values):
+
+        progress_writer.flush_pending(ValidationRequest)
+        return self.exclude(status__in=ValidationRequest.FINAL_STATUS_LIST).update_returning_ids(**values)
+
+    def mark_as_initiated(self, reason=None):
+
+        return self._transition(
+            status=ValidationRequest.Status.INITIATED,
+            status_reason=reason,
+            started=timezone.now(),
+            completed=None,
+            progress=0,
+        )
+
+    def mark_as_completed(self, reason=None):
+
+        return self._transition(
+            status=ValidationRequest.Status.COMPLETED,
+            status_reason=reason,
+            completed=timezone.now(),
+            progress=100,
+        )
+
+    def mark_as_failed(self, reason=None):
+
+        return self._transition(
+            status=ValidationRequest.Status.FAILED,
+            status_reason=reason,
+            completed=timezone.now(),
+        )
+
+    def mark_as_warning(self, reason=None):
+
+        return self._transition(
+            status=ValidationRequest.Status.FAILED,
+            status_reason=reason,
+            completed=timezone.now(),
+            progress=100,
+        )
+
+    def mark_as_pending(self, reason=None):
+
+        return self._transition(
+            status=ValidationRequest.Status.PENDING,
+            status_reason=reason,
+            started=None,
+            progress=0,
+            claimed_by=None,
+        )
+
+    def with_duration(self):
+        """
+        Annotates duration_seconds (completed - started), computed in the database.
+        """
+
+        return self.annotate(duration_seconds=DurationSeconds("started", "completed"))
+
+    def claim_next(self, n=1, worker_id=None, policy=None):
+        """
+        Claims up to n pending Validation Requests for a worker and marks them as INITIATED.
+        Requests are claimed oldest first, or in the order of a scheduling.SchedulingPolicy.
+        Uses SELECT ... FOR UPDATE SKIP LOCKED where supported (eg. PostgreSQL), so concurrent workers
+        never block on or claim the same rows, and a policy ranks only the candidates that are not being claimed;
+        otherwise falls back to a single UPDATE ... RETURNING (with a policy: re-ranking up to CLAIM_ATTEMPTS times
+        if requests were claimed concurrently). Returns the claimed Validation Requests.
+        """
+
+        pending = self.filter(
+            status=ValidationRequest.Status.PENDING,
+            deleted=False,
+        )
+        values = dict(
+            status=ValidationRequest.Status.INITIATED,
+            started=timezone.now(),
+            completed=None,
+            progress=0,
+            claimed_by=worker_id,
+        )
+
+        ranked = []
+        with transaction.atomic(using=self.db):
+            if connections[self.db].features.has_select_for_update_skip_locked:
+                if policy is not None:
+                    # ranked among the candidates that are not locked by other workers, locked until commit
+                    ranked = ids = [request.id for request in policy.select(pending, n, lock=True)]
+                else:
+                    ids = list(pending.order_by("created", "id").select_for_update(skip_locked=True).values_list("pk", flat=True)[:n])
+                if ids:
+                    self.model.objects.using(self.db).filter(pk__in=ids).update(**values)
+            elif policy is not None:
+                # requests might be claimed by another worker in between ranking and claiming; if so, rank the remaining ones again
+                ids = []
+                for _ in range(CLAIM_ATTEMPTS):
+                    next_ranked = [request.id for request in policy.select(pending.exclude(pk__in=ids), n - len(ids))]
+                    if not next_ranked:
+                        break
+                    ranked += next_ranked
+                    ids += self.model.objects.using(self.db).filter(
+                        pk__in=next_ranked,
+                        status=ValidationRequest.Status.PENDING,
+                    ).update_returning_ids(**values)
+                    if len(ids) >= n:
+                        break
+            else:
+                ids = self.model.objects.using(self.db).filter(
+                    pk__in=pending.order_by("created", "id").values("pk")[:n],
+                    status=ValidationRequest.Status.PENDING,
+                ).update_returning_ids(**values)
+
+            claimed = list(self.model.objects.using(self.db).filter(pk__in=ids).order_by("created", "id"))
+
+        if policy is not None:
+            rank = {id: i for i, id in enumerate(ranked)}
+            claimed.sort(key=lambda request: rank[request.id])
+        return claimed
+
+    def recompute_outcome_counters(self):
+        """
+        Recomputes the Outcome counters of the selected Validation Requests from the counters of their tasks.
+        """
+
+        request_ids = list(self.values_list("id", flat=True))
+        rows = (
+            ValidationTask.objects
+            .filter(request_id__in=request_ids)
+            .values("request_id")
+            .annotate(**{name: Sum(name) for name in OUTCOME_COUNTER_FIELDS})
+            .order_by()
+        )
+        counts = {row.pop("request_id"): row for row in rows}
+        requests = [
+            ValidationRequest(id=id, **counts.get(id, dict.fromkeys(OUTCOME_COUNTER_FIELDS, 0)))
+            for id in request_ids
+        ]
+        # not an audited change, hence the base manager
+        ValidationRequest._base_manager.bulk_update(requests, OUTCOME_COUNTER_FIELDS, batch_size=500)
+        return len(requests)
+
+
+class ValidationRequest(AuditedBaseModel, SoftDeletableModel, VersionedModel, IdObfuscator):
+    """
+    A model to store and track Validation Requests.
+    """
+
+    objects = ValidationRequestQuerySet.as_manager()
+
+    # state changes only write the changed fields, so that they do not overwrite eg. the outcome counters
+    TRACK_DIRTY_FIELDS = True
+
+    class Status(models.TextChoices):
+        """
+        The overall status of a Validation Request.
+        """
+        PENDING   = 'PENDING', 'Pending'
+        INITIATED = 'INITIATED', 'Initiated'
+        FAILED    = 'FAILED', 'Failed'
+        COMPLETED = 'COMPLETED', 'Completed'
+
+    class Channel(models.TextChoices):
+        """
+        The channel used to create a Validation Request.
+        """
+        WEBUI   = 'WEBUI', 'WebUi'
+        API     = 'API', 'Api'
+
+    FINAL_STATUS_LIST = [
+        Status.FAILED,
+        Status.COMPLETED
+    ]
+
+    id = models.AutoField(
+        primary_key=True,
+        help_text="Identifier of the Validation Request (auto-generated).",
+    )
+
+    file_name = models.CharField(
+        max_length=1024,
+        null=False,
+        blank=False,
+        verbose_name="file name",
+        help_text="Name of the file.",
+    )
+
+    file_removed = models.DateTimeField(
+        null=True,
+        db_index=True,
+        help_text="Timestamp the file was removed.",
+    )
+
+    file = models.FileField(
+        null=False,
+        max_length=2048,
+        help_text="Path of the file."
+    )
+
+    size = models.PositiveIntegerField(
+        null=False,
+        help_text="Size of the file (bytes)"
+    )
+
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        db_index=True,
+        null=False,
+        blank=False,
         help_text="Current status of the Validation Request.",
     )
 
@@ -933,11 +1923,71 @@ class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
         help_text="What channel was used to create this Validation Request.",
     )
 
+    claimed_by = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Identifier of the worker that claimed this Validation Request.",
+    )
+
+    error_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Outcomes with (effective) severity Error.",
+    )
+
+    warning_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Outcomes with (effective) severity Warning.",
+    )
+
+    passed_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Outcomes with severity Passed or Executed.",
+    )
+
+    whitelisted_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Warning or Error Outcomes that are whitelisted.",
+    )
+
+    content_hash = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="SHA-256 hash of the file content.",
+    )
+
+    validator_version = models.ForeignKey(
+        to="Version",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+        help_text="Version of the Validation Service that validated this Validation Request.",
+    )
+
+    reused_from = models.ForeignKey(
+        to="self",
+        on_delete=models.SET_NULL,
+        related_name="reuses",
+        null=True,
+        blank=True,
+        help_text="Validation Request whose results were reused for this Validation Request (identical file and Version).",
+    )
+
     class Meta:
 
         db_table = "ifc_validation_request"
         indexes = [
-            models.Index(fields=["file_name", "status"])
+            models.Index(fields=["file_name", "status"]),
+            models.Index(fields=["status", "created"]),
+            models.Index(fields=["status", "channel", "created"]),  # scheduling: oldest per channel
+            models.Index(fields=["status", "size"]),  # scheduling: smallest first
+            models.Index(fields=["content_hash", "validator_version", "status"]),  # result reuse
         ]  # only add multi-column indexes here
         verbose_name = "Validation Request"
         verbose_name_plural = "Validation Requests"
@@ -950,11 +2000,7 @@ class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
     @property
     def has_final_status(self):
 
-        FINAL_STATUS_LIST = [
-            self.Status.FAILED,
-            self.Status.COMPLETED
-        ]
-        return self.status in FINAL_STATUS_LIST
+        return self.status in self.FINAL_STATUS_LIST
 
     @property
     def duration(self):
@@ -985,6 +2031,7 @@ class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
 
     def mark_as_completed(self, reason=None):
 
+        progress_writer.flush_pending(ValidationRequest, [self.id])
         self.status = self.Status.COMPLETED
         self.status_reason = reason
         self.completed = timezone.now()
@@ -993,6 +2040,7 @@ class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
 
     def mark_as_failed(self, reason=None):
 
+        progress_writer.flush_pending(ValidationRequest, [self.id])
         self.status = self.Status.FAILED
         self.status_reason = reason
         self.completed = timezone.now()
@@ -1000,6 +2048,7 @@ class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
 
     def mark_as_warning(self, reason=None):
 
+        progress_writer.flush_pending(ValidationRequest, [self.id])
         self.status = self.Status.FAILED
         self.status_reason = reason
         self.completed = timezone.now()
@@ -1013,14 +2062,73 @@ class ValidationRequest(AuditedBaseModel, SoftDeletableModel, IdObfuscator):
         self.progress = 0
         self.started = None
         self.ended = None
+        self.claimed_by = None
         self.save()
 
+    def report_progress(self, progress):
+        """
+        Sets the progress, written asynchronously by the coalescing progress writer.
+        """
+
+        self.progress = progress
+        progress_writer.get_progress_writer().report(ValidationRequest, self.id, progress)
+
     def remove_file(self):
 
         self.file = None
         self.file_removed = timezone.now()
         self.save(update_fields=['file', 'file_removed'])
 
+    def save(self, *args, **kwargs):
+
+        if self._state.adding and not self.content_hash and self.file:
+            self.content_hash = result_reuse.compute_content_hash(self.file)
+        super().save(*args, **kwargs)
+
+def invalidate_aggregate_status(task_ids, model_ids=()):
+    """
+    Drops cached aggregate statuses of the given Validation Tasks and of the Models they belong to
+    (plus the given Model ids, eg. those the tasks belonged to before an update or delete),
+    once the current transaction commits.
+    """
+
+    task_ids = [id for id in task_ids if id is not None]
+    if task_ids and status_cache.get_status_cache().enabled:
+        model_ids = set(model_ids) | set(
+            ValidationTask.objects
+            .filter(id__in=task_ids)
+            .values_list("request__model_id", flat=True)
+        )
+        status_cache.invalidate(task_ids, model_ids)
+
+
+def invalidate_whitelist():
+    """
+    Drops all cached whitelist entries and (once the current transaction commits) aggregate statuses,
+    as any of them might be affected by a whitelist change.
+    """
+
+    ValidationOutcome.get_whitelist_entries.cache_clear()
+    status_cache.invalidate_all()
+
+
+def recompute_whitelisted_counters(task_ids):
+    """
+    Recomputes the Outcome counters of the Validation Tasks (and their Validation Requests) affected by a whitelist change,
+    in batches, once the current transaction commits (immediately outside of a transaction).
+    """
+
+    task_ids = sorted(task_ids)
+
+    def recompute():
+        for start in range(0, len(task_ids), OUTCOME_COUNTER_BATCH_SIZE):
+            with transaction.atomic():
+                ValidationTask.objects.filter(id__in=task_ids[start:start + OUTCOME_COUNTER_BATCH_SIZE]).recompute_outcome_counters()
+
+    if task_ids:
+        transaction.on_commit(recompute)
+
+
 def calculate_whitelist(include_whitelist, prefix = "", using=None):
     wl_annotations = {}
     wl_q = Q(**{f"{prefix}pk__in": []})  # always false
@@ -1055,7 +2163,110 @@ def calculate_whitelist(include_whitelist, prefix = "", using=None):
 
     return wl_annotations, effective_severity
 
-class ValidationTaskQuerySet(models.QuerySet):
+class ValidationTaskQuerySet(TimestampedBaseQuerySet):
+    """
+    Besides aggregation helpers, provides queryset-level equivalents of the ValidationTask.mark_as_*() transitions.
+    Each runs a single UPDATE that skips tasks in a final status and returns the ids of the updated tasks.
+    """
+
+    def update(self, *args, **kwargs):
+
+        if not status_cache.get_status_cache().enabled:
+            return super().update(*args, **kwargs)
+        rows = list(self.values_list("id", "request__model_id"))
+        updated = super().update(*args, **kwargs)
+        invalidate_aggregate_status([id for id, _ in rows], {model_id for _, model_id in rows})
+        return updated
+
+    def delete(self):
+
+        if not status_cache.get_status_cache().enabled:
+            return super().delete()
+        rows = list(self.values_list("id", "request__model_id"))
+        deleted = super().delete()
+        status_cache.invalidate([id for id, _ in rows], {model_id for _, model_id in rows})
+        return deleted
+
+    def _transition(self, **values):
+
+        progress_writer.flush_pending(ValidationTask)
+        ids = self.exclude(status__in=ValidationTask.FINAL_STATUS_LIST).update_returning_ids(**values)
+        invalidate_aggregate_status(ids)
+        return ids
+
+    def mark_as_initiated(self):
+
+        return self._transition(
+            status=ValidationTask.Status.INITIATED,
+            started=timezone.now(),
+            ended=None,
+            progress=0,
+        )
+
+    def mark_as_completed(self, reason=None):
+
+        ids = self._transition(
+            status=ValidationTask.Status.COMPLETED,
+            status_reason=reason,
+            ended=timezone.now(),
+            progress=100,
+        )
+        if ids:
+            ValidationTask.objects.filter(id__in=ids).recompute_outcome_counters()
+            OutcomeRollup.record_tasks(ids)
+        return ids
+
+    def mark_as_failed(self, reason=None):
+
+        return self._transition(
+            status=ValidationTask.Status.FAILED,
+            status_reason=reason,
+            ended=timezone.now(),
+        )
+
+    def mark_as_skipped(self, reason=None):
+
+        return self._transition(
+            status=ValidationTask.Status.SKIPPED,
+            status_reason=reason,
+        )
+
+    def mark_as_pending(self, reason=None):
+
+        return self._transition(
+            status=ValidationTask.Status.PENDING,
+            status_reason=reason,
+            started=None,
+            ended=None,
+            progress=0,
+        )
+
+    def recompute_outcome_counters(self, include_requests=True):
+        """
+        Recomputes the Outcome counters of the selected Validation Tasks, and (optionally) of their Validation Requests.
+        """
+
+        task_ids = list(self.values_list("id", flat=True))
+        counts = {
+            row.pop("validation_task_id"): row
+            for row in ValidationOutcome.objects.filter(validation_task_id__in=task_ids).outcome_counters("validation_task_id")
+        }
+        tasks = [
+            ValidationTask(id=id, **counts.get(id, dict.fromkeys(OUTCOME_COUNTER_FIELDS, 0)))
+            for id in task_ids
+        ]
+        ValidationTask._base_manager.bulk_update(tasks, OUTCOME_COUNTER_FIELDS, batch_size=500)
+        if include_requests:
+            ValidationRequest.objects.filter(tasks__id__in=task_ids).distinct().recompute_outcome_counters()
+        return len(tasks)
+
+    def with_duration(self):
+        """
+        Annotates duration_seconds (ended - started), computed in the database.
+        """
+
+        return self.annotate(duration_seconds=DurationSeconds("started", "ended"))
+
     def with_aggregate_status(self, include_whitelist: bool = True, using=None):
         wl_annotations, effective_severity = calculate_whitelist(include_whitelist, prefix="outcomes__", using=using)
 
@@ -1074,9 +2285,12 @@ class ValidationTaskQuerySet(models.QuerySet):
             )
         )
 
-class ValidationTask(TimestampedBaseModel, IdObfuscator):
+class ValidationTask(TimestampedBaseModel, VersionedModel, IdObfuscator):
     objects = ValidationTaskQuerySet.as_manager()
 
+    # state changes only write the changed fields, so that they do not overwrite eg. the outcome counters
+    TRACK_DIRTY_FIELDS = True
+
     """
     A model to store and track Validation Tasks.
     """
@@ -1111,6 +2325,13 @@ class ValidationTask(TimestampedBaseModel, IdObfuscator):
         FAILED         = 'FAILED', 'Failed'
         COMPLETED      = 'COMPLETED', 'Completed'
 
+    FINAL_STATUS_LIST = [
+        Status.SKIPPED,
+        Status.FAILED,
+        Status.NOT_APPLICABLE,
+        Status.COMPLETED,
+    ]
+
     id = models.AutoField(
         primary_key=True, help_text="Identifier of the task (auto-generated)."
     )
@@ -1183,9 +2404,43 @@ class ValidationTask(TimestampedBaseModel, IdObfuscator):
         help_text="Command and arguments used to launch the subprocess executing the Validation Task.",
     )
 
-    class Meta:
-
-        db_table = "ifc_validation_task"
+    is_rolled_up = models.BooleanField(
+        null=False,
+        default=False,
+        help_text="Flag to indicate the Outcomes of this Validation Task are included in the Outcome Rollups.",
+    )
+
+    error_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Outcomes with (effective) severity Error.",
+    )
+
+    warning_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Outcomes with (effective) severity Warning.",
+    )
+
+    passed_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Outcomes with severity Passed or Executed.",
+    )
+
+    whitelisted_count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Warning or Error Outcomes that are whitelisted.",
+    )
+
+    class Meta:
+
+        db_table = "ifc_validation_task"
+        indexes = [
+            models.Index(fields=["status", "started"]),
+            models.Index(fields=["status", "ended"]),
+        ]  # only add multi-column indexes here
         verbose_name = "Validation Task"
         verbose_name_plural = "Validation Tasks"
 
@@ -1196,13 +2451,7 @@ class ValidationTask(TimestampedBaseModel, IdObfuscator):
     @property
     def has_final_status(self):
 
-        FINAL_STATUS_LIST = [
-            self.Status.SKIPPED,
-            self.Status.FAILED,
-            self.Status.NOT_APPLICABLE,
-            self.Status.COMPLETED,
-        ]
-        return self.status in FINAL_STATUS_LIST
+        return self.status in self.FINAL_STATUS_LIST
 
     @property
     def duration(self):
@@ -1232,14 +2481,20 @@ class ValidationTask(TimestampedBaseModel, IdObfuscator):
 
     def mark_as_completed(self, reason=None):
 
+        progress_writer.flush_pending(ValidationTask, [self.id])
         self.status = self.Status.COMPLETED
         self.status_reason = reason
         self.ended = timezone.now()
         self.progress = 100
-        self.save()
+        with transaction.atomic():
+            self.save()
+            ValidationTask.objects.filter(id=self.id).recompute_outcome_counters()
+        self.refresh_from_db(fields=OUTCOME_COUNTER_FIELDS)
+        OutcomeRollup.record_task(self)
 
     def mark_as_failed(self, reason=None):
 
+        progress_writer.flush_pending(ValidationTask, [self.id])
         self.status = self.Status.FAILED
         self.status_reason = reason
         self.ended = timezone.now()
@@ -1247,21 +2502,41 @@ class ValidationTask(TimestampedBaseModel, IdObfuscator):
 
     def mark_as_skipped(self, reason=None):
 
+        progress_writer.flush_pending(ValidationTask, [self.id])
         self.status = self.Status.SKIPPED
         self.status_reason = reason
         self.save()
 
+    def report_progress(self, progress):
+        """
+        Sets the progress, written asynchronously by the coalescing progress writer.
+        """
+
+        self.progress = progress
+        progress_writer.get_progress_writer().report(ValidationTask, self.id, progress)
+
     def set_process_details(self, id, cmd):
 
         self.process_id = id
         self.process_cmd = cmd
         self.save()
 
+    def save(self, *args, **kwargs):
+
+        super().save(*args, **kwargs)
+        invalidate_aggregate_status([self.id])
+
     def determine_aggregate_status(self):
         """
         Aggregates Severity of all Outcomes into one final Status value.
         """
 
+        return status_cache.get_status_cache().get_or_compute(
+            status_cache.TASK, self.id, self._determine_aggregate_status
+        )
+
+    def _determine_aggregate_status(self):
+
         agg_status = None
         for outcome in self.outcomes.iterator():
             if (
@@ -1291,11 +2566,125 @@ class ValidationTask(TimestampedBaseModel, IdObfuscator):
 
         return agg_status
 
-class ValidationOutcomeQuerySet(models.QuerySet):
+class ValidationOutcomeQuerySet(TimestampedBaseQuerySet):
     def with_effective_severity(self, include_whitelist: bool = True, using=None):
         wl_annotations, effective_severity = calculate_whitelist(include_whitelist, using=using)
         return self.annotate(**wl_annotations).annotate(effective_severity=effective_severity)
 
+    def outcome_counters(self, *group_by):
+        """
+        Counts Outcomes per (effective) severity, grouped by the given fields.
+        """
+
+        severity = ValidationOutcome.OutcomeSeverity
+        wl_annotations, effective_severity = calculate_whitelist(True, using=self.db)
+        return (
+            self.annotate(**wl_annotations)
+            .annotate(_effective_severity=effective_severity)
+            .values(*group_by)
+            .annotate(
+                error_count=Count("id", filter=Q(_effective_severity=severity.ERROR)),
+                warning_count=Count("id", filter=Q(_effective_severity=severity.WARNING)),
+                passed_count=Count("id", filter=Q(severity_in_db__in=[severity.PASSED, severity.EXECUTED])),
+                whitelisted_count=Count("id", filter=Q(severity_in_db__gte=severity.WARNING, _effective_severity=severity.PASSED)),
+            )
+            .order_by()
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            increment_outcome_counters(objs, using=self.db)
+        invalidate_aggregate_status({obj.validation_task_id for obj in objs})
+        return objs
+
+    def _task_ids(self, values=None):
+
+        task_ids = set(self.order_by().values_list("validation_task_id", flat=True).distinct())
+        if values:
+            task = values.get("validation_task", values.get("validation_task_id"))
+            task_ids.add(getattr(task, "pk", task))
+        return task_ids
+
+    def update(self, *args, **kwargs):
+        """
+        Updates the selected Outcomes, then recomputes the Outcome counters of the affected Validation Tasks
+        (and Validation Requests) and drops their cached statuses.
+        """
+
+        task_ids = self._task_ids(kwargs)
+        with transaction.atomic(using=self.db):
+            updated = super().update(*args, **kwargs)
+            if updated:
+                ValidationTask.objects.using(self.db).filter(id__in=task_ids).recompute_outcome_counters()
+        invalidate_aggregate_status(task_ids)
+        return updated
+
+    def delete(self):
+        """
+        Deletes the selected Outcomes, then recomputes the Outcome counters of the affected Validation Tasks
+        (and Validation Requests) and drops their cached statuses.
+        """
+
+        task_ids = self._task_ids()
+        with transaction.atomic(using=self.db):
+            deleted = super().delete()
+            if deleted[0]:
+                ValidationTask.objects.using(self.db).filter(id__in=task_ids).recompute_outcome_counters()
+        invalidate_aggregate_status(task_ids)
+        return deleted
+
+
+def increment_outcome_counters(outcomes, using=None):
+    """
+    Adds newly inserted Outcomes to the counters of their Validation Tasks and Validation Requests.
+    Falls back to a full recompute of the affected tasks if the database did not return primary keys.
+    """
+
+    task_ids = {o.validation_task_id for o in outcomes}
+    outcome_ids = [o.pk for o in outcomes]
+    if not outcome_ids:
+        return
+    if None in outcome_ids:
+        ValidationTask.objects.using(using).filter(id__in=task_ids).recompute_outcome_counters()
+        return
+
+    apply_outcome_counters(count_outcomes(outcome_ids, using=using), using=using)
+
+
+def count_outcomes(outcome_ids, using=None):
+    """
+    Returns {(Validation Task id, Validation Request id): {counter: count}} for the given Outcome ids.
+    """
+
+    totals = {}
+    for start in range(0, len(outcome_ids), OUTCOME_COUNTER_BATCH_SIZE):
+        rows = (
+            ValidationOutcome.objects.using(using)
+            .filter(id__in=outcome_ids[start:start + OUTCOME_COUNTER_BATCH_SIZE])
+            .outcome_counters("validation_task_id", "validation_task__request_id")
+        )
+        for row in rows:
+            key = (row["validation_task_id"], row["validation_task__request_id"])
+            total = totals.setdefault(key, dict.fromkeys(OUTCOME_COUNTER_FIELDS, 0))
+            for name in OUTCOME_COUNTER_FIELDS:
+                total[name] += row[name]
+    return totals
+
+
+def apply_outcome_counters(totals, sign=1, using=None):
+    """
+    Adds (sign=1) or subtracts (sign=-1) the result of count_outcomes() to/from the counters
+    of the Validation Tasks and Validation Requests.
+    """
+
+    for (task_id, request_id), total in totals.items():
+        increments = {name: F(name) + sign * total[name] for name in OUTCOME_COUNTER_FIELDS}
+        # not an audited change, hence the base manager
+        ValidationTask._base_manager.using(using).filter(id=task_id).update(**increments)
+        ValidationRequest._base_manager.using(using).filter(id=request_id).update(**increments)
+
 
 class ValidationOutcome(TimestampedBaseModel, IdObfuscator):
     """
@@ -1463,17 +2852,35 @@ class ValidationOutcome(TimestampedBaseModel, IdObfuscator):
         return f' '.join(f'{k}={repr(v)}' for k, v in members.items() if v is not None)
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "instance_id": self.instance_public_id,
-            "validation_task_id": self.validation_task_public_id,
-            "feature": self.feature,
-            "feature_version": self.feature_version,
-            "severity": self.get_severity_display(),  # Convert the integer to a human-readable string
-            "outcome_code": self.outcome_code,
-            "expected": self.expected,
-            "observed": self.observed,
-        }
+        return ValidationOutcome.to_dicts([self])[0]
+
+    @classmethod
+    def to_dicts(cls, outcomes):
+        """
+        Batch version of to_dict(), encoding all public ids at once. A queryset is annotated with its
+        effective severity (one query) rather than checking the whitelist per Outcome.
+        """
+
+        if isinstance(outcomes, QuerySet):
+            outcomes = outcomes.with_effective_severity()
+        outcomes = list(outcomes)
+        instance_ids = IdObfuscator.to_public_ids([o.instance_id for o in outcomes], override_cls=ModelInstance)
+        task_ids = IdObfuscator.to_public_ids([o.validation_task_id for o in outcomes], override_cls=ValidationTask)
+        labels = dict(ValidationOutcome.OutcomeSeverity.choices)
+        return [
+            {
+                "id": o.id,
+                "instance_id": instance_id,
+                "validation_task_id": task_id,
+                "feature": o.feature,
+                "feature_version": o.feature_version,
+                "severity": labels[o.effective_severity if hasattr(o, "effective_severity") else o.severity],
+                "outcome_code": o.outcome_code,
+                "expected": o.expected,
+                "observed": o.observed,
+            }
+            for o, instance_id, task_id in zip(outcomes, instance_ids, task_ids)
+        ]
 
     @property
     def instance_public_id(self):
@@ -1517,6 +2924,26 @@ class ValidationOutcome(TimestampedBaseModel, IdObfuscator):
             case _:
                 raise ValueError(f"Outcome code '{self.name}' not recognized")
 
+    def save(self, *args, **kwargs):
+
+        adding = self._state.adding
+        with transaction.atomic():
+            # an update might change the severity or task of the Outcome: take it out of the counters first
+            previous = {} if adding else count_outcomes([self.pk])
+            super().save(*args, **kwargs)
+            apply_outcome_counters(previous, sign=-1)
+            increment_outcome_counters([self])
+        invalidate_aggregate_status([self.validation_task_id, *(task_id for task_id, _ in previous)])
+
+    def delete(self, *args, **kwargs):
+
+        with transaction.atomic():
+            previous = count_outcomes([self.pk])
+            result = super().delete(*args, **kwargs)
+            apply_outcome_counters(previous, sign=-1)
+        invalidate_aggregate_status([self.validation_task_id])
+        return result
+
 
 class Version(TimestampedBaseModel):
     """
@@ -1557,6 +2984,514 @@ class Version(TimestampedBaseModel):
 
         return f"{self.name}"
 
+
+class OutcomeRollupQuerySet(models.QuerySet):
+
+    def counts(self, group_by=("produced_by", "schema"), bucket="day"):
+        """
+        Returns outcome counts per severity, grouped by the given rollup columns and time bucket.
+        bucket is one of 'day', 'week', 'month', 'quarter' or 'year'.
+        """
+
+        severity = ValidationOutcome.OutcomeSeverity
+        return (
+            self.annotate(bucket=Trunc("day", bucket, output_field=models.DateField()))
+            .values(*group_by, "bucket")
+            .annotate(
+                total=Sum("count"),
+                errors=Coalesce(Sum("count", filter=Q(severity=severity.ERROR)), 0),
+                warnings=Coalesce(Sum("count", filter=Q(severity=severity.WARNING)), 0),
+                passed=Coalesce(Sum("count", filter=Q(severity__in=[severity.PASSED, severity.EXECUTED])), 0),
+            )
+            .order_by(*group_by, "bucket")
+        )
+
+    def error_rates(self, group_by=("produced_by",), bucket="month"):
+        """
+        Returns the share of error outcomes per group and time bucket,
+        eg. OutcomeRollup.objects.filter(schema='IFC4X3').error_rates() for the error rate per Authoring Tool per month.
+        """
+
+        rows = list(self.counts(group_by=group_by, bucket=bucket))
+        for row in rows:
+            row["error_rate"] = row["errors"] / row["total"] if row["total"] else 0.0
+        return rows
+
+
+class OutcomeRollup(models.Model):
+    """
+    A model to store pre-aggregated Validation Outcome counts
+    per Authoring Tool, schema, task type, feature, day, severity and outcome code.
+    Counts are based on the stored severity (ie. not taking whitelisting into account).
+    """
+
+    objects = OutcomeRollupQuerySet.as_manager()
+
+    id = models.BigAutoField(
+        primary_key=True,
+        help_text="Identifier of the Outcome Rollup (auto-generated)."
+    )
+
+    produced_by = models.ForeignKey(
+        to=AuthoringTool,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="What tool was used to create the Models (optional).",
+    )
+
+    schema = models.CharField(
+        max_length=25,
+        null=False,
+        blank=True,
+        default="",
+        help_text="Schema of the Models (empty if unknown).",
+    )
+
+    task_type = models.CharField(
+        max_length=25,
+        choices=ValidationTask.Type.choices,
+        null=False,
+        blank=False,
+        help_text="Type of the Validation Task.",
+    )
+
+    feature = models.CharField(
+        max_length=1024,
+        null=False,
+        blank=True,
+        default="",
+        help_text="Name of the Gherkin Feature (empty if none).",
+    )
+
+    day = models.DateField(
+        null=False,
+        db_index=True,
+        help_text="Day the Validation Tasks ended.",
+    )
+
+    severity = models.PositiveSmallIntegerField(
+        choices=ValidationOutcome.OutcomeSeverity.choices,
+        null=False,
+        help_text="Severity of the Validation Outcomes.",
+    )
+
+    outcome_code = models.CharField(
+        max_length=10,
+        choices=ValidationOutcome.ValidationOutcomeCode.choices,
+        null=False,
+        help_text="Code of the Validation Outcomes.",
+    )
+
+    count = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of Validation Outcomes.",
+    )
+
+    KEY_FIELDS = ("produced_by_id", "schema", "task_type", "feature", "day", "severity", "outcome_code")
+    MERGE_BATCH_SIZE = 500
+
+    class Meta:
+
+        db_table = "ifc_outcome_rollup"
+        verbose_name = "Outcome Rollup"
+        verbose_name_plural = "Outcome Rollups"
+        indexes = [
+            models.Index(fields=["schema", "day"]),
+            models.Index(fields=["task_type", "day"]),
+        ]  # only add multi-column indexes here
+
+        constraints = [
+            # see AuthoringTool: Sqlite does not support NULLS NOT DISTINCT - hence workaround using two constraints
+            models.UniqueConstraint(
+                name="unique_outcome_rollup_key",
+                fields=["produced_by", "schema", "task_type", "feature", "day", "severity", "outcome_code"],
+            ),
+            models.UniqueConstraint(
+                name="unique_outcome_rollup_key_null",
+                fields=["schema", "task_type", "feature", "day", "severity", "outcome_code"],
+                condition=Q(produced_by__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+
+        return f"{self.day} - {self.task_type} - {self.feature} - {self.outcome_code}: {self.count}"
+
+    @staticmethod
+    def aggregate_outcomes(outcomes):
+        """
+        Groups Outcomes (of completed tasks) by rollup key, returning {key: count}.
+        """
+
+        rows = (
+            outcomes
+            .filter(validation_task__status=ValidationTask.Status.COMPLETED)
+            .annotate(
+                rollup_day=TruncDate("validation_task__ended"),
+                rollup_tool=F("validation_task__request__model__produced_by_id"),
+                rollup_schema=Coalesce("validation_task__request__model__schema", Value("")),
+                rollup_feature=Coalesce("feature", Value("")),
+            )
+            .values_list(
+                "rollup_tool", "rollup_schema", "validation_task__type", "rollup_feature",
+                "rollup_day", "severity_in_db", "outcome_code",
+            )
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        return {row[:-1]: row[-1] for row in rows}
+
+    @classmethod
+    def merge(cls, counts):
+        """
+        Adds {key: count} to the existing rollups, creating missing ones.
+        Safe for concurrent callers: missing rollups are inserted with a zero count (ignoring conflicts),
+        then all counts are incremented in the database, in a single UPDATE per MERGE_BATCH_SIZE keys.
+        """
+
+        if not counts:
+            return
+
+        items = list(counts.items())
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [cls(**dict(zip(cls.KEY_FIELDS, key)), count=0) for key, _ in items],
+                batch_size=cls.MERGE_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            for start in range(0, len(items), cls.MERGE_BATCH_SIZE):
+                batch = [(Q(**dict(zip(cls.KEY_FIELDS, key))), count) for key, count in items[start:start + cls.MERGE_BATCH_SIZE]]
+                cls.objects.filter(functools.reduce(operator.or_, (q for q, _ in batch))).update(
+                    count=F("count") + Case(*[When(q, then=Value(count)) for q, count in batch], default=Value(0))
+                )
+
+    @classmethod
+    def record_task(cls, task):
+        """
+        Incrementally adds the Outcomes of a completed Validation Task to the rollups (at most once per task).
+        """
+
+        if cls.record_tasks([task.id]):
+            task.is_rolled_up = True
+
+    @classmethod
+    def record_tasks(cls, task_ids):
+        """
+        Incrementally adds the Outcomes of completed Validation Tasks to the rollups (at most once per task).
+        Returns the ids of the tasks that were added.
+        """
+
+        with transaction.atomic():
+            # bookkeeping only, hence the base manager
+            tasks = ValidationTask._base_manager.filter(
+                id__in=task_ids,
+                status=ValidationTask.Status.COMPLETED,
+                is_rolled_up=False,
+            )
+            claimed = list(tasks.select_for_update().values_list("id", flat=True))
+            if claimed:
+                ValidationTask._base_manager.filter(id__in=claimed).update(is_rolled_up=True)
+                cls.merge(cls.aggregate_outcomes(ValidationOutcome.objects.filter(validation_task_id__in=claimed)))
+        return claimed
+
+    @classmethod
+    def rebuild_day(cls, day):
+        """
+        Recomputes all rollups of a single day from the Outcomes.
+        """
+
+        start = datetime.datetime.combine(day, datetime.time.min)
+        if settings.USE_TZ:
+            start = timezone.make_aware(start)
+        end = start + datetime.timedelta(days=1)
+
+        tasks = ValidationTask._base_manager.filter(
+            status=ValidationTask.Status.COMPLETED,
+            ended__gte=start,
+            ended__lt=end,
+        )
+        counts = cls.aggregate_outcomes(ValidationOutcome.objects.filter(validation_task__in=tasks))
+        with transaction.atomic():
+            cls.objects.filter(day=day).delete()
+            cls.objects.bulk_create(cls(**dict(zip(cls.KEY_FIELDS, key)), count=count) for key, count in counts.items())
+            tasks.update(is_rolled_up=True)
+        return len(counts)
+
+    @classmethod
+    def rebuild(cls, since, until, workers=1):
+        """
+        Recomputes all rollups for the days in [since, until], one day per unit of work.
+        With workers > 1 days are rebuilt in parallel, each thread using its own database connection.
+        """
+
+        days = [since + datetime.timedelta(days=n) for n in range((until - since).days + 1)]
+        if workers <= 1:
+            return sum(map(cls.rebuild_day, days))
+
+        def rebuild_day(day):
+            try:
+                return cls.rebuild_day(day)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(rebuild_day, days))
+
+
+class TaskResultQuerySet(models.QuerySet):
+
+    def lookup(self, content_hash, task_type, checker_version, feature_versions):
+        """
+        Returns the cached results for a file, task type, checker Version and {feature: version}
+        of the Gherkin Features that would be executed (as passed to TaskResult.store()), or None.
+        """
+
+        return self.filter(
+            content_hash=content_hash,
+            task_type=task_type,
+            checker_version=checker_version,
+            features_key=TaskResult.features_key_of(feature_versions),
+        ).select_related("source_task").first()
+
+    def invalidate_feature(self, feature, feature_version=None):
+        """
+        Deletes the entries with results of a Gherkin Feature (optionally: of one version only); returns their number.
+        """
+
+        features = TaskResultFeature.objects.filter(feature=feature)
+        if feature_version is not None:
+            features = features.filter(feature_version=feature_version)
+        _, deleted = self.filter(id__in=features.values("entry_id")).delete()
+        return deleted.get(TaskResult._meta.label, 0)
+
+    def evict(self, unused_for=None, max_entries=None):
+        """
+        Deletes entries that were not used for some time (a timedelta) and/or
+        all but the max_entries most recently used ones; returns the number of entries deleted.
+        """
+
+        deleted = 0
+        if unused_for is not None:
+            _, counts = self.filter(last_used__lt=timezone.now() - unused_for).delete()
+            deleted += counts.get(TaskResult._meta.label, 0)
+        if max_entries is not None:
+            keep = self.order_by("-last_used", "-id").values("id")[:max_entries]
+            _, counts = self.exclude(id__in=keep).delete()
+            deleted += counts.get(TaskResult._meta.label, 0)
+        return deleted
+
+
+class TaskResult(models.Model):
+    """
+    A model to cache the results of single Validation Tasks, keyed by file content hash, task type,
+    Version of the checker and the versions of the Gherkin Features it ran.
+    Entries point to the Validation Task that produced the results; reusing an entry copies its outcomes.
+    """
+
+    objects = TaskResultQuerySet.as_manager()
+
+    id = models.BigAutoField(
+        primary_key=True,
+        help_text="Identifier of the Task Result (auto-generated)."
+    )
+
+    content_hash = models.CharField(
+        max_length=64,
+        null=False,
+        blank=False,
+        help_text="SHA-256 hash of the file content.",
+    )
+
+    task_type = models.CharField(
+        max_length=25,
+        choices=ValidationTask.Type.choices,
+        null=False,
+        blank=False,
+        help_text="Type of the Validation Task.",
+    )
+
+    checker_version = models.ForeignKey(
+        to=Version,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=False,
+        help_text="Version of the checker that produced the results.",
+    )
+
+    features_key = models.CharField(
+        max_length=64,
+        null=False,
+        blank=False,
+        help_text="SHA-256 hash of the (sorted) versions of the Gherkin Features that were run.",
+    )
+
+    source_task = models.ForeignKey(
+        to=ValidationTask,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=False,
+        db_index=True,
+        help_text="Validation Task that produced the results.",
+    )
+
+    hits = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        help_text="Number of times the results were reused.",
+    )
+
+    created = models.DateTimeField(
+        auto_now_add=True,
+        null=False,
+        help_text="Timestamp this Task Result was created.",
+    )
+
+    last_used = models.DateTimeField(
+        default=timezone.now,
+        null=False,
+        db_index=True,
+        help_text="Timestamp this Task Result was last stored or reused.",
+    )
+
+    class Meta:
+
+        db_table = "ifc_task_result"
+        verbose_name = "Task Result"
+        verbose_name_plural = "Task Results"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_hash", "task_type", "checker_version", "features_key"],
+                name="unique_task_result",
+            ),
+        ]
+
+    def __str__(self):
+
+        return f"#{self.id} - {self.task_type} - {self.content_hash[:12]}"
+
+    @staticmethod
+    def features_key_of(feature_versions):
+
+        items = sorted((str(feature), str(version)) for feature, version in (feature_versions or {}).items())
+        return hashlib.sha256("\n".join(f"{feature}={version}" for feature, version in items).encode()).hexdigest()
+
+    @classmethod
+    def store(cls, task, checker_version, feature_versions):
+        """
+        Caches the results of a completed Validation Task whose request has a content hash.
+        feature_versions ({feature: version}) are all Gherkin Features the checker executed, including those
+        without outcomes; pass the same value to lookup(), as it is part of the key.
+        Returns the entry, or None when the task cannot be cached.
+        """
+
+        content_hash = task.request.content_hash
+        if not content_hash or task.status != ValidationTask.Status.COMPLETED:
+            return None
+
+        with transaction.atomic():
+            entry, _ = cls.objects.update_or_create(
+                content_hash=content_hash,
+                task_type=task.type,
+                checker_version=checker_version,
+                features_key=cls.features_key_of(feature_versions),
+                defaults={"source_task": task, "last_used": timezone.now()},
+            )
+            TaskResultFeature.objects.filter(entry=entry).delete()
+            TaskResultFeature.objects.bulk_create(
+                TaskResultFeature(entry=entry, feature=feature, feature_version=version)
+                for feature, version in feature_versions.items()
+            )
+        return entry
+
+    def reuse(self, task):
+        """
+        Completes a Validation Task with the cached results: outcomes are bulk copied from the source task
+        and linked to the instances of the task's Model with the same STEP ids. Returns the number of outcomes copied.
+        """
+
+        source = self.source_task
+        request = task.request
+        with transaction.atomic():
+            instance_ids = {}
+            referenced = ModelInstance.objects.filter(id__in=source.outcomes.filter(instance__isnull=False).values("instance_id"))
+            if referenced.exists():
+                if request.model_id is None:
+                    raise ValueError(f"Validation Request #{request.id} has no Model to link cached Validation Outcomes to.")
+                for start in range(0, referenced.count(), OUTCOME_COUNTER_BATCH_SIZE):
+                    batch = list(referenced.order_by("id")[start:start + OUTCOME_COUNTER_BATCH_SIZE])
+                    existing = dict(
+                        ModelInstance.objects.filter(model_id=request.model_id, stepfile_id__in=[i.stepfile_id for i in batch])
+                        .values_list("stepfile_id", "id")
+                    )
+                    missing = [i for i in batch if i.stepfile_id not in existing]
+                    clones = instance_fields.clone(missing, request.model_id)
+                    existing.update((clone.stepfile_id, clone.id) for clone in clones)
+                    instance_ids.update((i.id, existing[i.stepfile_id]) for i in batch)
+                ModelTypeHistogram.objects.refresh(request.model_id)
+
+            copied = {}
+            result_reuse.clone_in_batches(
+                source.outcomes.all(),
+                lambda outcome: ValidationOutcome(**result_reuse.clone_values(
+                    outcome,
+                    validation_task_id=task.id,
+                    instance_id=instance_ids.get(outcome.instance_id),
+                )),
+                ValidationOutcome,
+                copied,
+            )
+            task.refresh_from_db(fields=OUTCOME_COUNTER_FIELDS)
+            task.mark_as_completed(f"Results reused from Validation Task #{source.id} (cached).")
+            TaskResult.objects.filter(id=self.id).update(hits=F("hits") + 1, last_used=timezone.now())
+        return len(copied)
+
+
+class TaskResultFeature(models.Model):
+    """
+    A model to store the Gherkin Feature versions of a Task Result, to invalidate entries per feature (version).
+    """
+
+    id = models.BigAutoField(
+        primary_key=True,
+        help_text="Identifier of the Task Result Feature (auto-generated)."
+    )
+
+    entry = models.ForeignKey(
+        to=TaskResult,
+        on_delete=models.CASCADE,
+        related_name="features",
+        null=False,
+        db_index=True,
+        help_text="Task Result that contains results of this Gherkin Feature.",
+    )
+
+    feature = models.CharField(
+        max_length=1024,
+        null=False,
+        blank=False,
+        help_text="Name of the Gherkin Feature.",
+    )
+
+    feature_version = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="Version number of the Gherkin Feature.",
+    )
+
+    class Meta:
+
+        db_table = "ifc_task_result_feature"
+        verbose_name = "Task Result Feature"
+        verbose_name_plural = "Task Result Features"
+        indexes = [
+            models.Index(fields=["feature", "feature_version"]),
+        ]  # only add multi-column indexes here
+
+
 @dataclass
 class WhiteListEntryQueryBlock:
     q : Q
@@ -1630,6 +3565,36 @@ class WhiteListEntry(AuditedBaseModel):
     def __str__(self):
         return f"#{self.id}: {self.description}: {' | '.join(map(str, self.cached_fragments))}"
 
+    def save(self, *args, **kwargs):
+
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            invalidate_whitelist()
+            if adding:  # changing an entry itself does not change what it whitelists, its fragments do
+                recompute_whitelisted_counters(WhiteListEntry.whitelisted_task_ids(self.pk))
+
+    def delete(self, *args, **kwargs):
+
+        with transaction.atomic():
+            task_ids = WhiteListEntry.whitelisted_task_ids(self.pk)
+            result = super().delete(*args, **kwargs)
+            invalidate_whitelist()
+            recompute_whitelisted_counters(task_ids)
+        return result
+
+    @staticmethod
+    def whitelisted_task_ids(*entry_ids):
+        """
+        Returns the ids of the Validation Tasks with Outcomes that these entries (as stored) whitelist.
+        """
+
+        task_ids = set()
+        for entry in WhiteListEntry.objects.filter(pk__in=[id for id in entry_ids if id is not None]):
+            outcomes = entry.build().apply(ValidationOutcome.objects.filter(severity_in_db__gte=ValidationOutcome.OutcomeSeverity.WARNING))
+            task_ids.update(outcomes.order_by().values_list("validation_task_id", flat=True).distinct())
+        return task_ids
+
     def build(self, prefix=""):
         q = Q()
 
@@ -1641,7 +3606,7 @@ class WhiteListEntry(AuditedBaseModel):
             return key
 
         for f in self.cached_fragments:
-            col = prefix + f.column
+            col = prefix + f.lookup
             op = f.operation
             rhs = (f.right_hand_side or "").strip()
             kind = f.column_kind
@@ -1722,9 +3687,36 @@ class WhiteListQueryFragment(models.Model):
         OutcomeColumn.MODEL_SCHEMA: ColumnKind.TEXT,
     }
 
+    # columns that are stored elsewhere than their name suggests (eg. IFC Types in a lookup table)
+    _LOOKUP_BY_COLUMN = {
+        OutcomeColumn.INSTANCE_TYPE: 'instance__type__name',
+    }
+
     def __str__(self):
         return f"({self.column} {self.operation} {self.right_hand_side})"
 
+    def save(self, *args, **kwargs):
+
+        with transaction.atomic():
+            previous = WhiteListQueryFragment.objects.filter(pk=self.pk).values_list("whitelist_entry_id", flat=True).first() if self.pk else None
+            task_ids = WhiteListEntry.whitelisted_task_ids(previous, self.whitelist_entry_id)
+            super().save(*args, **kwargs)
+            invalidate_whitelist()
+            recompute_whitelisted_counters(task_ids | WhiteListEntry.whitelisted_task_ids(previous, self.whitelist_entry_id))
+
+    def delete(self, *args, **kwargs):
+
+        with transaction.atomic():
+            task_ids = WhiteListEntry.whitelisted_task_ids(self.whitelist_entry_id)
+            result = super().delete(*args, **kwargs)
+            invalidate_whitelist()
+            recompute_whitelisted_counters(task_ids | WhiteListEntry.whitelisted_task_ids(self.whitelist_entry_id))
+        return result
+
+    @property
+    def lookup(self) -> str:
+        return self._LOOKUP_BY_COLUMN.get(self.column, self.column)
+
     @property
     def column_kind(self) -> ColumnKind:
         try:
@@ -1743,6 +3735,14 @@ class WhiteListQueryFragment(models.Model):
             except (TypeError, ValueError):
                 raise ValidationError({"right_hand_side": f"RHS must be an integer for column '{self.column}'."})
         
+        if self.column == WhiteListQueryFragment.OutcomeColumn.INSTANCE_FIELDS:
+            try:
+                compressed = instance_fields.storage() == instance_fields.COMPRESSED
+            except ImproperlyConfigured:
+                compressed = True  # compressed storage, refused because of existing instance fields fragments
+            if compressed or ModelInstance.objects.filter(fields_offloaded=True).exists():
+                raise ValidationError({"column": "Instance fields cannot be whitelisted while they are stored compressed (see settings.INSTANCE_FIELDS_STORAGE)."})
+
         if self.operation == WhiteListQueryFragment.Operation.EQUALS:
             if self.column_kind == WhiteListQueryFragment.ColumnKind.JSON:
                 raise ValidationError({"operation": f"Equals is not supported for JSON column type on column '{self.column}'."})
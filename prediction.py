@@ -0,0 +1,202 @@
+import datetime
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.db.models import Count, Sum, Max, F, FloatField, Q
+from django.db.models.functions import Cast
+
+MB = 1024 * 1024
+
+ANY_SCHEMA = object()  # not None: tasks without a Model (schema) have their own fits
+
+
+@dataclass
+class LinearFit:
+    """
+    Running sums for an ordinary least squares fit of duration (seconds) on file size (MB).
+    """
+
+    n: int = 0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxy: float = 0.0
+    sxx: float = 0.0
+    max_y: float = 0.0
+
+    def add(self, other):
+
+        self.n += other.n
+        self.sx += other.sx
+        self.sy += other.sy
+        self.sxy += other.sxy
+        self.sxx += other.sxx
+        self.max_y = max(self.max_y, other.max_y)
+
+    @property
+    def coefficients(self):
+        """
+        Returns (intercept, slope); falls back to the mean duration without variance in size.
+        """
+
+        if self.n == 0:
+            return 0.0, 0.0
+        denominator = self.n * self.sxx - self.sx * self.sx
+        if self.n < 2 or abs(denominator) < 1e-9:
+            return self.sy / self.n, 0.0
+        slope = (self.n * self.sxy - self.sx * self.sy) / denominator
+        return (self.sy - slope * self.sx) / self.n, slope
+
+    def predict(self, size):
+
+        intercept, slope = self.coefficients
+        return max(intercept + slope * size / MB, 0.0)
+
+
+@dataclass
+class PredictedCost:
+    """
+    Predicted durations (seconds) of the tasks of a Validation Request.
+    total is the sum over all tasks (worker time), critical_path the wall time when tasks run in parallel.
+    """
+
+    tasks: dict = field(default_factory=dict)
+    total: float = 0.0
+    critical_path: float = 0.0
+
+
+class DurationPredictor:
+    """
+    Predicts task durations from the history of completed Validation Tasks, per (task type, schema),
+    with a linear model on the size of the file.
+    refresh() only aggregates tasks that completed since the previous refresh, so the model can be kept up to date cheaply.
+    As tasks may commit some time after their ended timestamp, each refresh looks back `overlap` seconds before
+    the latest ended timestamp seen, skipping the tasks (ids) that were already added.
+    Note: peak memory is not recorded for tasks, so only durations are predicted.
+    """
+
+    def __init__(self, default=60.0, overlap=300.0):
+
+        self.default = default
+        self.overlap = overlap
+        self.fits = {}  # (type, schema) -> LinearFit; schema ANY_SCHEMA aggregates all schemas
+        self.watermark = None
+        self.recent = {}  # task id -> ended, of the tasks added that ended within the overlap before the watermark
+        self.refreshed = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Adds the tasks that completed since the last refresh; returns the number of tasks added.
+        """
+
+        from .models import ValidationTask, DurationSeconds
+
+        tasks = ValidationTask.objects.filter(
+            status=ValidationTask.Status.COMPLETED,
+            started__isnull=False,
+            ended__isnull=False,
+        )
+        if self.watermark is not None:
+            tasks = tasks.filter(ended__gt=self.watermark - datetime.timedelta(seconds=self.overlap)).exclude(id__in=list(self.recent))
+        last = tasks.aggregate(last=Max("ended"))["last"]
+        if last is None:
+            self.refreshed = time.monotonic()
+            return 0
+
+        # only the ids of the tasks within the overlap are kept, to be skipped by the next refresh
+        since = max(filter(None, (self.watermark, last))) - datetime.timedelta(seconds=self.overlap)
+        recent = dict(tasks.filter(ended__gt=since).values_list("id", "ended"))
+
+        x = Cast(F("request__size"), FloatField()) / MB
+        y = DurationSeconds("started", "ended")
+        rows = (
+            tasks.filter(Q(ended__lte=since) | Q(id__in=list(recent)))
+            .values("type", "request__model__schema")
+            .annotate(
+                n=Count("id"),
+                sx=Sum(x),
+                sy=Sum(y),
+                sxy=Sum(x * y),
+                sxx=Sum(x * x),
+                max_y=Max(y),
+            )
+            .order_by()
+        )
+
+        added = 0
+        with self._lock:
+            for row in rows:
+                fit = LinearFit(**{k: row[k] or 0 for k in ("n", "sx", "sy", "sxy", "sxx", "max_y")})
+                for key in ((row["type"], row["request__model__schema"]), (row["type"], ANY_SCHEMA)):
+                    self.fits.setdefault(key, LinearFit()).add(fit)
+                added += fit.n
+            self.watermark = max(filter(None, (self.watermark, last, *recent.values())))
+            since = self.watermark - datetime.timedelta(seconds=self.overlap)
+            self.recent = {id: ended for id, ended in {**self.recent, **recent}.items() if ended > since}
+            self.refreshed = time.monotonic()
+        return added
+
+    def predict_task(self, type, size, schema=ANY_SCHEMA):
+
+        with self._lock:
+            for key in ((type, schema), (type, ANY_SCHEMA)):
+                fit = self.fits.get(key)
+                if fit is not None and fit.n:
+                    return fit.predict(size)
+        return self.default
+
+    def predict(self, request):
+        """
+        Returns the PredictedCost of a Validation Request, for its tasks (or all task types when it has none yet).
+        """
+
+        from .models import ValidationTask
+        from . import task_graph
+
+        schema = request.model.schema if request.model_id else ANY_SCHEMA
+        types = [task.type for task in request.tasks.all()] or list(ValidationTask.Type)
+        tasks = {type: self.predict_task(type, request.size, schema) for type in types}
+
+        finish = {}
+        for type in task_graph.topological_order():
+            if type in tasks:
+                before = max((finish[dep] for dep in task_graph.dependencies()[type] if dep in finish), default=0.0)
+                finish[type] = before + tasks[type]
+
+        return PredictedCost(tasks=tasks, total=sum(tasks.values()), critical_path=max(finish.values(), default=0.0))
+
+
+_predictor = None
+_predictor_lock = threading.Lock()
+
+
+def get_duration_predictor():
+    """
+    Returns the process-wide duration predictor, refreshed when older than settings.DURATION_MODEL_REFRESH_INTERVAL.
+    """
+
+    global _predictor
+    from .settings import DURATION_MODEL_REFRESH_INTERVAL
+
+    with _predictor_lock:
+        if _predictor is None:
+            _predictor = DurationPredictor()
+        predictor = _predictor
+    if predictor.refreshed is None or time.monotonic() - predictor.refreshed > DURATION_MODEL_REFRESH_INTERVAL:
+        predictor.refresh()
+    return predictor
+
+
+def set_duration_predictor(predictor):
+    """
+    Replaces the duration predictor (eg. in a unit test).
+    """
+
+    global _predictor
+    _predictor = predictor
+
+
+def predict(request):
+
+    return get_duration_predictor().predict(request)
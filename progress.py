@@ -0,0 +1,184 @@
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import Case, When, Value
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class ProgressWriterMetrics:
+    """
+    Counters reported by a progress writer.
+    """
+
+    reported: int = 0
+    written: int = 0
+    flushes: int = 0
+
+    @property
+    def coalesced(self):
+
+        return self.reported - self.written
+
+
+class ProgressWriter:
+    """
+    Coalesces progress updates of Validation Tasks and Validation Requests.
+    Updates can be reported from any thread; only the latest value per instance is kept
+    and written every interval_ms by a background thread, as one batched UPDATE per table.
+    Rows that reached a final status in the meantime are never overwritten.
+    """
+
+    def __init__(self, interval_ms=500, autostart=True):
+
+        self.interval = interval_ms / 1000
+        self.autostart = autostart
+        self.metrics = ProgressWriterMetrics()
+        self._pending = {}  # (model, id) -> (progress, user)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def report(self, model, id, progress):
+        """
+        Queues the progress of a single instance, replacing any value that was not written yet.
+        """
+
+        from .models import get_user_context, AuditedBaseModel
+
+        try:
+            user = get_user_context()
+        except ImproperlyConfigured:
+            if issubclass(model, AuditedBaseModel):
+                raise
+            user = None
+
+        with self._lock:
+            self._pending[(model, id)] = (progress, user)
+            self.metrics.reported += 1
+            if self.autostart and self._thread is None:
+                self.start()
+
+    def flush(self, model=None, ids=None):
+        """
+        Synchronously writes pending updates, optionally only those of a model (and ids).
+        """
+
+        with self._lock:
+            keys = [
+                key for key in self._pending
+                if (model is None or key[0] is model) and (ids is None or key[1] in ids)
+            ]
+            items = {key: self._pending.pop(key) for key in keys}
+        if items:
+            self._write(items)
+
+    def start(self):
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread, writing any pending updates first.
+        """
+
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def _run(self):
+
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    self.flush()
+                except Exception as err:
+                    logger.error(f"Failed to write progress updates: {err}", exc_info=err)
+        finally:
+            connection.close()
+
+    def _write(self, items):
+
+        from .models import get_user_context, set_user_context
+
+        groups = {}
+        for (model, id), (progress, user) in items.items():
+            groups.setdefault((model, user), []).append((id, progress))
+
+        try:
+            previous_user = get_user_context()
+        except ImproperlyConfigured:
+            previous_user = None
+
+        try:
+            for (model, user), updates in groups.items():
+                if user is not None:
+                    set_user_context(user)
+                for start in range(0, len(updates), BATCH_SIZE):
+                    batch = updates[start:start + BATCH_SIZE]
+                    model.objects.filter(
+                        id__in=[id for id, _ in batch]
+                    ).exclude(
+                        status__in=model.FINAL_STATUS_LIST
+                    ).update(
+                        progress=Case(
+                            *[When(id=id, then=Value(progress)) for id, progress in batch],
+                            output_field=model._meta.get_field("progress"),
+                        )
+                    )
+                with self._lock:
+                    self.metrics.written += len(updates)
+            with self._lock:
+                self.metrics.flushes += 1
+        finally:
+            if previous_user is not None:
+                set_user_context(previous_user)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_progress_writer():
+    """
+    Returns the process-wide progress writer.
+    Configured via settings.PROGRESS_FLUSH_INTERVAL_MS, default is 500 ms.
+    """
+
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from .settings import PROGRESS_FLUSH_INTERVAL_MS
+                _writer = ProgressWriter(interval_ms=PROGRESS_FLUSH_INTERVAL_MS)
+                atexit.register(_writer.stop)
+    return _writer
+
+
+def set_progress_writer(writer):
+    """
+    Replaces the progress writer (eg. in a unit test).
+    """
+
+    global _writer
+    _writer = writer
+
+
+def flush_pending(model, ids=None):
+    """
+    Synchronously writes pending progress updates of a model (and ids), if a progress writer is in use.
+    """
+
+    if _writer is not None:
+        _writer.flush(model, ids)
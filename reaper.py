@@ -0,0 +1,122 @@
+import datetime
+import functools
+import logging
+import operator
+import os
+import time
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+FAIL = "fail"
+REQUEUE = "requeue"
+
+PAST_TENSE = {FAIL: "failed", REQUEUE: "requeued"}
+
+
+@dataclass
+class ReapResult:
+    """
+    Outcome of a single reaper run; durations are in seconds.
+    """
+
+    timed_out: list = field(default_factory=list)
+    dead_process: list = field(default_factory=list)
+    tasks: list = field(default_factory=list)
+    requests: list = field(default_factory=list)
+    max_overdue: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def found(self):
+
+        return len(self.timed_out) + len(self.dead_process)
+
+
+def is_process_alive(pid):
+    """
+    Returns whether a process with this id exists on the local machine.
+    """
+
+    if os.name != "posix":
+        return True  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, but is owned by another user
+    return True
+
+
+def reap_stale_tasks(action=FAIL, timeout=None, check_pids=False, now=None):
+    """
+    Finds INITIATED Validation Tasks that started more than timeout seconds ago
+    (default: settings.TASK_TIMEOUT_LIMIT) or, with check_pids, whose process no longer exists
+    on this machine, and fails (action=FAIL) or requeues (action=REQUEUE) them in bulk.
+    Their Validation Requests are rolled forward: failed, or reset to PENDING to be claimed again.
+    Tasks that reach a final status, or are re-initiated, concurrently are left untouched:
+    the conditions they were found by are repeated in the UPDATE.
+    """
+
+    from .models import ValidationTask, ValidationRequest
+    from .settings import TASK_TIMEOUT_LIMIT
+
+    if action not in (FAIL, REQUEUE):
+        raise ValueError(f"Unknown action '{action}' (expected '{FAIL}' or '{REQUEUE}').")
+
+    start = time.monotonic()
+    now = now or timezone.now()
+    timeout = TASK_TIMEOUT_LIMIT if timeout is None else timeout
+    cutoff = now - datetime.timedelta(seconds=timeout)
+    result = ReapResult()
+
+    candidates = ValidationTask.objects.filter(status=ValidationTask.Status.INITIATED)
+    if not check_pids:
+        candidates = candidates.filter(started__lt=cutoff)
+    dead_pids = {}
+    for id, started, pid in candidates.values_list("id", "started", "process_id"):
+        if started is not None and started < cutoff:
+            result.timed_out.append(id)
+            result.max_overdue = max(result.max_overdue, (cutoff - started).total_seconds())
+        elif check_pids and pid is not None and not is_process_alive(pid):
+            result.dead_process.append(id)
+            dead_pids[id] = pid
+
+    reasons = {
+        f"Reaped: not completed within {timeout:.0f} seconds.": (result.timed_out, Q(started__lt=cutoff)),
+        "Reaped: worker process no longer exists.": (
+            result.dead_process,
+            functools.reduce(operator.or_, (Q(id=id, process_id=pid) for id, pid in dead_pids.items()), Q(pk__in=[])),
+        ),
+    }
+    with transaction.atomic():
+        for reason, (ids, still_stale) in reasons.items():
+            if not ids:
+                continue
+            tasks = ValidationTask.objects.filter(still_stale, id__in=ids, status=ValidationTask.Status.INITIATED)
+            if action == FAIL:
+                result.tasks += tasks.mark_as_failed(reason)
+            else:
+                result.tasks += tasks.mark_as_pending(reason)
+
+        if result.tasks:
+            requests = ValidationRequest.objects.filter(
+                id__in=ValidationTask.objects.filter(id__in=result.tasks).values("request_id")
+            )
+            if action == FAIL:
+                result.requests = requests.mark_as_failed("One or more Validation Tasks were reaped.")
+            else:
+                result.requests = requests.mark_as_pending("Requeued after one or more Validation Tasks were reaped.")
+
+    result.elapsed = time.monotonic() - start
+    if result.tasks:
+        logger.warning(
+            f"Reaped {len(result.tasks)} stale Validation Task(s) ({len(result.timed_out)} timed out, "
+            f"{len(result.dead_process)} without process); {PAST_TENSE[action]} {len(result.requests)} Validation Request(s)."
+        )
+    return result
@@ -0,0 +1,200 @@
+import hashlib
+import logging
+from dataclasses import dataclass, asdict
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 2000
+
+
+def compute_content_hash(file):
+    """
+    Returns the SHA-256 hash (hex) of a file, eg. an uploaded file, read in chunks; None when it cannot be read.
+    """
+
+    digest = hashlib.sha256()
+    try:
+        for chunk in file.chunks(CHUNK_SIZE):
+            digest.update(chunk)
+    except (OSError, ValueError):
+        return None
+    return digest.hexdigest()
+
+
+def find_source(request):
+    """
+    Returns the most recently completed Validation Request with the same content hash and validator Version, if any.
+    """
+
+    from .models import ValidationRequest
+
+    if not request.content_hash or request.validator_version_id is None:
+        return None
+    return (
+        ValidationRequest.objects.filter(
+            content_hash=request.content_hash,
+            validator_version_id=request.validator_version_id,
+            status=ValidationRequest.Status.COMPLETED,
+            deleted=False,
+            model__isnull=False,
+        )
+        .exclude(id=request.id)
+        .order_by("-completed", "-id")
+        .first()
+    )
+
+
+def clone_values(instance, **overrides):
+    """
+    Returns the field values of an instance to create a copy with, excluding its id and timestamps.
+    """
+
+    excluded = {"id", "created", "updated", *overrides}
+    values = {f.attname: getattr(instance, f.attname) for f in instance._meta.concrete_fields if f.name not in excluded and f.attname not in excluded}
+    values.update(overrides)
+    return values
+
+
+def clone_in_batches(queryset, make, model, id_map=None, create=None):
+    """
+    Bulk creates make(obj) for every obj in a queryset, in batches; optionally maps old to new ids in id_map.
+    Alternatively, create(batch) creates the clones of a whole batch (returning them in the same order).
+    """
+
+    batch = []
+
+    def flush():
+        clones = create(batch) if create is not None else model.objects.bulk_create([make(obj) for obj in batch])
+        if id_map is not None:
+            id_map.update(zip((obj.id for obj in batch), (clone.id for clone in clones)))
+        batch.clear()
+
+    for obj in queryset.order_by("id").iterator(chunk_size=BATCH_SIZE):
+        batch.append(obj)
+        if len(batch) == BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+
+def reuse_results(request, source):
+    """
+    Completes a Validation Request with the results of source: its Model, Model Instances,
+    Validation Tasks and Validation Outcomes are cloned in batches, in a single transaction.
+    """
+
+    from . import instance_fields
+    from .models import Model, ModelInstance, ModelTypeHistogram, ValidationTask, ValidationOutcome, OutcomeRollup, OUTCOME_COUNTER_FIELDS
+
+    with transaction.atomic():
+        model = Model.objects.create(**clone_values(
+            source.model,
+            file_name=request.file_name,
+            file=request.file.name if request.file else None,
+            uploaded_by_id=request.created_by_id,
+        ))
+
+        instance_ids = {}
+        clone_in_batches(
+            source.model.instances.all(),
+            None,
+            ModelInstance,
+            instance_ids,
+            create=lambda batch: instance_fields.clone(batch, model.id),
+        )
+        ModelTypeHistogram.objects.copy(source.model, model)  # also complete for partially materialized Models
+
+        now = timezone.now()
+        task_ids = {}
+        clone_in_batches(
+            source.tasks.all(),
+            lambda task: ValidationTask(**clone_values(
+                task,
+                request_id=request.id,
+                started=None,
+                ended=now,
+                process_id=None,
+                process_cmd=None,
+                is_rolled_up=False,
+                row_version=0,
+                **dict.fromkeys(OUTCOME_COUNTER_FIELDS, 0),
+            )),
+            ValidationTask,
+            task_ids,
+        )
+
+        clone_in_batches(
+            ValidationOutcome.objects.filter(validation_task__request_id=source.id),
+            lambda outcome: ValidationOutcome(**clone_values(
+                outcome,
+                validation_task_id=task_ids[outcome.validation_task_id],
+                instance_id=instance_ids.get(outcome.instance_id),
+            )),
+            ValidationOutcome,
+        )
+        OutcomeRollup.record_tasks(list(task_ids.values()))
+
+        request.refresh_from_db(fields=OUTCOME_COUNTER_FIELDS)
+        request.model = model
+        request.reused_from_id = source.reused_from_id or source.id  # the Validation Request that actually ran
+        request.started = now
+        request.mark_as_completed(f"Results reused from Validation Request #{request.reused_from_id} (identical file and Version).")
+
+    logger.info(f"Reused results of Validation Request #{source.id} for #{request.id} ({len(task_ids)} tasks, {len(instance_ids)} instances).")
+    return request
+
+
+def try_reuse(request):
+    """
+    Completes a Validation Request with the results of an identical, completed one (same content hash and Version).
+    Returns the Validation Request whose results were reused, or None when it needs to be validated.
+    """
+
+    source = find_source(request)
+    if source is None:
+        return None
+    reuse_results(request, source)
+    return source
+
+
+@dataclass
+class ReuseStats:
+    """
+    Result reuse counters; saved_seconds is the task time (ended - started) of the reused Validation Requests.
+    """
+
+    requests: int = 0
+    hits: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self):
+
+        return self.hits / self.requests if self.requests else 0.0
+
+    def as_dict(self):
+
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+def reuse_stats(since=None):
+    """
+    Returns ReuseStats of the Validation Requests with a content hash (created since a timestamp).
+    """
+
+    from .models import ValidationRequest, ValidationTask
+
+    requests = ValidationRequest.objects.filter(content_hash__isnull=False)
+    reuses = Q(request__reuses__isnull=False)
+    if since is not None:
+        requests = requests.filter(created__gte=since)
+        reuses &= Q(request__reuses__created__gte=since)
+
+    counts = requests.aggregate(requests=Count("id"), hits=Count("id", filter=Q(reused_from__isnull=False)))
+    saved = ValidationTask.objects.filter(reuses).with_duration().aggregate(seconds=Sum("duration_seconds"))["seconds"]
+    return ReuseStats(requests=counts["requests"], hits=counts["hits"], saved_seconds=saved or 0.0)
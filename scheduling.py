@@ -0,0 +1,191 @@
+import datetime
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db.models import Count
+from django.utils import timezone
+
+MB = 1024 * 1024
+
+
+@dataclass
+class SchedulingPolicy:
+    """
+    Orders pending Validation Requests by a score expressed in seconds of (virtual) waiting time:
+
+        score = aging_weight * seconds waited
+              + channel_priority[channel]
+              - size_weight * log2(1 + size in MB)            (shortest expected job first)
+              - fair_share_weight * requests running for user  (per-user fair share)
+
+    Requests are picked greedily, highest score first; every pick counts as a running request of its user.
+    Only the oldest `window` pending requests per channel and the `window` smallest ones are considered,
+    so selection reads a bounded number of rows from the (status, channel, created) and (status, size) indexes.
+    """
+
+    channel_priority: dict = field(default_factory=lambda: {"WEBUI": 300.0, "API": 0.0})
+    size_weight: float = 60.0
+    fair_share_weight: float = 120.0
+    aging_weight: float = 1.0
+    window: int = 100
+
+    def score(self, request, now, running):
+
+        waited = max((now - request.created).total_seconds(), 0.0)
+        return (
+            self.aging_weight * waited
+            + self.channel_priority.get(request.channel, 0.0)
+            - self.size_weight * math.log2(1 + request.size / MB)
+            - self.fair_share_weight * running.get(request.created_by_id, 0)
+        )
+
+    def order(self, candidates, now=None, running=None, n=None):
+        """
+        Returns (up to n of) the candidates in dispatch order.
+        running maps user ids to their number of running requests.
+        """
+
+        now = now or timezone.now()
+        running = Counter(running or {})
+        remaining = list(candidates)
+        ordered = []
+        while remaining and (n is None or len(ordered) < n):
+            best = max(remaining, key=lambda r: (self.score(r, now, running), -r.created.timestamp(), -r.id))
+            remaining.remove(best)
+            ordered.append(best)
+            running[best.created_by_id] += 1
+        return ordered
+
+    def candidates(self, pending, lock=False):
+        """
+        Returns the candidate Validation Requests of a queryset of pending requests.
+        With lock=True (inside a transaction), candidates are locked with SELECT ... FOR UPDATE SKIP LOCKED,
+        so that rows locked by other workers are skipped and each window is filled with the next ones.
+        """
+
+        from .models import ValidationRequest
+
+        fields = ("id", "created", "channel", "size", "created_by_id")
+        pending = pending.only(*fields)
+        if lock:
+            pending = pending.select_for_update(skip_locked=True)
+        candidates = {}
+        for channel in ValidationRequest.Channel.values:
+            for request in pending.filter(channel=channel).order_by("created", "id")[:self.window]:
+                candidates[request.id] = request
+        for request in pending.order_by("size", "id")[:self.window]:
+            candidates[request.id] = request
+        return list(candidates.values())
+
+    def select(self, pending, n, lock=False):
+        """
+        Returns the next n Validation Requests of a queryset of pending requests, in dispatch order
+        (see candidates() for lock).
+        """
+
+        from .models import ValidationRequest
+
+        running = dict(
+            ValidationRequest.objects.filter(status=ValidationRequest.Status.INITIATED)
+            .values_list("created_by_id")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        return self.order(self.candidates(pending, lock=lock), running=running, n=n)
+
+
+FIFO = SchedulingPolicy(channel_priority={}, size_weight=0.0, fair_share_weight=0.0)
+
+
+@dataclass
+class SimulatedRequest:
+    """
+    A Validation Request as seen by the scheduler, for offline simulation.
+    """
+
+    id: int
+    created: datetime.datetime
+    channel: str
+    size: int
+    created_by_id: int
+
+
+@dataclass
+class SimulationResult:
+    """
+    Waiting times (seconds) per request, plus the time the last request finished.
+    """
+
+    waits: dict
+    makespan: float
+    requests: list
+
+    def _percentile(self, values, q):
+
+        values = sorted(values)
+        return values[min(int(q * len(values)), len(values) - 1)] if values else 0.0
+
+    def summary(self, by="channel"):
+        """
+        Returns {group: {count, mean_wait, p95_wait, max_wait}}, grouped by a request attribute.
+        """
+
+        groups = {}
+        for request in self.requests:
+            groups.setdefault(getattr(request, by), []).append(self.waits[request.id])
+        return {
+            key: {
+                "count": len(waits),
+                "mean_wait": sum(waits) / len(waits),
+                "p95_wait": self._percentile(waits, 0.95),
+                "max_wait": max(waits),
+            }
+            for key, waits in groups.items()
+        }
+
+
+def simulate(policy, requests, workers=4, throughput=10 * MB, overhead=5.0):
+    """
+    Replays requests (arriving at their created timestamp) against a number of workers
+    dispatching by policy; a request takes overhead + size / throughput seconds.
+    """
+
+    requests = sorted(requests, key=lambda r: (r.created, r.id))
+    if not requests:
+        return SimulationResult(waits={}, makespan=0.0, requests=[])
+
+    start = requests[0].created
+    at = lambda t: start + datetime.timedelta(seconds=t)
+    arrivals = [((r.created - start).total_seconds(), r) for r in requests]
+
+    free, busy = workers, []  # busy: heap of (finish time, user id)
+    running = Counter()
+    pending, waits = [], {}
+    clock, i = 0.0, 0
+
+    while i < len(arrivals) or pending or busy:
+        while i < len(arrivals) and arrivals[i][0] <= clock:
+            pending.append(arrivals[i][1])
+            i += 1
+        while busy and busy[0][0] <= clock:
+            _, user = heapq.heappop(busy)
+            running[user] -= 1
+            free += 1
+
+        if free and pending:
+            for request in policy.order(pending, now=at(clock), running=running, n=free):
+                pending.remove(request)
+                waits[request.id] = clock - (request.created - start).total_seconds()
+                heapq.heappush(busy, (clock + overhead + request.size / throughput, request.created_by_id))
+                running[request.created_by_id] += 1
+                free -= 1
+            continue
+
+        next_events = [t for t, _ in arrivals[i:i + 1]] + [t for t, _ in busy[:1]]
+        if not next_events:
+            break
+        clock = max(clock, min(next_events))
+
+    return SimulationResult(waits=waits, makespan=clock, requests=requests)
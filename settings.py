@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 from django.core.exceptions import ImproperlyConfigured
@@ -18,3 +19,37 @@ try:
 except Exception as err:
     msg = "Configuration for MEDIA_ROOT is invalid: '{}' does not exist and could not be created ({})."
     raise ImproperlyConfigured(msg.format(MEDIA_ROOT, err))
+
+# cache for aggregate statuses of tasks and models: 'none', 'local' (process-local LRU) or 'django' (Django cache framework)
+STATUS_CACHE_BACKEND = os.environ.get("STATUS_CACHE_BACKEND", "none")
+STATUS_CACHE_MAX_ENTRIES = int(os.environ.get("STATUS_CACHE_MAX_ENTRIES", 10_000))
+STATUS_CACHE_ALIAS = os.environ.get("STATUS_CACHE_ALIAS", "default")
+STATUS_CACHE_TIMEOUT = float(os.environ.get("STATUS_CACHE_TIMEOUT", 24 * 60 * 60))  # 1 day
+
+# interval at which coalesced progress updates are written
+PROGRESS_FLUSH_INTERVAL_MS = int(os.environ.get("PROGRESS_FLUSH_INTERVAL_MS", 500))
+
+# location of the lock files used by keyed locks on databases without advisory locks (eg. Sqlite)
+LOCK_DIR = os.environ.get("LOCK_DIR", os.path.join(tempfile.gettempdir(), "ifc_validation_locks"))
+try:
+    os.makedirs(LOCK_DIR, exist_ok=True)
+except Exception as err:
+    msg = "Configuration for LOCK_DIR is invalid: '{}' does not exist and could not be created ({})."
+    raise ImproperlyConfigured(msg.format(LOCK_DIR, err))
+
+# number of lock files in LOCK_DIR that keys are hashed onto
+LOCK_FILES = int(os.environ.get("LOCK_FILES", 1024))
+
+# interval at which the duration predictor adds recently completed tasks
+DURATION_MODEL_REFRESH_INTERVAL = float(os.environ.get("DURATION_MODEL_REFRESH_INTERVAL", 15 * 60))  # 15 min
+
+# per-task result cache entries not reused for this many days are evicted (see evict_task_results)
+TASK_RESULT_RETENTION_DAYS = int(os.environ.get("TASK_RESULT_RETENTION_DAYS", 90))
+
+# 'eager': create all Model Instances of a file; 'lazy': only those referenced by a Validation Outcome (see materialization)
+INSTANCE_MATERIALIZATION = os.environ.get("INSTANCE_MATERIALIZATION", "eager")
+
+# where new Model Instance fields are stored: 'inline' (JSON column) or 'compressed' (side table, see offload_instance_fields)
+# note: whitelist fragments on 'instance__fields' only match inline fields: with 'compressed', storing or offloading fields
+# raises ImproperlyConfigured while any exist, and validating a new one (WhiteListQueryFragment.clean) raises ValidationError
+INSTANCE_FIELDS_STORAGE = os.environ.get("INSTANCE_FIELDS_STORAGE", "inline")
@@ -0,0 +1,322 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+from django.core.cache import caches
+from django.db import transaction
+
+TASK = "task"
+MODEL = "model"
+
+MISSING = object()
+
+
+@dataclass
+class StatusCacheMetrics:
+    """
+    Counters reported by a status cache backend.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self):
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class StatusCacheBackend:
+    """
+    Base class for caches of aggregate statuses, keyed by (kind, id).
+    kind is either TASK (value: aggregate status) or MODEL (value: {task_type: aggregate status}).
+    """
+
+    enabled = True
+
+    def __init__(self):
+
+        self.metrics = StatusCacheMetrics()
+        self._metrics_lock = threading.Lock()
+
+    def _count(self, name, n=1):
+
+        with self._metrics_lock:
+            setattr(self.metrics, name, getattr(self.metrics, name) + n)
+
+    def get(self, kind, id):
+
+        raise NotImplementedError
+
+    def set(self, kind, id, value):
+
+        raise NotImplementedError
+
+    def delete_many(self, keys):
+
+        raise NotImplementedError
+
+    def clear(self):
+
+        raise NotImplementedError
+
+    def version(self):
+        """
+        Returns a number that changes with every invalidation (delete_many() or clear()).
+        """
+
+        raise NotImplementedError
+
+    def get_or_compute(self, kind, id, compute):
+        """
+        Returns the cached value for (kind, id), calling compute() and caching its result on a miss.
+        The result is not cached if an invalidation happened while computing it, as it might be based on stale rows.
+        """
+
+        value = self.get(kind, id)
+        if value is MISSING:
+            self._count("misses")
+            version = self.version()
+            value = compute()
+            if self.version() == version:
+                self.set(kind, id, value)
+        else:
+            self._count("hits")
+        return value
+
+
+class NullStatusCache(StatusCacheBackend):
+    """
+    Backend that never caches; every lookup is a miss.
+    """
+
+    enabled = False
+
+    def get(self, kind, id):
+
+        return MISSING
+
+    def set(self, kind, id, value):
+
+        pass
+
+    def delete_many(self, keys):
+
+        pass
+
+    def clear(self):
+
+        pass
+
+    def version(self):
+
+        return 0
+
+
+class LocalLRUStatusCache(StatusCacheBackend):
+    """
+    Process-local, size-bounded LRU cache.
+    Note: invalidation is only seen by the process doing the writes;
+    use DjangoStatusCache when statuses are read and written by different processes.
+    """
+
+    def __init__(self, max_entries=10_000):
+
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def get(self, kind, id):
+
+        with self._lock:
+            try:
+                self._entries.move_to_end((kind, id))
+                return self._entries[(kind, id)]
+            except KeyError:
+                return MISSING
+
+    def set(self, kind, id, value):
+
+        evicted = 0
+        with self._lock:
+            self._entries[(kind, id)] = value
+            self._entries.move_to_end((kind, id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._count("evictions", evicted)
+
+    def delete_many(self, keys):
+
+        removed = 0
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if self._entries.pop(key, MISSING) is not MISSING:
+                    removed += 1
+        if removed:
+            self._count("invalidations", removed)
+
+    def clear(self):
+
+        with self._lock:
+            self._version += 1
+            removed = len(self._entries)
+            self._entries.clear()
+        if removed:
+            self._count("invalidations", removed)
+
+    def version(self):
+
+        return self._version
+
+    def __len__(self):
+
+        return len(self._entries)
+
+
+class DjangoStatusCache(StatusCacheBackend):
+    """
+    Backend on top of the Django cache framework (eg. Redis or Memcached), shared across processes.
+    clear() bumps a generation number that is part of every key instead of flushing the whole cache.
+    Evictions are handled by the cache server itself and are therefore not counted.
+    """
+
+    GENERATION_KEY = "ifc_status:generation"
+    VERSION_KEY = "ifc_status:version"
+
+    def __init__(self, alias="default", timeout=None):
+
+        super().__init__()
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def _generation(self):
+
+        return self.cache.get_or_set(self.GENERATION_KEY, 1, timeout=None)
+
+    def _key(self, generation, kind, id):
+
+        return f"ifc_status:{generation}:{kind}:{id}"
+
+    def get(self, kind, id):
+
+        return self.cache.get(self._key(self._generation(), kind, id), MISSING)
+
+    def set(self, kind, id, value):
+
+        self.cache.set(self._key(self._generation(), kind, id), value, timeout=self.timeout)
+
+    def delete_many(self, keys):
+
+        keys = list(keys)
+        if keys:
+            self._bump_version()  # before deleting: computations that started earlier will not be cached
+            generation = self._generation()
+            self.cache.delete_many([self._key(generation, kind, id) for kind, id in keys])
+            self._count("invalidations", len(keys))
+
+    def clear(self):
+
+        self._bump_version()
+        try:
+            self.cache.incr(self.GENERATION_KEY)
+        except ValueError:
+            self.cache.set(self.GENERATION_KEY, 2, timeout=None)
+        self._count("invalidations")
+
+    def _bump_version(self):
+
+        try:
+            self.cache.incr(self.VERSION_KEY)
+        except ValueError:
+            self.cache.set(self.VERSION_KEY, 1, timeout=None)
+
+    def version(self):
+
+        return self.cache.get(self.VERSION_KEY, 0)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_status_cache(name, **kwargs):
+    """
+    Instantiates a status cache backend by name: 'none', 'local' or 'django'.
+    """
+
+    backends = {
+        "none": NullStatusCache,
+        "local": LocalLRUStatusCache,
+        "django": DjangoStatusCache,
+    }
+    try:
+        return backends[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown status cache backend '{name}' (expected one of {', '.join(backends)}).")
+
+
+def get_status_cache():
+    """
+    Returns the configured status cache backend.
+    Configured via settings.STATUS_CACHE_BACKEND, default is 'none'.
+    """
+
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                from .settings import STATUS_CACHE_BACKEND, STATUS_CACHE_MAX_ENTRIES, STATUS_CACHE_ALIAS, STATUS_CACHE_TIMEOUT
+                kwargs = {
+                    "local": {"max_entries": STATUS_CACHE_MAX_ENTRIES},
+                    "django": {"alias": STATUS_CACHE_ALIAS, "timeout": STATUS_CACHE_TIMEOUT},
+                }.get(STATUS_CACHE_BACKEND, {})
+                _backend = create_status_cache(STATUS_CACHE_BACKEND, **kwargs)
+    return _backend
+
+
+def set_status_cache(backend):
+    """
+    Replaces the status cache backend (eg. in a worker process or unit test).
+    """
+
+    global _backend
+    _backend = backend
+
+
+def invalidate(task_ids=(), model_ids=()):
+    """
+    Drops cached statuses once the current transaction commits (immediately outside of a transaction),
+    so that other processes cannot re-cache statuses computed from rows that are not committed yet.
+    """
+
+    keys = [(TASK, id) for id in task_ids] + [(MODEL, id) for id in model_ids if id is not None]
+    if keys:
+        transaction.on_commit(lambda: get_status_cache().delete_many(keys))
+
+
+def invalidate_all():
+    """
+    Drops all cached statuses once the current transaction commits (immediately outside of a transaction).
+    """
+
+    transaction.on_commit(lambda: get_status_cache().clear())
+
+
+def metrics():
+    """
+    Returns hit/miss/eviction counters of the active backend.
+    """
+
+    return get_status_cache().metrics.as_dict()
@@ -0,0 +1,154 @@
+import functools
+from graphlib import TopologicalSorter
+
+from django.db.models import Exists, OuterRef, Q
+
+
+def _types():
+
+    from .models import ValidationTask
+    return ValidationTask.Type
+
+
+@functools.cache
+def dependencies():
+    """
+    Returns {task type: prerequisite task types}: a task can run once all of its prerequisites
+    (that exist for the same Validation Request) have completed - see all_prerequisites().
+    """
+
+    T = _types()
+    return {
+        T.MAGIC_AND_CLAMAV: (),
+        T.HEADER_SYNTAX: (T.MAGIC_AND_CLAMAV,),
+        T.HEADER: (T.HEADER_SYNTAX,),
+        T.SYNTAX: (T.MAGIC_AND_CLAMAV,),
+        T.PARSE_INFO: (T.SYNTAX,),
+        T.SCHEMA: (T.SYNTAX,),
+        T.MVD: (T.SYNTAX,),
+        T.DIGITAL_SIGNATURES: (T.SYNTAX,),
+        T.PREREQUISITES: (T.SYNTAX, T.HEADER),
+        T.BSDD: (T.PREREQUISITES,),
+        T.NORMATIVE_IA: (T.PREREQUISITES,),
+        T.NORMATIVE_IP: (T.PREREQUISITES,),
+        T.INDUSTRY_PRACTICES: (T.PREREQUISITES,),
+        T.INSTANCE_COMPLETION: (T.SCHEMA, T.NORMATIVE_IA, T.NORMATIVE_IP, T.INDUSTRY_PRACTICES, T.BSDD),
+    }
+
+
+@functools.cache
+def all_prerequisites():
+    """
+    Returns {task type: direct and indirect prerequisite task types} (the transitive closure of dependencies()),
+    so that a task does not become ready while eg. SYNTAX is pending and the PREREQUISITES task in between does not exist.
+    """
+
+    closure = {}
+    for type in topological_order():
+        closure[type] = frozenset().union(*({dep} | closure[dep] for dep in dependencies()[type]))
+    return closure
+
+
+@functools.cache
+def topological_order():
+    """
+    Returns all task types, each after its prerequisites; raises graphlib.CycleError for a cyclic graph.
+    """
+
+    return tuple(TopologicalSorter(dependencies()).static_order())
+
+
+def satisfied_statuses():
+
+    from .models import ValidationTask
+    return [ValidationTask.Status.COMPLETED, ValidationTask.Status.NOT_APPLICABLE]
+
+
+def _no_prerequisite_matching(status_filter):
+
+    from .models import ValidationTask
+
+    conditions = Q(type__in=[t for t, deps in all_prerequisites().items() if not deps])
+    for type, deps in all_prerequisites().items():
+        if deps:
+            conditions |= Q(type=type) & ~Exists(
+                ValidationTask.objects.filter(request_id=OuterRef("request_id"), type__in=deps).filter(status_filter)
+            )
+    return conditions
+
+
+def ready_tasks(request_ids):
+    """
+    Returns the PENDING Validation Tasks of these Validation Requests whose prerequisites have all completed,
+    as a single query; these tasks can be dispatched in parallel.
+    """
+
+    from .models import ValidationTask
+
+    return ValidationTask.objects.filter(
+        _no_prerequisite_matching(~Q(status__in=satisfied_statuses())),
+        request_id__in=request_ids,
+        status=ValidationTask.Status.PENDING,
+    )
+
+
+def blocked_tasks(request_ids):
+    """
+    Returns the PENDING Validation Tasks of these Validation Requests with a prerequisite that failed or was skipped;
+    these tasks will never become ready.
+    """
+
+    from .models import ValidationTask
+
+    blocking = [ValidationTask.Status.FAILED, ValidationTask.Status.SKIPPED]
+    return ValidationTask.objects.filter(
+        request_id__in=request_ids,
+        status=ValidationTask.Status.PENDING,
+    ).exclude(
+        _no_prerequisite_matching(Q(status__in=blocking))
+    )
+
+
+def skip_blocked_tasks(request_ids, reason="A prerequisite Validation Task failed or was skipped."):
+    """
+    Marks blocked tasks (and, transitively, the tasks depending on them) as SKIPPED; returns their ids.
+    """
+
+    skipped = []
+    while ids := blocked_tasks(request_ids).mark_as_skipped(reason):
+        skipped += ids
+    return skipped
+
+
+def critical_paths(request_ids):
+    """
+    Returns {request id: (task types, seconds)}: the longest chain of dependent tasks of each Validation Request,
+    weighted by the measured durations (ended - started) of its tasks; tasks that did not run are left out.
+    Comparing it to the wall time of a request shows how much parallelism was left unused.
+    """
+
+    from .models import ValidationTask
+
+    durations = {}
+    for request_id, type, started, ended in ValidationTask.objects.filter(
+        request_id__in=request_ids,
+        started__isnull=False,
+        ended__isnull=False,
+    ).values_list("request_id", "type", "started", "ended"):
+        durations.setdefault(request_id, {})[type] = (ended - started).total_seconds()
+
+    paths = {}
+    for request_id, by_type in durations.items():
+        longest = {}  # type -> (seconds, path)
+        for type in topological_order():
+            if type not in by_type:
+                continue
+            before = max(
+                (longest[dep] for dep in all_prerequisites()[type] if dep in longest),
+                default=(0.0, ()),
+                key=lambda item: item[0],
+            )
+            longest[type] = (before[0] + by_type[type], before[1] + (type,))
+        seconds, path = max(longest.values(), key=lambda item: item[0])
+        paths[request_id] = (list(path), seconds)
+    return paths
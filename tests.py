@@ -1,11 +1,45 @@
-from django.test import TestCase
+from array import array
+import datetime
+import io
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth.models import User
-from django.db.utils import IntegrityError
+from django.db.utils import IntegrityError, OperationalError
+from django.db.transaction import TransactionManagementError
 
 from apps.ifc_validation_models.models import ValidationRequest, ValidationTask  # TODO: for now needs to be absolute!
-from apps.ifc_validation_models.models import Company, AuthoringTool, Model
+from apps.ifc_validation_models.models import Company, AuthoringTool, Model, ModelInstance, ModelInstanceFields, ModelTypeHistogram, IfcType, Version
 from apps.ifc_validation_models.models import UserAdditionalInfo
 from apps.ifc_validation_models.models import set_user_context
+from apps.ifc_validation_models.models import ValidationOutcome, WhiteListEntry, WhiteListQueryFragment
+from apps.ifc_validation_models.models import OutcomeRollup
+from apps.ifc_validation_models.models import TaskResult
+from apps.ifc_validation_models.models import ConcurrentModificationError, DurationSeconds, IdObfuscator
+from apps.ifc_validation_models.decorators import retry_on_conflict, requires_django_keyed_lock
+from apps.ifc_validation_models import locks
+from apps.ifc_validation_models import instance_ids
+from apps.ifc_validation_models import instance_fields
+from apps.ifc_validation_models import materialization
+from apps.ifc_validation_models import scheduling
+from apps.ifc_validation_models import reaper
+from apps.ifc_validation_models import task_graph
+from apps.ifc_validation_models import prediction
+from apps.ifc_validation_models import analytics
+from apps.ifc_validation_models import result_reuse
+from apps.ifc_validation_models import status_cache
+from apps.ifc_validation_models import progress as progress_writer
 
 class ValidationModelsTestCase(TestCase):
 
@@ -475,4 +509,2260 @@ class ValidationModelsTestCase(TestCase):
         result = UserAdditionalInfo.find_user_by_username('jane')
 
         # assert
-        self.assertIsNone(result)
\ No newline at end of file
+        self.assertIsNone(result)
+
+
+class StatusCacheTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.cache = status_cache.LocalLRUStatusCache(max_entries=100)
+        status_cache.set_status_cache(self.cache)
+
+    def tearDown(self):
+        status_cache.set_status_cache(None)
+
+    def create_model_with_task(self):
+        user = User.objects.get(id=1)
+        model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=user, schema='IFC4')
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024, model=model)
+        task = ValidationTask.objects.create(request=request, type=ValidationTask.Type.SCHEMA)
+        return model, task
+
+    def test_lru_evicts_least_recently_used_entry(self):
+
+        # arrange
+        cache = status_cache.LocalLRUStatusCache(max_entries=2)
+        cache.set(status_cache.TASK, 1, Model.Status.VALID)
+        cache.set(status_cache.TASK, 2, Model.Status.VALID)
+
+        # act
+        cache.get(status_cache.TASK, 1)
+        cache.set(status_cache.TASK, 3, Model.Status.INVALID)
+
+        # assert
+        self.assertEqual(cache.get(status_cache.TASK, 1), Model.Status.VALID)
+        self.assertIs(cache.get(status_cache.TASK, 2), status_cache.MISSING)
+        self.assertEqual(cache.metrics.evictions, 1)
+
+    def test_task_status_is_cached_until_outcomes_are_added(self):
+
+        # arrange
+        _, task = self.create_model_with_task()
+
+        # act
+        status1 = task.determine_aggregate_status()
+        with self.assertNumQueries(0):
+            status2 = task.determine_aggregate_status()
+        with self.captureOnCommitCallbacks(execute=True):
+            ValidationOutcome.objects.bulk_create([
+                ValidationOutcome(validation_task=task, severity=ValidationOutcome.OutcomeSeverity.ERROR)
+            ])
+        status3 = task.determine_aggregate_status()
+
+        # assert
+        self.assertEqual(status1, Model.Status.VALID)
+        self.assertEqual(status2, Model.Status.VALID)
+        self.assertEqual(status3, Model.Status.INVALID)
+        self.assertEqual(self.cache.metrics.hits, 1)
+        self.assertEqual(self.cache.metrics.misses, 2)
+
+    def test_model_status_is_invalidated_by_task_change_and_whitelist_save(self):
+
+        # arrange
+        model, task = self.create_model_with_task()
+        ValidationOutcome.objects.create(
+            validation_task=task,
+            feature='ALS001 - Alignment',
+            severity=ValidationOutcome.OutcomeSeverity.ERROR
+        )
+
+        # act
+        status1 = Model.objects.get(id=model.id).status_schema_calculated
+        with self.captureOnCommitCallbacks(execute=True):
+            task.mark_as_completed()
+        status2 = Model.objects.get(id=model.id).status_schema_calculated
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = WhiteListEntry.objects.create(description='Alignment')
+            WhiteListQueryFragment.objects.create(
+                whitelist_entry=entry,
+                column=WhiteListQueryFragment.OutcomeColumn.FEATURE,
+                operation=WhiteListQueryFragment.Operation.CONTAINS,
+                right_hand_side='ALS001'
+            )
+        status3 = Model.objects.get(id=model.id).status_schema_calculated
+
+        # assert
+        self.assertEqual(status1, Model.Status.INVALID)
+        self.assertEqual(status2, Model.Status.INVALID)
+        self.assertEqual(status3, Model.Status.VALID)
+        self.assertEqual(self.cache.metrics.misses, 3)
+
+    def test_status_is_invalidated_by_queryset_update_and_delete(self):
+
+        # arrange
+        model, task = self.create_model_with_task()
+        ValidationOutcome.objects.bulk_create([
+            ValidationOutcome(validation_task=task, severity=ValidationOutcome.OutcomeSeverity.ERROR)
+        ])
+
+        # act
+        status1 = task.determine_aggregate_status()
+        with self.captureOnCommitCallbacks(execute=True):
+            ValidationOutcome.objects.filter(validation_task=task).update(severity_in_db=ValidationOutcome.OutcomeSeverity.WARNING)
+        status2 = task.determine_aggregate_status()
+        with self.captureOnCommitCallbacks(execute=True):
+            ValidationOutcome.objects.filter(validation_task=task).delete()
+        status3 = task.determine_aggregate_status()
+        model_status1 = Model.objects.get(id=model.id).status_schema_calculated
+        with self.captureOnCommitCallbacks(execute=True):
+            ValidationTask.objects.filter(id=task.id).update(type=ValidationTask.Type.SYNTAX)
+        model_status2 = Model.objects.get(id=model.id).status_schema_calculated
+
+        # assert
+        self.assertEqual(status1, Model.Status.INVALID)
+        self.assertEqual(status2, Model.Status.WARNING)
+        self.assertEqual(status3, Model.Status.VALID)
+        self.assertEqual(model_status1, Model.Status.VALID)
+        self.assertEqual(model_status2, Model.Status.NOT_VALIDATED)
+
+    def test_invalidation_waits_for_commit(self):
+
+        # arrange
+        _, task = self.create_model_with_task()
+        task.determine_aggregate_status()
+
+        # act
+        with self.captureOnCommitCallbacks() as callbacks:
+            ValidationOutcome.objects.bulk_create([
+                ValidationOutcome(validation_task=task, severity=ValidationOutcome.OutcomeSeverity.ERROR)
+            ])
+            cached = self.cache.get(status_cache.TASK, task.id)
+        for callback in callbacks:
+            callback()
+
+        # assert
+        self.assertEqual(cached, Model.Status.VALID)
+        self.assertIs(self.cache.get(status_cache.TASK, task.id), status_cache.MISSING)
+
+    def test_status_computed_during_invalidation_is_not_cached(self):
+
+        # arrange
+        def compute():
+            self.cache.delete_many([(status_cache.TASK, 2)])  # eg. a concurrent commit
+            return Model.Status.VALID
+
+        # act
+        value = self.cache.get_or_compute(status_cache.TASK, 1, compute)
+
+        # assert
+        self.assertEqual(value, Model.Status.VALID)
+        self.assertIs(self.cache.get(status_cache.TASK, 1), status_cache.MISSING)
+
+
+class OutcomeRollupTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.user = User.objects.get(id=1)
+        self.tool = AuthoringTool.objects.create(name='Tool XYZ', version='1.0')
+
+    def create_task(self, schema, severities):
+        model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=self.user, schema=schema, produced_by=self.tool)
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024, model=model)
+        task = ValidationTask.objects.create(request=request, type=ValidationTask.Type.NORMATIVE_IA)
+        ValidationOutcome.objects.bulk_create([
+            ValidationOutcome(validation_task=task, feature='ALB001 - Alignment', feature_version=1, severity=severity)
+            for severity in severities
+        ])
+        return task
+
+    def test_completed_task_is_rolled_up_once(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        task = self.create_task('IFC4X3', [severity.ERROR, severity.ERROR, severity.PASSED])
+
+        # act
+        task.mark_as_completed()
+        OutcomeRollup.record_task(task)
+
+        # assert
+        rollups = OutcomeRollup.objects.filter(produced_by=self.tool, schema='IFC4X3')
+        self.assertEqual(rollups.count(), 2)
+        self.assertEqual(rollups.get(severity=severity.ERROR).count, 2)
+        self.assertEqual(rollups.get(severity=severity.PASSED).count, 1)
+        self.assertTrue(ValidationTask.objects.get(id=task.id).is_rolled_up)
+
+    def test_error_rates_are_answered_from_rollups(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        self.create_task('IFC4X3', [severity.ERROR, severity.PASSED, severity.PASSED, severity.WARNING]).mark_as_completed()
+        self.create_task('IFC4', [severity.ERROR]).mark_as_completed()
+
+        # act
+        rates = OutcomeRollup.objects.filter(schema='IFC4X3').error_rates(group_by=['produced_by'], bucket='month')
+
+        # assert
+        self.assertEqual(len(rates), 1)
+        self.assertEqual(rates[0]['produced_by'], self.tool.id)
+        self.assertEqual(rates[0]['bucket'], timezone.localdate().replace(day=1))
+        self.assertEqual(rates[0]['total'], 4)
+        self.assertEqual(rates[0]['errors'], 1)
+        self.assertEqual(rates[0]['warnings'], 1)
+        self.assertEqual(rates[0]['error_rate'], 0.25)
+
+    def test_rebuild_matches_incremental_rollups(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        self.create_task('IFC4X3', [severity.ERROR, severity.WARNING]).mark_as_completed()
+        self.create_task('IFC4X3', [severity.ERROR]).mark_as_completed()
+        incremental = sorted(OutcomeRollup.objects.values_list(*OutcomeRollup.KEY_FIELDS, 'count'))
+
+        # act
+        today = timezone.localdate()
+        OutcomeRollup.rebuild(today - datetime.timedelta(days=1), today)
+        rebuilt = sorted(OutcomeRollup.objects.values_list(*OutcomeRollup.KEY_FIELDS, 'count'))
+
+        # assert
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(OutcomeRollup.objects.get(severity=severity.ERROR).count, 2)
+
+    def test_merge_adds_to_rollups_created_by_others(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        today = timezone.localdate()
+        key = (None, 'IFC4', ValidationTask.Type.SCHEMA, '', today, severity.ERROR, 'E00001')
+        other = (self.tool.id, 'IFC4', ValidationTask.Type.SCHEMA, '', today, severity.ERROR, 'E00001')
+        OutcomeRollup.objects.create(**dict(zip(OutcomeRollup.KEY_FIELDS, key)), count=5)  # eg. by a concurrent task
+
+        # act
+        OutcomeRollup.merge({key: 2, other: 3})
+        OutcomeRollup.merge({key: 1})
+
+        # assert
+        self.assertEqual(OutcomeRollup.objects.get(produced_by__isnull=True).count, 8)
+        self.assertEqual(OutcomeRollup.objects.get(produced_by=self.tool).count, 3)
+
+
+class OutcomeCountersTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        self.task1 = ValidationTask.objects.create(request=self.request, type=ValidationTask.Type.SCHEMA)
+        self.task2 = ValidationTask.objects.create(request=self.request, type=ValidationTask.Type.NORMATIVE_IA)
+
+    def create_outcomes(self, task, *severities, feature='ALB001 - Alignment'):
+        return ValidationOutcome.objects.bulk_create([
+            ValidationOutcome(validation_task=task, feature=feature, severity=severity)
+            for severity in severities
+        ])
+
+    def test_counters_are_incremented_on_outcome_ingestion(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+
+        # act
+        self.create_outcomes(self.task1, severity.ERROR, severity.ERROR, severity.PASSED)
+        self.create_outcomes(self.task2, severity.WARNING, severity.EXECUTED, severity.NOT_APPLICABLE)
+
+        # assert
+        task1 = ValidationTask.objects.get(id=self.task1.id)
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.assertEqual((task1.error_count, task1.warning_count, task1.passed_count), (2, 0, 1))
+        self.assertEqual((request.error_count, request.warning_count, request.passed_count), (2, 1, 2))
+        self.assertEqual(request.whitelisted_count, 0)
+
+    def test_whitelisted_outcomes_are_counted_separately(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        entry = WhiteListEntry.objects.create(description='Alignment')
+        WhiteListQueryFragment.objects.create(
+            whitelist_entry=entry,
+            column=WhiteListQueryFragment.OutcomeColumn.FEATURE,
+            operation=WhiteListQueryFragment.Operation.CONTAINS,
+            right_hand_side='ALB001'
+        )
+
+        # act
+        self.create_outcomes(self.task1, severity.ERROR, severity.WARNING)
+        self.create_outcomes(self.task1, severity.ERROR, feature='ALS002 - Other')
+
+        # assert
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.assertEqual((request.error_count, request.warning_count, request.whitelisted_count), (1, 0, 2))
+
+    def test_whitelist_changes_recompute_counters(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        self.create_outcomes(self.task1, severity.ERROR, severity.WARNING)
+        self.create_outcomes(self.task2, severity.ERROR, feature='ALS002 - Other')
+
+        # act
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = WhiteListEntry.objects.create(description='Alignment')
+            fragment = WhiteListQueryFragment.objects.create(
+                whitelist_entry=entry,
+                column=WhiteListQueryFragment.OutcomeColumn.FEATURE,
+                operation=WhiteListQueryFragment.Operation.CONTAINS,
+                right_hand_side='ALB001'
+            )
+        counters1 = ValidationRequest.objects.values_list('error_count', 'warning_count', 'whitelisted_count').get(id=self.request.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            fragment.right_hand_side = 'ALS002'
+            fragment.save()
+        counters2 = ValidationRequest.objects.values_list('error_count', 'warning_count', 'whitelisted_count').get(id=self.request.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.delete()
+
+        # assert
+        self.assertEqual(counters1, (1, 0, 2))
+        self.assertEqual(counters2, (1, 1, 1))
+        self.assertEqual(ValidationTask.objects.get(id=self.task2.id).whitelisted_count, 0)
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.assertEqual((request.error_count, request.warning_count, request.whitelisted_count), (2, 1, 0))
+
+    def test_saving_a_loaded_request_does_not_overwrite_counters(self):
+
+        # arrange
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.create_outcomes(self.task1, ValidationOutcome.OutcomeSeverity.ERROR)
+
+        # act
+        request.mark_as_completed()
+
+        # assert
+        self.assertEqual(ValidationRequest.objects.get(id=self.request.id).error_count, 1)
+
+    def test_repair_command_recomputes_counters(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        self.create_outcomes(self.task1, severity.ERROR, severity.WARNING)
+        self.create_outcomes(self.task2, severity.PASSED)
+        ValidationTask.objects.update(error_count=0, warning_count=0, passed_count=0)
+        ValidationRequest._base_manager.update(error_count=7, warning_count=7, passed_count=7)
+
+        # act
+        call_command('repair_outcome_counters', stdout=io.StringIO())
+
+        # assert
+        request = ValidationRequest.objects.get(id=self.request.id)
+        task1 = ValidationTask.objects.get(id=self.task1.id)
+        self.assertEqual((task1.error_count, task1.warning_count, task1.passed_count), (1, 1, 0))
+        self.assertEqual((request.error_count, request.warning_count, request.passed_count), (1, 1, 1))
+
+    def test_task_completion_recomputes_counters(self):
+
+        # arrange
+        self.create_outcomes(self.task1, ValidationOutcome.OutcomeSeverity.WARNING)
+        ValidationTask.objects.update(warning_count=0)
+
+        # act
+        self.task1.mark_as_completed()
+
+        # assert
+        self.assertEqual(self.task1.warning_count, 1)
+        self.assertEqual(ValidationRequest.objects.get(id=self.request.id).warning_count, 1)
+
+    def test_counters_follow_outcome_updates_and_deletes(self):
+
+        # arrange
+        severity = ValidationOutcome.OutcomeSeverity
+        outcome1, outcome2, _ = self.create_outcomes(self.task1, severity.ERROR, severity.ERROR, severity.WARNING)
+
+        # act
+        outcome1.delete()
+        outcome2.severity = severity.PASSED
+        outcome2.save()
+        counters1 = ValidationTask.objects.values_list('error_count', 'warning_count', 'passed_count').get(id=self.task1.id)
+        ValidationOutcome.objects.filter(validation_task=self.task1, severity_in_db=severity.WARNING).update(severity_in_db=severity.ERROR)
+        counters2 = ValidationTask.objects.values_list('error_count', 'warning_count', 'passed_count').get(id=self.task1.id)
+        ValidationOutcome.objects.filter(validation_task=self.task1).delete()
+
+        # assert
+        self.assertEqual(counters1, (0, 1, 1))
+        self.assertEqual(counters2, (1, 0, 1))
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.assertEqual((request.error_count, request.warning_count, request.passed_count), (0, 0, 0))
+
+
+class AuditedBulkUpdateTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.requests = [
+            ValidationRequest.objects.create(file_name=f'test{i}.ifc', file=f'test{i}.ifc', size=1024)
+            for i in range(5)
+        ]
+        for request in self.requests:
+            ValidationTask.objects.create(request=request, type=ValidationTask.Type.SYNTAX)
+
+    def test_audited_update_is_a_single_statement(self):
+
+        # act
+        with self.assertNumQueries(1):
+            count = ValidationRequest.objects.filter(file_name__startswith='test').update(status=ValidationRequest.Status.INITIATED)
+
+        # assert
+        self.assertEqual(count, 5)
+        for request in ValidationRequest.objects.all():
+            self.assertEqual(request.status, ValidationRequest.Status.INITIATED)
+            self.assertIsNotNone(request.updated)
+            self.assertEqual(request.updated_by.username, 'SYSTEM')
+
+    def test_timestamped_update_is_a_single_statement(self):
+
+        # act
+        with self.assertNumQueries(1):
+            count = ValidationTask.objects.filter(type=ValidationTask.Type.SYNTAX).update(status=ValidationTask.Status.SKIPPED)
+
+        # assert
+        self.assertEqual(count, 5)
+        self.assertFalse(ValidationTask.objects.filter(updated__isnull=True).exists())
+
+    def test_update_with_per_instance_save_calls_save(self):
+
+        # act
+        with self.assertNumQueries(1 + 5 + 1):
+            ValidationRequest.objects.all().update(progress=50, per_instance_save=True)
+
+        # assert
+        self.assertEqual(ValidationRequest.objects.filter(progress=50).count(), 5)
+
+
+class BulkTransitionsTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        self.tasks = [
+            ValidationTask.objects.create(request=self.request, type=type)
+            for type in (ValidationTask.Type.SYNTAX, ValidationTask.Type.SCHEMA, ValidationTask.Type.NORMATIVE_IA)
+        ]
+
+    def test_bulk_skip_is_a_single_statement_returning_ids(self):
+
+        # act
+        with self.assertNumQueries(1):
+            ids = ValidationTask.objects.filter(request=self.request).mark_as_skipped('Syntax failed')
+
+        # assert
+        self.assertEqual(sorted(ids), sorted(t.id for t in self.tasks))
+        for task in ValidationTask.objects.filter(request=self.request):
+            self.assertEqual(task.status, ValidationTask.Status.SKIPPED)
+            self.assertEqual(task.status_reason, 'Syntax failed')
+            self.assertIsNotNone(task.updated)
+
+    def test_bulk_transition_skips_tasks_in_final_status(self):
+
+        # arrange
+        self.tasks[0].mark_as_completed()
+
+        # act
+        ids = ValidationTask.objects.filter(request=self.request).mark_as_failed('Worker crashed')
+
+        # assert
+        self.assertEqual(sorted(ids), sorted(t.id for t in self.tasks[1:]))
+        self.assertEqual(ValidationTask.objects.get(id=self.tasks[0].id).status, ValidationTask.Status.COMPLETED)
+        self.assertEqual(ValidationTask.objects.filter(status=ValidationTask.Status.FAILED).count(), 2)
+
+    def test_bulk_completion_sets_timestamps_progress_and_counters(self):
+
+        # arrange
+        ValidationTask.objects.filter(request=self.request).mark_as_initiated()
+        ValidationOutcome.objects.bulk_create([
+            ValidationOutcome(validation_task=self.tasks[1], severity=ValidationOutcome.OutcomeSeverity.ERROR)
+        ])
+        ValidationTask.objects.update(error_count=0)
+
+        # act
+        ids = ValidationTask.objects.filter(request=self.request).mark_as_completed()
+
+        # assert
+        self.assertEqual(len(ids), 3)
+        task = ValidationTask.objects.get(id=self.tasks[1].id)
+        self.assertEqual(task.progress, 100)
+        self.assertIsNotNone(task.started)
+        self.assertIsNotNone(task.ended)
+        self.assertEqual(task.error_count, 1)
+        self.assertTrue(task.is_rolled_up)
+
+    def test_bulk_request_transition_stamps_audit_fields(self):
+
+        # arrange
+        other = ValidationRequest.objects.create(file_name='other.ifc', file='other.ifc', size=1024)
+        other.mark_as_completed()
+
+        # act
+        ids = ValidationRequest.objects.all().mark_as_initiated()
+
+        # assert
+        self.assertEqual(ids, [self.request.id])
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.assertEqual(request.status, ValidationRequest.Status.INITIATED)
+        self.assertIsNotNone(request.started)
+        self.assertEqual(request.progress, 0)
+        self.assertEqual(request.updated_by.username, 'SYSTEM')
+        self.assertEqual(ValidationRequest.objects.get(id=other.id).status, ValidationRequest.Status.COMPLETED)
+
+
+class DirtyFieldsTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        task = ValidationTask.objects.create(request=request, type=ValidationTask.Type.SYNTAX)
+        task.set_process_details(1234, 'python3 -m checker --long-arguments')
+        self.request = ValidationRequest.objects.get(id=request.id)
+        self.task = ValidationTask.objects.get(id=task.id)
+
+    def test_loaded_instance_tracks_dirty_fields(self):
+
+        # act
+        self.task.progress = 50
+        self.task.status_reason = self.task.status_reason
+
+        # assert
+        self.assertEqual(self.task.get_dirty_fields(), ['progress'])
+
+    def test_dirty_fields_are_only_tracked_when_opted_in(self):
+
+        # arrange
+        ValidationOutcome.objects.create(validation_task=self.task, severity=ValidationOutcome.OutcomeSeverity.PASSED)
+
+        # act
+        outcome = ValidationOutcome.objects.get(validation_task=self.task)
+
+        # assert
+        self.assertFalse(ValidationOutcome.TRACK_DIRTY_FIELDS)
+        self.assertFalse(hasattr(outcome, '_loaded_values'))
+        self.assertIsNone(outcome.get_dirty_fields())
+
+    def test_save_only_updates_dirty_fields(self):
+
+        # act
+        with CaptureQueriesContext(connection) as ctx:
+            self.task.progress = 50
+            self.task.save()
+
+        # assert
+        update = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE'))
+        self.assertIn('"progress"', update)
+        self.assertIn('"updated"', update)
+        self.assertNotIn('"process_cmd"', update)
+        self.assertEqual(self.task.get_dirty_fields(), [])
+        self.assertEqual(ValidationTask.objects.get(id=self.task.id).process_cmd, 'python3 -m checker --long-arguments')
+
+    def test_audited_save_includes_updated_by(self):
+
+        # act
+        with CaptureQueriesContext(connection) as ctx:
+            self.request.mark_as_initiated()
+
+        # assert
+        update = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE'))
+        self.assertIn('"updated_by_id"', update)
+        self.assertNotIn('"file_name"', update)
+        self.assertNotIn('"error_count"', update)
+
+    def test_concurrent_changes_to_other_fields_are_preserved(self):
+
+        # arrange
+        other = ValidationTask.objects.get(id=self.task.id)
+
+        # act
+        other.process_cmd = 'changed elsewhere'
+        other.save()
+        self.task.progress = 75
+        self.task.save()
+
+        # assert
+        task = ValidationTask.objects.get(id=self.task.id)
+        self.assertEqual(task.process_cmd, 'changed elsewhere')
+        self.assertEqual(task.progress, 75)
+
+
+class ProgressWriterTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        self.tasks = [ValidationTask.objects.create(request=self.request, type=ValidationTask.Type.SYNTAX) for _ in range(3)]
+        self.writer = progress_writer.ProgressWriter(autostart=False)
+        progress_writer.set_progress_writer(self.writer)
+
+    def tearDown(self):
+        progress_writer.set_progress_writer(None)
+
+    def test_progress_updates_are_coalesced_into_one_update(self):
+
+        # arrange
+        for value in (10, 20, 30):
+            for task in self.tasks:
+                task.report_progress(value + task.id)
+
+        # act
+        with self.assertNumQueries(1):
+            self.writer.flush()
+
+        # assert
+        for task in self.tasks:
+            self.assertEqual(ValidationTask.objects.get(id=task.id).progress, 30 + task.id)
+        self.assertEqual(self.writer.metrics.reported, 9)
+        self.assertEqual(self.writer.metrics.written, 3)
+
+    def test_progress_can_be_reported_from_any_thread(self):
+
+        # arrange
+        thread = threading.Thread(target=self.tasks[0].report_progress, args=(42,))
+
+        # act
+        thread.start()
+        thread.join()
+        self.request.report_progress(7)
+        self.writer.flush()
+
+        # assert
+        self.assertEqual(ValidationTask.objects.get(id=self.tasks[0].id).progress, 42)
+        request = ValidationRequest.objects.get(id=self.request.id)
+        self.assertEqual(request.progress, 7)
+        self.assertEqual(request.updated_by.username, 'SYSTEM')
+
+    def test_final_transition_flushes_synchronously(self):
+
+        # arrange
+        task = self.tasks[0]
+        task.report_progress(60)
+
+        # act
+        task.mark_as_failed('Worker crashed')
+        self.writer.flush()
+
+        # assert
+        task = ValidationTask.objects.get(id=task.id)
+        self.assertEqual(task.status, ValidationTask.Status.FAILED)
+        self.assertEqual(task.progress, 60)
+        self.assertEqual(self.writer.metrics.written, 1)
+
+    def test_pending_progress_does_not_overwrite_final_status(self):
+
+        # arrange
+        self.tasks[0].report_progress(60)
+        ValidationTask.objects.filter(id=self.tasks[0].id).update(status=ValidationTask.Status.COMPLETED, progress=100)
+
+        # act
+        self.writer.flush()
+
+        # assert
+        self.assertEqual(ValidationTask.objects.get(id=self.tasks[0].id).progress, 100)
+
+
+class OptimisticConcurrencyTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        self.task = ValidationTask.objects.create(request=self.request, type=ValidationTask.Type.SYNTAX)
+
+    def test_concurrent_state_change_is_rejected(self):
+
+        # arrange
+        first = ValidationTask.objects.get(id=self.task.id)
+        second = ValidationTask.objects.get(id=self.task.id)
+
+        # act
+        first.mark_as_completed('Done')
+
+        # assert
+        with self.assertRaises(ConcurrentModificationError), transaction.atomic():
+            second.mark_as_failed('Worker crashed')
+        task = ValidationTask.objects.get(id=self.task.id)
+        self.assertEqual(task.status, ValidationTask.Status.COMPLETED)
+        self.assertEqual(task.row_version, 1)
+        self.assertEqual(first.row_version, 1)
+
+    def test_consecutive_state_changes_of_same_instance_succeed(self):
+
+        # arrange
+        request = ValidationRequest.objects.get(id=self.request.id)
+
+        # act
+        request.mark_as_initiated()
+        request.mark_as_completed('Done')
+
+        # assert
+        self.assertEqual(request.row_version, 2)
+        self.assertEqual(ValidationRequest.objects.get(id=self.request.id).row_version, 2)
+
+    def test_non_state_changes_are_not_versioned(self):
+
+        # arrange
+        task = ValidationTask.objects.get(id=self.task.id)
+        other = ValidationTask.objects.get(id=self.task.id)
+        other.set_process_details(1234, 'python check.py')
+        ValidationTask.objects.filter(id=self.task.id).update(progress=50)
+
+        # act
+        task.mark_as_completed('Done')
+
+        # assert
+        task = ValidationTask.objects.get(id=self.task.id)
+        self.assertEqual(task.status, ValidationTask.Status.COMPLETED)
+        self.assertEqual(task.process_id, 1234)
+        self.assertEqual(task.row_version, 1)
+
+    def test_bulk_transitions_bump_row_version(self):
+
+        # arrange
+        stale = ValidationRequest.objects.get(id=self.request.id)
+
+        # act
+        ValidationRequest.objects.filter(id=self.request.id).mark_as_initiated()
+
+        # assert
+        self.assertEqual(ValidationRequest.objects.get(id=self.request.id).row_version, 1)
+        with self.assertRaises(ConcurrentModificationError), transaction.atomic():
+            stale.mark_as_failed('Aborted')
+
+    def test_retry_on_conflict_reloads_and_retries(self):
+
+        # arrange
+        stale = ValidationTask.objects.get(id=self.task.id)
+        ValidationTask.objects.filter(id=self.task.id).mark_as_initiated()
+        calls = []
+
+        @retry_on_conflict(attempts=2, delay=0)
+        def complete():
+            task = stale if not calls else ValidationTask.objects.get(id=self.task.id)
+            calls.append(task)
+            task.mark_as_completed('Done')
+
+        # act
+        complete()
+
+        # assert
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(ValidationTask.objects.get(id=self.task.id).status, ValidationTask.Status.COMPLETED)
+
+
+class ClaimNextTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.requests = [
+            ValidationRequest.objects.create(file_name=f'test{i}.ifc', file=f'test{i}.ifc', size=1024)
+            for i in range(5)
+        ]
+
+    def test_claims_oldest_pending_requests(self):
+
+        # arrange
+        self.requests[0].mark_as_initiated()
+
+        # act
+        claimed = ValidationRequest.objects.claim_next(2, worker_id='worker-1')
+
+        # assert
+        self.assertEqual([r.id for r in claimed], [r.id for r in self.requests[1:3]])
+        for request in claimed:
+            self.assertEqual(request.status, ValidationRequest.Status.INITIATED)
+            self.assertEqual(request.claimed_by, 'worker-1')
+            self.assertIsNotNone(request.started)
+            self.assertEqual(request.row_version, 1)
+
+    def test_claims_nothing_when_no_requests_are_pending(self):
+
+        # arrange
+        ValidationRequest.objects.claim_next(10)
+
+        # act
+        claimed = ValidationRequest.objects.claim_next(10)
+
+        # assert
+        self.assertEqual(claimed, [])
+
+    def test_deleted_and_filtered_out_requests_are_not_claimed(self):
+
+        # arrange
+        self.requests[0].delete()
+
+        # act
+        claimed = ValidationRequest.objects.exclude(id=self.requests[1].id).claim_next(10)
+
+        # assert
+        self.assertEqual([r.id for r in claimed], [r.id for r in self.requests[2:]])
+
+    def test_mark_as_pending_releases_claim(self):
+
+        # arrange
+        request = ValidationRequest.objects.claim_next(worker_id='worker-1')[0]
+
+        # act
+        request.mark_as_pending()
+
+        # assert
+        self.assertIsNone(ValidationRequest.objects.get(id=request.id).claimed_by)
+
+
+class ClaimNextConcurrencyTestCase(TransactionTestCase):
+
+    def test_concurrent_workers_never_claim_same_request(self):
+
+        # arrange
+        ValidationModelsTestCase.set_user_context()
+        ValidationRequest.objects.bulk_create([
+            ValidationRequest(file_name=f'test{i}.ifc', file=f'test{i}.ifc', size=1024, created_by_id=1)
+            for i in range(200)
+        ])
+        claims = {}
+
+        def work(worker_id):
+            ValidationModelsTestCase.set_user_context()
+            claims[worker_id] = []
+            try:
+                while True:
+                    try:
+                        batch = ValidationRequest.objects.claim_next(3, worker_id=worker_id)
+                    except OperationalError:  # sqlite: database is locked by another writer
+                        time.sleep(0.001)
+                        continue
+                    if not batch:
+                        break
+                    claims[worker_id] += [request.id for request in batch]
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(f'worker-{i}',)) for i in range(8)]
+
+        # act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # assert
+        claimed = [id for ids in claims.values() for id in ids]
+        self.assertEqual(len(claimed), 200)
+        self.assertEqual(len(set(claimed)), 200)
+        self.assertFalse(ValidationRequest.objects.filter(status=ValidationRequest.Status.PENDING).exists())
+        for worker_id, ids in claims.items():
+            self.assertEqual(ValidationRequest.objects.filter(claimed_by=worker_id).count(), len(ids))
+
+
+class KeyedLockTestCase(TransactionTestCase):  # keyed locks are taken outside of a transaction
+
+    def setUp(self):
+        locks.reset_metrics()
+
+    def lock_in_thread(self, key, acquired, release=None):
+
+        def work():
+            try:
+                with locks.keyed_lock(ValidationRequest, key):
+                    acquired.set()
+                    if release is not None:
+                        release.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        return thread
+
+    def test_lock_ids_are_stable_and_distinct(self):
+
+        # act
+        first = locks.lock_id(ValidationRequest, 1)
+
+        # assert
+        self.assertEqual(first, locks.lock_id(ValidationRequest, 1))
+        self.assertNotEqual(first, locks.lock_id(ValidationRequest, 2))
+        self.assertNotEqual(first, locks.lock_id(ValidationTask, 1))
+        self.assertTrue(-2**63 <= first < 2**63)
+
+    def test_same_key_is_exclusive(self):
+
+        # arrange
+        acquired = threading.Event()
+
+        # act
+        with locks.keyed_lock(ValidationRequest, 1):
+            thread = self.lock_in_thread(1, acquired)
+            blocked = not acquired.wait(0.2)
+        thread.join()
+
+        # assert
+        self.assertTrue(blocked)
+        self.assertTrue(acquired.is_set())
+        metrics = locks.metrics()
+        self.assertEqual(metrics['acquisitions'], 2)
+        self.assertEqual(metrics['contended'], 1)
+        self.assertGreater(metrics['max_wait'], 0.1)
+
+    def test_different_keys_do_not_block(self):
+
+        # arrange
+        acquired, release = threading.Event(), threading.Event()
+        thread = self.lock_in_thread(1, threading.Event(), release)
+
+        # act
+        with locks.keyed_lock(ValidationRequest, 2):
+            other = self.lock_in_thread(3, acquired)
+            not_blocked = acquired.wait(5)
+        release.set()
+        thread.join()
+        other.join()
+
+        # assert
+        self.assertTrue(not_blocked)
+        self.assertEqual(locks.metrics()['contended'], 0)
+
+    def test_decorator_derives_key_from_arguments_and_is_reentrant(self):
+
+        # arrange
+        @requires_django_keyed_lock(ValidationRequest, key=lambda request_id: request_id)
+        def process(request_id):
+            with locks.keyed_lock(ValidationRequest, request_id):
+                return request_id * 2
+
+        # act
+        result = process(21)
+
+        # assert
+        self.assertEqual(result, 42)
+        self.assertEqual(locks.metrics()['acquisitions'], 1)
+
+    def test_nested_lock_is_held_until_the_outer_transaction_has_ended(self):
+
+        # arrange
+        stripe = locks.lock_stripe(locks.lock_id(ValidationRequest, 1))
+        key = next(key for key in range(2, 100) if locks.lock_stripe(locks.lock_id(ValidationRequest, key)) != stripe)
+        acquired = threading.Event()
+
+        # act
+        with locks.keyed_lock(ValidationRequest, 1):
+            with locks.keyed_lock(ValidationRequest, key):
+                pass
+            thread = self.lock_in_thread(key, acquired)
+            blocked = not acquired.wait(0.2)
+        thread.join()
+
+        # assert
+        self.assertTrue(blocked)
+        self.assertTrue(acquired.is_set())
+
+    def test_file_lock_is_not_taken_inside_a_transaction(self):
+
+        # act / assert
+        if connection.vendor != 'postgresql':
+            with transaction.atomic():
+                with self.assertRaises(TransactionManagementError):
+                    with locks.keyed_lock(ValidationRequest, 1):
+                        pass
+            with locks.keyed_lock(ValidationRequest, 1):
+                with locks.keyed_lock(ValidationRequest, 1):  # re-entrant, within its own transaction
+                    pass
+
+    def test_keys_share_a_fixed_number_of_lock_files(self):
+
+        with tempfile.TemporaryDirectory() as lock_dir:
+
+            # act
+            with mock.patch('apps.ifc_validation_models.settings.LOCK_DIR', lock_dir), \
+                    mock.patch('apps.ifc_validation_models.settings.LOCK_FILES', 4):
+                for key in range(50):
+                    with locks.keyed_lock(ValidationRequest, key):
+                        with locks.keyed_lock(ValidationTask, key):  # may share the stripe that is held
+                            pass
+
+            # assert
+            self.assertLessEqual(len(os.listdir(lock_dir)), 4)
+
+
+class SchedulingTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.other_user = User.objects.create(username='other', is_active=True)
+        self.now = timezone.now()
+
+    def simulated(self, id, seconds_ago=0, channel='API', size=1024, user=1):
+        return scheduling.SimulatedRequest(
+            id=id, created=self.now - datetime.timedelta(seconds=seconds_ago), channel=channel, size=size, created_by_id=user
+        )
+
+    def test_interactive_and_small_requests_go_first(self):
+
+        # arrange
+        policy = scheduling.SchedulingPolicy()
+        flood = [self.simulated(i, seconds_ago=60) for i in range(1, 6)]
+        webui = self.simulated(10, seconds_ago=0, channel='WEBUI', user=2)
+        huge = self.simulated(11, seconds_ago=90, size=2 * 1024 ** 3, user=3)
+
+        # act
+        ordered = policy.order(flood + [huge, webui], now=self.now)
+
+        # assert
+        self.assertEqual(ordered[0].id, 10)
+        self.assertEqual(ordered[-1].id, 11)
+
+    def test_fair_share_interleaves_users(self):
+
+        # arrange
+        policy = scheduling.SchedulingPolicy()
+        flood = [self.simulated(i, seconds_ago=100 - i) for i in range(1, 6)]
+        other = self.simulated(10, seconds_ago=10, user=2)
+
+        # act
+        ordered = policy.order(flood + [other], now=self.now, running={1: 2})
+
+        # assert
+        self.assertEqual(ordered[0].id, 10)
+        self.assertEqual([r.id for r in ordered[1:]], [1, 2, 3, 4, 5])
+
+    def test_aging_eventually_schedules_large_requests(self):
+
+        # arrange
+        policy = scheduling.SchedulingPolicy()
+        huge = self.simulated(1, seconds_ago=3600, size=2 * 1024 ** 3)
+        small = self.simulated(2, seconds_ago=0, channel='WEBUI', user=2)
+
+        # act
+        ordered = policy.order([small, huge], now=self.now)
+
+        # assert
+        self.assertEqual(ordered[0].id, 1)
+
+    def test_claim_next_follows_policy(self):
+
+        # arrange
+        flood = [
+            ValidationRequest.objects.create(file_name=f'test{i}.ifc', file=f'test{i}.ifc', size=50 * 1024 ** 2, channel=ValidationRequest.Channel.API)
+            for i in range(5)
+        ]
+        set_user_context(self.other_user)
+        interactive = ValidationRequest.objects.create(file_name='small.ifc', file='small.ifc', size=1024, channel=ValidationRequest.Channel.WEBUI)
+
+        # act
+        claimed = ValidationRequest.objects.claim_next(2, worker_id='worker-1', policy=scheduling.SchedulingPolicy())
+
+        # assert
+        self.assertEqual([r.id for r in claimed], [interactive.id, flood[0].id])
+        self.assertTrue(all(r.status == ValidationRequest.Status.INITIATED for r in claimed))
+
+    def test_claim_next_reranks_when_requests_are_claimed_concurrently(self):
+
+        # arrange
+        requests = [
+            ValidationRequest.objects.create(file_name=f'test{i}.ifc', file=f'test{i}.ifc', size=1024)
+            for i in range(4)
+        ]
+
+        class ConcurrentPolicy(scheduling.SchedulingPolicy):
+            def select(self, pending, n, lock=False):
+                ranked = super().select(pending, n, lock)
+                if not getattr(self, 'raced', False):
+                    # another worker claims the top ranked requests first
+                    ValidationRequest.objects.filter(id__in=[r.id for r in ranked]).update(status=ValidationRequest.Status.INITIATED)
+                    self.raced = True
+                return ranked
+
+        # act
+        claimed = ValidationRequest.objects.claim_next(2, worker_id='worker-2', policy=ConcurrentPolicy())
+
+        # assert
+        self.assertEqual([r.id for r in claimed], [requests[2].id, requests[3].id])
+        self.assertTrue(all(r.claimed_by == 'worker-2' for r in claimed))
+
+    def test_simulation_reduces_interactive_waits(self):
+
+        # arrange
+        requests = [self.simulated(i, seconds_ago=1000 - i, size=100 * 1024 ** 2) for i in range(1, 201)]
+        requests += [self.simulated(1000 + i, seconds_ago=990 - 20 * i, channel='WEBUI', size=1024 ** 2, user=2) for i in range(10)]
+
+        # act
+        fifo = scheduling.simulate(scheduling.FIFO, requests, workers=4)
+        fair = scheduling.simulate(scheduling.SchedulingPolicy(), requests, workers=4)
+
+        # assert
+        self.assertEqual(len(fair.waits), len(requests))
+        self.assertLess(fair.summary()['WEBUI']['mean_wait'], fifo.summary()['WEBUI']['mean_wait'] / 10)
+        self.assertAlmostEqual(fair.makespan, fifo.makespan, delta=fifo.makespan * 0.05)
+
+    def test_simulate_scheduling_command(self):
+
+        # arrange
+        ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        out = io.StringIO()
+
+        # act
+        call_command('simulate_scheduling', '--since', timezone.localdate().isoformat(), stdout=out)
+
+        # assert
+        self.assertIn('Replayed 1 Validation Request(s)', out.getvalue())
+        self.assertIn('FIFO', out.getvalue())
+
+
+class ReaperTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024)
+        ValidationRequest.objects.claim_next(worker_id='worker-1')
+        self.stale = ValidationTask.objects.create(request=self.request, type=ValidationTask.Type.SYNTAX)
+        self.running = ValidationTask.objects.create(request=self.request, type=ValidationTask.Type.SCHEMA)
+        ValidationTask.objects.filter(id__in=[self.stale.id, self.running.id]).mark_as_initiated()
+        ValidationTask.objects.filter(id=self.stale.id).update(started=timezone.now() - datetime.timedelta(hours=3))
+
+    def test_timed_out_tasks_and_their_requests_are_failed(self):
+
+        # act
+        result = reaper.reap_stale_tasks(timeout=3600)
+
+        # assert
+        self.assertEqual(result.timed_out, [self.stale.id])
+        self.assertEqual(result.tasks, [self.stale.id])
+        self.assertEqual(result.requests, [self.request.id])
+        self.assertGreater(result.max_overdue, 3500)
+        self.assertEqual(ValidationTask.objects.get(id=self.stale.id).status, ValidationTask.Status.FAILED)
+        self.assertEqual(ValidationTask.objects.get(id=self.running.id).status, ValidationTask.Status.INITIATED)
+        self.assertEqual(ValidationRequest.objects.get(id=self.request.id).status, ValidationRequest.Status.FAILED)
+
+    def test_tasks_of_dead_processes_are_reaped(self):
+
+        # arrange
+        process = subprocess.Popen(['true'])
+        process.wait()
+        ValidationTask.objects.filter(id=self.running.id).update(process_id=process.pid)
+        ValidationTask.objects.filter(id=self.stale.id).update(process_id=os.getpid(), started=timezone.now())
+
+        # act
+        result = reaper.reap_stale_tasks(timeout=3600, check_pids=True)
+
+        # assert
+        self.assertEqual(result.timed_out, [])
+        self.assertEqual(result.dead_process, [self.running.id])
+        self.assertEqual(ValidationTask.objects.get(id=self.running.id).status, ValidationTask.Status.FAILED)
+        self.assertEqual(ValidationTask.objects.get(id=self.stale.id).status, ValidationTask.Status.INITIATED)
+
+    def test_tasks_reinitiated_after_the_scan_are_not_reaped(self):
+
+        # arrange
+        ValidationTask.objects.filter(id=self.running.id).update(process_id=999_999)
+
+        def reinitiate(pid):
+            # both tasks are picked up again by a new worker, in between the scan and the update
+            ValidationTask.objects.filter(id__in=[self.stale.id, self.running.id]).mark_as_initiated()
+            ValidationTask.objects.filter(id=self.running.id).update(process_id=os.getpid())
+            return False
+
+        # act
+        with mock.patch('apps.ifc_validation_models.reaper.is_process_alive', side_effect=reinitiate):
+            result = reaper.reap_stale_tasks(timeout=3600, check_pids=True)
+
+        # assert
+        self.assertEqual(result.timed_out, [self.stale.id])
+        self.assertEqual(result.dead_process, [self.running.id])
+        self.assertEqual(result.tasks, [])
+        self.assertEqual(result.requests, [])
+        self.assertEqual(set(ValidationTask.objects.values_list('status', flat=True)), {ValidationTask.Status.INITIATED})
+
+    def test_requeued_requests_can_be_claimed_again(self):
+
+        # act
+        result = reaper.reap_stale_tasks(action=reaper.REQUEUE, timeout=3600)
+
+        # assert
+        task = ValidationTask.objects.get(id=self.stale.id)
+        self.assertEqual(task.status, ValidationTask.Status.PENDING)
+        self.assertIsNone(task.started)
+        self.assertEqual(result.requests, [self.request.id])
+        self.assertEqual([r.id for r in ValidationRequest.objects.claim_next(worker_id='worker-2')], [self.request.id])
+
+    def test_reap_stale_tasks_command(self):
+
+        # arrange
+        out = io.StringIO()
+
+        # act
+        call_command('reap_stale_tasks', '--timeout', '3600', stdout=out)
+
+        # assert
+        self.assertIn('Found 1 stale Validation Task(s) (1 timed out, 0 without process', out.getvalue())
+        self.assertIn('failed 1 Validation Task(s) and 1 Validation Request(s)', out.getvalue())
+
+
+class TaskGraphTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.requests = [
+            ValidationRequest.objects.create(file_name=f'test{i}.ifc', file=f'test{i}.ifc', size=1024)
+            for i in range(2)
+        ]
+        for request in self.requests:
+            ValidationTask.objects.bulk_create([ValidationTask(request=request, type=type) for type in ValidationTask.Type])
+
+    def complete(self, *types, request=None):
+        requests = [request] if request else self.requests
+        ValidationTask.objects.filter(request__in=requests, type__in=types).mark_as_completed()
+
+    def ready(self, request):
+        return {task.type for task in task_graph.ready_tasks([request.id])}
+
+    def test_graph_covers_all_task_types_and_is_acyclic(self):
+
+        # act
+        order = task_graph.topological_order()
+
+        # assert
+        self.assertEqual(set(order), set(ValidationTask.Type))
+        for type, deps in task_graph.dependencies().items():
+            for dep in deps:
+                self.assertLess(order.index(dep), order.index(type))
+
+    def test_ready_tasks_follow_completed_prerequisites(self):
+
+        # arrange
+        T = ValidationTask.Type
+        self.complete(T.MAGIC_AND_CLAMAV)
+        self.complete(T.SYNTAX, T.HEADER_SYNTAX, request=self.requests[1])
+
+        # act
+        with self.assertNumQueries(1):
+            ready = list(task_graph.ready_tasks([r.id for r in self.requests]))
+
+        # assert
+        self.assertEqual({t.type for t in ready if t.request_id == self.requests[0].id}, {T.SYNTAX, T.HEADER_SYNTAX})
+        self.assertEqual(
+            {t.type for t in ready if t.request_id == self.requests[1].id},
+            {T.HEADER, T.PARSE_INFO, T.SCHEMA, T.MVD, T.DIGITAL_SIGNATURES},
+        )
+
+    def test_tasks_without_created_prerequisite_are_ready(self):
+
+        # arrange
+        T = ValidationTask.Type
+        request = self.requests[0]
+        ValidationTask.objects.filter(request=request, type=T.HEADER).delete()
+        self.complete(T.MAGIC_AND_CLAMAV, T.SYNTAX, T.HEADER_SYNTAX, request=request)
+
+        # act
+        ready = self.ready(request)
+
+        # assert
+        self.assertIn(T.PREREQUISITES, ready)
+
+    def test_missing_intermediate_task_does_not_bypass_indirect_prerequisites(self):
+
+        # arrange
+        T = ValidationTask.Type
+        request = self.requests[0]
+        ValidationTask.objects.filter(request=request, type=T.PREREQUISITES).delete()
+        self.complete(T.MAGIC_AND_CLAMAV, T.HEADER_SYNTAX, T.HEADER, request=request)
+
+        # act
+        ready1 = self.ready(request)
+        self.complete(T.SYNTAX, request=request)
+        ready2 = self.ready(request)
+
+        # assert
+        self.assertEqual(ready1, {T.SYNTAX})
+        self.assertTrue({T.BSDD, T.NORMATIVE_IA, T.NORMATIVE_IP, T.INDUSTRY_PRACTICES} <= ready2)
+        self.assertNotIn(T.INSTANCE_COMPLETION, ready2)
+
+    def test_failed_prerequisites_skip_dependent_tasks(self):
+
+        # arrange
+        T = ValidationTask.Type
+        request = self.requests[0]
+        self.complete(T.MAGIC_AND_CLAMAV, T.HEADER_SYNTAX, T.HEADER, request=request)
+        ValidationTask.objects.filter(request=request, type=T.SYNTAX).mark_as_failed()
+
+        # act
+        skipped = task_graph.skip_blocked_tasks([request.id])
+
+        # assert
+        skipped_types = set(ValidationTask.objects.filter(id__in=skipped).values_list('type', flat=True))
+        self.assertEqual(skipped_types, set(T) - {T.MAGIC_AND_CLAMAV, T.HEADER_SYNTAX, T.HEADER, T.SYNTAX})
+        self.assertEqual(self.ready(self.requests[1]), {T.MAGIC_AND_CLAMAV})
+
+    def test_critical_path_uses_measured_durations(self):
+
+        # arrange
+        T = ValidationTask.Type
+        request = self.requests[0]
+        start = timezone.now()
+        durations = {T.MAGIC_AND_CLAMAV: 1, T.SYNTAX: 10, T.SCHEMA: 100, T.HEADER_SYNTAX: 1, T.HEADER: 1, T.PREREQUISITES: 1, T.NORMATIVE_IA: 20}
+        for type, seconds in durations.items():
+            ValidationTask.objects.filter(request=request, type=type).update(started=start, ended=start + datetime.timedelta(seconds=seconds))
+
+        # act
+        paths = task_graph.critical_paths([request.id])
+
+        # assert
+        path, seconds = paths[request.id]
+        self.assertEqual(path, [T.MAGIC_AND_CLAMAV, T.SYNTAX, T.SCHEMA])
+        self.assertEqual(seconds, 111)
+
+
+class DurationPredictionTestCase(TestCase):
+
+    MB = 1024 * 1024
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.user = User.objects.get(id=1)
+        self.start = timezone.now() - datetime.timedelta(hours=1)
+
+    def add_task(self, size_mb, seconds, type=ValidationTask.Type.SYNTAX, schema=None, ended=None):
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=size_mb * self.MB)
+        if schema:
+            request.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=request.size, uploaded_by=self.user, schema=schema)
+            request.save()
+        task = ValidationTask.objects.create(request=request, type=type)
+        started = (ended or self.start) - datetime.timedelta(seconds=seconds)
+        ValidationTask.objects.filter(id=task.id).update(status=ValidationTask.Status.COMPLETED, started=started, ended=ended or self.start)
+        return request
+
+    def test_duration_seconds(self):
+
+        # arrange
+        self.add_task(1, 90.5)
+
+        # act
+        seconds = ValidationTask.objects.annotate(seconds=DurationSeconds('started', 'ended')).get().seconds
+
+        # assert
+        self.assertAlmostEqual(seconds, 90.5, places=2)
+
+    def test_predicts_duration_from_size(self):
+
+        # arrange
+        for size_mb in (1, 5, 10, 20):
+            self.add_task(size_mb, 10 + 2 * size_mb)
+        predictor = prediction.DurationPredictor()
+
+        # act
+        added = predictor.refresh()
+
+        # assert
+        self.assertEqual(added, 4)
+        self.assertAlmostEqual(predictor.predict_task(ValidationTask.Type.SYNTAX, 50 * self.MB), 110, places=1)
+        self.assertEqual(predictor.predict_task(ValidationTask.Type.SCHEMA, 50 * self.MB), predictor.default)
+
+    def test_refresh_only_adds_newly_completed_tasks(self):
+
+        # arrange
+        self.add_task(1, 10)
+        predictor = prediction.DurationPredictor()
+        predictor.refresh()
+        self.add_task(1, 30, ended=self.start + datetime.timedelta(minutes=1))
+
+        # act
+        added = predictor.refresh()
+
+        # assert
+        self.assertEqual(added, 1)
+        self.assertEqual(predictor.refresh(), 0)
+        self.assertAlmostEqual(predictor.predict_task(ValidationTask.Type.SYNTAX, self.MB), 20, places=1)
+
+    def test_refresh_adds_tasks_committed_late_once(self):
+
+        # arrange
+        self.add_task(1, 10, ended=self.start + datetime.timedelta(minutes=1))
+        predictor = prediction.DurationPredictor(overlap=300)
+        predictor.refresh()
+        self.add_task(1, 30, ended=self.start)  # ended before the previous refresh, but committed after it
+
+        # act
+        added = predictor.refresh()
+
+        # assert
+        self.assertEqual(added, 1)
+        self.assertEqual(predictor.refresh(), 0)
+        self.assertEqual(predictor.fits[(ValidationTask.Type.SYNTAX, None)].n, 2)
+        self.assertEqual(predictor.fits[(ValidationTask.Type.SYNTAX, prediction.ANY_SCHEMA)].n, 2)
+
+    def test_predicts_per_schema_and_critical_path(self):
+
+        # arrange
+        T = ValidationTask.Type
+        self.add_task(1, 10, type=T.SYNTAX, schema='IFC2X3')
+        self.add_task(1, 30, type=T.SYNTAX, schema='IFC4')
+        self.add_task(1, 100, type=T.SCHEMA, schema='IFC4')
+        self.add_task(1, 5, type=T.PARSE_INFO, schema='IFC4')
+        predictor = prediction.DurationPredictor()
+        predictor.refresh()
+        request = self.add_task(1, 0, type=T.SYNTAX, schema='IFC4')
+        ValidationTask.objects.create(request=request, type=T.SCHEMA)
+        ValidationTask.objects.create(request=request, type=T.PARSE_INFO)
+
+        # act
+        cost = predictor.predict(request)
+
+        # assert
+        self.assertAlmostEqual(cost.tasks[T.SYNTAX], 30, places=1)
+        self.assertAlmostEqual(cost.total, 135, places=1)
+        self.assertAlmostEqual(cost.critical_path, 130, places=1)
+        self.assertAlmostEqual(predictor.predict_task(T.SYNTAX, self.MB), 20, places=1)
+
+
+class AnalyticsTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.until = timezone.now().replace(second=0, microsecond=0)
+        self.since = self.until - datetime.timedelta(hours=1)
+        api = ValidationRequest.objects.create(file_name='api.ifc', file='api.ifc', size=1024, channel=ValidationRequest.Channel.API)
+        webui = ValidationRequest.objects.create(file_name='webui.ifc', file='webui.ifc', size=1024, channel=ValidationRequest.Channel.WEBUI)
+        tasks = []
+        for seconds in range(1, 101):
+            ended = self.until - datetime.timedelta(seconds=30 + seconds)
+            tasks.append(ValidationTask(request=api, type=ValidationTask.Type.SYNTAX, status=ValidationTask.Status.COMPLETED,
+                                        started=ended - datetime.timedelta(seconds=seconds), ended=ended))
+        tasks.append(ValidationTask(request=webui, type=ValidationTask.Type.SYNTAX, status=ValidationTask.Status.COMPLETED,
+                                    started=self.until - datetime.timedelta(minutes=10), ended=self.until - datetime.timedelta(minutes=5)))
+        tasks.append(ValidationTask(request=webui, type=ValidationTask.Type.SCHEMA, status=ValidationTask.Status.COMPLETED,
+                                    started=self.since - datetime.timedelta(hours=2), ended=self.since - datetime.timedelta(hours=1)))
+        ValidationTask.objects.bulk_create(tasks)
+
+    def test_with_duration_annotates_requests_and_tasks(self):
+
+        # arrange
+        request = ValidationRequest.objects.get(file_name='webui.ifc')
+        request.mark_as_initiated()
+        ValidationRequest.objects.filter(id=request.id).update(completed=request.started + datetime.timedelta(seconds=42))
+
+        # act
+        request = ValidationRequest.objects.with_duration().get(id=request.id)
+        task = ValidationTask.objects.with_duration().get(request=request, type=ValidationTask.Type.SYNTAX)
+
+        # assert
+        self.assertAlmostEqual(request.duration_seconds, 42, places=2)
+        self.assertAlmostEqual(task.duration_seconds, 300, places=2)
+
+    def test_duration_percentiles_per_type_and_channel(self):
+
+        # act
+        rows = analytics.duration_percentiles(self.since, self.until)
+
+        # assert
+        self.assertEqual(len(rows), 2)
+        api = next(row for row in rows if row['request__channel'] == 'API')
+        self.assertEqual(api['count'], 100)
+        self.assertAlmostEqual(api['p50'], 50.5, places=2)
+        self.assertAlmostEqual(api['p95'], 95.05, places=2)
+        self.assertAlmostEqual(api['p99'], 99.01, places=2)
+        webui = next(row for row in rows if row['request__channel'] == 'WEBUI')
+        self.assertAlmostEqual(webui['p99'], 300, places=2)
+
+    def test_duration_histogram(self):
+
+        # act
+        rows = analytics.duration_histogram(self.since, self.until, bounds=(10, 60), group_by=('type',))
+
+        # assert
+        self.assertEqual(
+            [(row['bucket'], row['count']) for row in rows],
+            [('<10', 9), ('10-60', 50), ('>=60', 42)],
+        )
+
+    def test_throughput_per_minute(self):
+
+        # act
+        rows = analytics.throughput(self.since, self.until, group_by=('request__channel',))
+
+        # assert
+        self.assertEqual(sum(row['count'] for row in rows if row['request__channel'] == 'API'), 100)
+        self.assertEqual(max(row['count'] for row in rows), 60)
+        self.assertEqual([row['count'] for row in rows if row['request__channel'] == 'WEBUI'], [1])
+
+
+class ResultReuseTestCase(TestCase):
+
+    CONTENT = b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n#1=IFCWALL('id',$,$,$,$,$,$,$,$);\nENDSEC;\nEND-ISO-10303-21;\n"
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.user = User.objects.get(id=1)
+        self.version = Version.objects.create(name='1.0.0', released=timezone.now())
+        self.source = self.create_request()
+        self.source.model = Model.objects.create(file_name='source.ifc', file='source.ifc', size=len(self.CONTENT), uploaded_by=self.user, schema='IFC4')
+        self.source.save()
+        instances = ModelInstance.objects.bulk_create([
+            ModelInstance(model=self.source.model, stepfile_id=i, ifc_type='IfcWall') for i in range(1, 4)
+        ])
+        start = timezone.now() - datetime.timedelta(minutes=5)
+        for type, seconds in ((ValidationTask.Type.SYNTAX, 30), (ValidationTask.Type.SCHEMA, 90)):
+            task = ValidationTask.objects.create(request=self.source, type=type)
+            ValidationOutcome.objects.bulk_create([
+                ValidationOutcome(validation_task=task, instance=instance, feature='ALB001 - Alignment', severity=ValidationOutcome.OutcomeSeverity.ERROR)
+                for instance in instances
+            ])
+            ValidationTask.objects.filter(id=task.id).mark_as_completed()
+            ValidationTask.objects.filter(id=task.id).update(started=start, ended=start + datetime.timedelta(seconds=seconds))
+        self.source.mark_as_completed()
+
+    def create_request(self, content=None):
+        return ValidationRequest.objects.create(
+            file_name='test.ifc', file=ContentFile(content or self.CONTENT, name='test.ifc'), size=len(content or self.CONTENT), validator_version=self.version
+        )
+
+    def test_content_hash_is_computed_on_upload(self):
+
+        # act
+        request = self.create_request()
+
+        # assert
+        self.assertEqual(request.content_hash, self.source.content_hash)
+        self.assertEqual(len(request.content_hash), 64)
+        self.assertNotEqual(self.create_request(b'other content').content_hash, request.content_hash)
+
+    def test_identical_upload_reuses_results(self):
+
+        # arrange
+        request = self.create_request()
+
+        # act
+        source = result_reuse.try_reuse(request)
+
+        # assert
+        self.assertEqual(source.id, self.source.id)
+        request = ValidationRequest.objects.get(id=request.id)
+        self.assertEqual(request.status, ValidationRequest.Status.COMPLETED)
+        self.assertEqual(request.reused_from_id, self.source.id)
+        self.assertEqual(request.error_count, 6)
+        self.assertNotEqual(request.model_id, self.source.model_id)
+        self.assertEqual(request.model.schema, 'IFC4')
+        self.assertEqual(request.model.instances.count(), 3)
+        self.assertEqual(request.model.type_counts(), self.source.model.type_counts())
+        outcomes = ValidationOutcome.objects.filter(validation_task__request=request)
+        self.assertEqual(outcomes.count(), 6)
+        self.assertEqual(set(outcomes.values_list('instance__model_id', flat=True)), {request.model_id})
+        self.assertEqual(ValidationOutcome.objects.filter(validation_task__request=self.source).count(), 6)
+
+    def test_different_version_or_content_is_not_reused(self):
+
+        # arrange
+        other_version = self.create_request()
+        other_version.validator_version = Version.objects.create(name='1.1.0', released=timezone.now())
+        other_version.save()
+        other_content = self.create_request(b'other content')
+
+        # act / assert
+        self.assertIsNone(result_reuse.try_reuse(other_version))
+        self.assertIsNone(result_reuse.try_reuse(other_content))
+        self.assertEqual(ValidationRequest.objects.get(id=other_content.id).status, ValidationRequest.Status.PENDING)
+
+    def test_reuse_stats(self):
+
+        # arrange
+        result_reuse.try_reuse(self.create_request())
+        result_reuse.try_reuse(self.create_request())
+        self.create_request(b'other content')
+
+        # act
+        stats = result_reuse.reuse_stats()
+
+        # assert
+        self.assertEqual(stats.requests, 4)
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.hit_rate, 0.5)
+        self.assertAlmostEqual(stats.saved_seconds, 240, places=1)
+
+
+class TaskResultCacheTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.user = User.objects.get(id=1)
+        self.version = Version.objects.create(name='1.0.0', released=timezone.now())
+        self.source = self.create_task()
+        instances = ModelInstance.objects.bulk_create([
+            ModelInstance(model=self.source.request.model, stepfile_id=i, ifc_type='IfcWall') for i in range(1, 4)
+        ])
+        ValidationOutcome.objects.bulk_create([
+            ValidationOutcome(validation_task=self.source, instance=instance, feature='ALB001 - Alignment', feature_version=1,
+                              severity=ValidationOutcome.OutcomeSeverity.ERROR)
+            for instance in instances
+        ] + [ValidationOutcome(validation_task=self.source, feature='ALS002 - Segments', feature_version=2,
+                               severity=ValidationOutcome.OutcomeSeverity.PASSED)])
+        self.source.mark_as_completed()
+        self.entry = TaskResult.store(self.source, self.version, {'ALB001 - Alignment': 1, 'ALS002 - Segments': 2})
+
+    def create_task(self, content_hash='a' * 64):
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024, content_hash=content_hash)
+        request.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=self.user)
+        request.save()
+        return ValidationTask.objects.create(request=request, type=ValidationTask.Type.NORMATIVE_IA)
+
+    def lookup(self, feature_versions, content_hash='a' * 64):
+        return TaskResult.objects.lookup(content_hash, ValidationTask.Type.NORMATIVE_IA, self.version, feature_versions)
+
+    def test_lookup_requires_same_feature_versions(self):
+
+        # act
+        hit = self.lookup({'ALB001 - Alignment': 1, 'ALS002 - Segments': 2})
+        changed = self.lookup({'ALB001 - Alignment': 2, 'ALS002 - Segments': 2})
+        other_file = self.lookup({'ALB001 - Alignment': 1, 'ALS002 - Segments': 2}, content_hash='b' * 64)
+
+        # assert
+        self.assertEqual(hit.id, self.entry.id)
+        self.assertIsNone(changed)
+        self.assertIsNone(other_file)
+
+    def test_features_without_outcomes_are_part_of_the_key(self):
+
+        # arrange
+        task = self.create_task(content_hash='c' * 64)
+        task.mark_as_completed()
+        executed = {'ALB001 - Alignment': 1, 'ALS003 - Segment shapes': 1}  # both ran, without outcomes
+
+        # act
+        entry = TaskResult.store(task, self.version, executed)
+
+        # assert
+        self.assertEqual(self.lookup(executed, content_hash='c' * 64).id, entry.id)
+        self.assertIsNone(self.lookup({}, content_hash='c' * 64))
+
+    def test_reuse_copies_outcomes_and_links_instances(self):
+
+        # arrange
+        task = self.create_task()
+        existing = ModelInstance.objects.create(model=task.request.model, stepfile_id=2, ifc_type='IfcWall')
+
+        # act
+        copied = self.entry.reuse(task)
+
+        # assert
+        self.assertEqual(copied, 4)
+        task = ValidationTask.objects.get(id=task.id)
+        self.assertEqual(task.status, ValidationTask.Status.COMPLETED)
+        self.assertEqual((task.error_count, task.passed_count), (3, 1))
+        outcomes = ValidationOutcome.objects.filter(validation_task=task, instance__isnull=False)
+        self.assertEqual(set(outcomes.values_list('instance__model_id', flat=True)), {task.request.model_id})
+        self.assertIn(existing.id, outcomes.values_list('instance_id', flat=True))
+        self.assertEqual(task.request.model.instances.count(), 3)
+        self.assertEqual(TaskResult.objects.get(id=self.entry.id).hits, 1)
+
+    def test_invalidate_feature_version(self):
+
+        # act
+        other_version = TaskResult.objects.invalidate_feature('ALB001 - Alignment', 2)
+        deleted = TaskResult.objects.invalidate_feature('ALB001 - Alignment', 1)
+
+        # assert
+        self.assertEqual(other_version, 0)
+        self.assertEqual(deleted, 1)
+        self.assertFalse(TaskResult.objects.exists())
+
+    def test_eviction_policies(self):
+
+        # arrange
+        task = self.create_task(content_hash='b' * 64)
+        task.mark_as_completed()
+        other = TaskResult.store(task, self.version, {})
+        TaskResult.objects.filter(id=self.entry.id).update(last_used=timezone.now() - datetime.timedelta(days=100))
+        out = io.StringIO()
+
+        # act
+        call_command('evict_task_results', '--unused-days', '90', stdout=out)
+
+        # assert
+        self.assertIn('Evicted 1 Task Result(s)', out.getvalue())
+        self.assertEqual(list(TaskResult.objects.values_list('id', flat=True)), [other.id])
+        self.assertEqual(TaskResult.objects.evict(max_entries=0), 1)
+
+
+
+class ModelInstanceBulkUpsertTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+
+    def test_bulk_upsert_returns_ids_of_new_and_existing_instances(self):
+
+        # arrange
+        existing = ModelInstance.objects.create(model=self.model, stepfile_id=2, ifc_type='IfcSlab', fields={'Name': 'old'})
+        rows = [(i, 'IfcWall', {'Name': f'#{i}'}) for i in range(1, 8)]
+
+        # act
+        id_map = ModelInstance.objects.bulk_upsert(self.model, rows, batch_size=3)
+
+        # assert
+        self.assertEqual(self.model.instances.count(), 7)
+        self.assertEqual(id_map, dict(self.model.instances.values_list('stepfile_id', 'id')))
+        self.assertEqual(id_map[2], existing.id)
+        existing.refresh_from_db()
+        self.assertEqual((existing.ifc_type, existing.fields), ('IfcSlab', {'Name': 'old'}))
+
+    def test_bulk_upsert_updates_existing_instances(self):
+
+        # arrange
+        existing = ModelInstance.objects.create(model=self.model, stepfile_id=2, ifc_type='IfcSlab')
+
+        # act
+        id_map = ModelInstance.objects.bulk_upsert(self.model, [(2, 'IfcWall', {'Name': 'new'}), (3, 'IfcDoor', None)], update=True)
+
+        # assert
+        self.assertEqual(id_map[2], existing.id)
+        existing.refresh_from_db()
+        self.assertEqual((existing.ifc_type, existing.fields), ('IfcWall', {'Name': 'new'}))
+        self.assertIsNotNone(existing.updated)
+        self.assertEqual(ModelInstance.objects.get(id=id_map[3]).ifc_type, 'IfcDoor')
+
+    def test_bulk_upsert_uses_few_queries(self):
+
+        # arrange
+        rows = [(i, 'IfcWall', None) for i in range(1, 1001)]
+
+        # act
+        with CaptureQueriesContext(connection) as queries:
+            id_map = ModelInstance.objects.bulk_upsert(self.model, rows, update=True, batch_size=500)
+
+        # assert
+        self.assertEqual(len(id_map), 1000)
+        self.assertLessEqual(len([q for q in queries.captured_queries if 'ifc_model_instance' in q['sql']]), 10)
+
+    def test_bulk_upsert_inserts_new_rows_in_one_statement_per_chunk(self):
+
+        # arrange
+        rows = [(i, 'IfcWall', None) for i in range(1, 1001)]
+
+        # act
+        with CaptureQueriesContext(connection) as queries:
+            ModelInstance.objects.bulk_upsert(self.model, rows, batch_size=500)
+
+        # assert
+        statements = [q['sql'] for q in queries.captured_queries if '"ifc_model_instance"' in q['sql']]
+        if connection.features.can_return_rows_from_bulk_insert:
+            self.assertTrue(statements)
+            self.assertTrue(all(sql.startswith('INSERT') and 'RETURNING' in sql for sql in statements))
+
+    def test_repeated_upserts_count_each_instance_once(self):
+
+        # arrange
+        rows = [(i, 'IfcWall', None) for i in range(1, 11)]
+
+        for returning in (True, False):  # INSERT ... RETURNING, or bulk_create() on databases without it
+            with self.subTest(returning=returning), mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', mock.PropertyMock(return_value=returning)):
+                model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+                ModelInstance.objects.bulk_upsert(model, rows[:6], batch_size=1)
+
+                # act
+                ModelInstance.objects.bulk_upsert(model, rows, batch_size=4)
+                id_map = ModelInstance.objects.bulk_upsert(model, rows[4:], batch_size=1)
+                ModelInstance.objects.bulk_upsert(model, [(1, 'IfcSlab', None), (11, 'IfcSlab', None)], update=True)
+                ModelInstance.objects.bulk_upsert(model, [(1, 'IfcSlab', None)], update=True)
+
+                # assert
+                self.assertEqual(len(id_map), 6)
+                self.assertEqual(model.type_counts(), {'IfcWall': 9, 'IfcSlab': 2})
+                self.assertEqual(model.type_counts(), ModelTypeHistogram.objects.refresh(model))
+
+    def test_benchmark_command(self):
+
+        # arrange
+        out = io.StringIO()
+
+        # act
+        call_command('benchmark_instance_upsert', '--instances', '50', '--row-by-row', '10', '--batch-size', '20', stdout=out)
+
+        # assert
+        self.assertIn('Mapped 50 stepfile id(s)', out.getvalue())
+        self.assertEqual(ModelInstance.objects.count(), 0)
+
+
+class InstanceIdResolverTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+        self.id_map = ModelInstance.objects.bulk_upsert(self.model, [(i, 'IfcWall', None) for i in range(1000, 0, -3)])
+
+    def test_load_resolves_batches(self):
+
+        # act
+        resolver = instance_ids.InstanceIdResolver.load(self.model)
+        resolved = list(resolver.resolve([1, 2, 4, 1000, 5000]))
+
+        # assert
+        expected = dict(self.model.instances.values_list('stepfile_id', 'id'))
+        self.assertEqual(resolver, expected)
+        self.assertEqual(self.id_map, expected)
+        self.assertEqual(resolved, [expected[1], 0, expected[4], expected[1000], 0])
+        self.assertNotIn(2, resolver)
+        self.assertEqual(resolver.nbytes, 16 * len(expected))
+
+    def test_from_arrays_sorts_and_keeps_last_duplicate(self):
+
+        # act
+        resolver = instance_ids.InstanceIdResolver.from_arrays(array('q', [5, 1, 5, 3]), array('q', [50, 10, 51, 30]))
+
+        # assert
+        self.assertEqual(list(resolver.items()), [(1, 10), (3, 30), (5, 51)])
+
+    def test_save_and_open_memory_mapped(self):
+
+        # arrange
+        resolver = instance_ids.InstanceIdResolver.load(self.model)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'instance_ids.bin')
+
+            # act
+            resolver.save(path)
+            mapped = instance_ids.InstanceIdResolver.open(path)
+
+            # assert
+            self.assertEqual(os.path.getsize(path), instance_ids.HEADER.size + resolver.nbytes)
+            self.assertEqual(mapped, resolver)
+            self.assertEqual(list(mapped.resolve([1, 2])), [resolver[1], 0])
+
+
+class InstanceMaterializationTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024, model=self.model)
+        self.task = ValidationTask.objects.create(request=request, type=ValidationTask.Type.NORMATIVE_IA)
+        self.source = materialization.InstanceSource()
+        for i in range(1, 101):
+            self.source.add(i, 'IfcWall', {'Name': f'Wall #{i}'})
+
+    def tearDown(self):
+        self.source.close()
+
+    def outcomes(self, stepfile_ids):
+        return [
+            (stepfile_id, ValidationOutcome(validation_task=self.task, feature='ALB001 - Alignment', feature_version=1,
+                                            severity=ValidationOutcome.OutcomeSeverity.ERROR))
+            for stepfile_id in stepfile_ids
+        ]
+
+    def test_lazy_mode_only_creates_referenced_instances(self):
+
+        # arrange
+        materializer = materialization.InstanceMaterializer(self.model, self.source, mode=materialization.LAZY)
+
+        # act
+        materializer.create_outcomes(self.outcomes([7, 3, 7, None, 500]), batch_size=2)
+        materializer.create_outcomes(self.outcomes([3, 9]))
+
+        # assert
+        self.assertEqual(sorted(self.model.instances.values_list('stepfile_id', flat=True)), [3, 7, 9])
+        self.assertEqual(ModelInstance.objects.get(model=self.model, stepfile_id=9).fields, {'Name': 'Wall #9'})
+        linked = ValidationOutcome.objects.filter(validation_task=self.task).values_list('instance__stepfile_id', flat=True)
+        self.assertEqual(sorted(linked, key=lambda i: i or 0), [None, None, 3, 3, 7, 7, 9])
+        self.assertEqual(self.model.type_counts(), {'IfcWall': 100})  # all entities of the source, not only those materialized
+        self.assertEqual(ModelTypeHistogram.objects.refresh(self.model), {'IfcWall': 100})
+        model = Model.objects.get(id=self.model.id)
+        self.assertFalse(model.instances_materialized)
+        self.assertEqual(model.number_of_geometries, 0)
+        self.assertEqual(ValidationTask.objects.get(id=self.task.id).error_count, 7)
+        metrics = materializer.metrics.as_dict()
+        self.assertEqual((metrics['materialized_rows'], metrics['rows_avoided']), (3, 97))
+        self.assertEqual(metrics['bytes_avoided'], self.source.nbytes - metrics['materialized_bytes'])
+        self.assertGreater(metrics['materialized_bytes'], 0)
+
+    def test_eager_mode_creates_all_instances(self):
+
+        # arrange
+        materializer = materialization.InstanceMaterializer(self.model, self.source, mode=materialization.EAGER)
+
+        # act
+        materializer.create_outcomes(self.outcomes([7, 500]))
+
+        # assert
+        self.assertEqual(self.model.instances.count(), 100)
+        self.assertEqual(materializer.metrics.rows_avoided, 0)
+        linked = ValidationOutcome.objects.filter(validation_task=self.task).values_list('instance__stepfile_id', flat=True)
+        self.assertEqual(sorted(linked, key=lambda i: i or 0), [None, 7])
+        self.assertIsInstance(materializer.resolver, instance_ids.InstanceIdResolver)
+        self.assertEqual(materializer.ids, {})
+        self.assertEqual(Model.objects.get(id=self.model.id).number_of_geometries, 0)
+
+
+class InstanceFieldsStorageTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+        self.fields = {'Name': 'Wall', 'Description': 'Load bearing wall ' * 20}
+
+    def test_compressed_storage_is_transparent(self):
+
+        # arrange
+        with self.settings_storage(instance_fields.COMPRESSED):
+            instance = ModelInstance.objects.create(model=self.model, stepfile_id=1, ifc_type='IfcWall', fields=self.fields)
+            ModelInstance.objects.bulk_upsert(self.model, [(2, 'IfcWall', self.fields), (3, 'IfcSlab', None)])
+
+        # act
+        loaded = ModelInstance.objects.get(id=instance.id)
+        with self.assertNumQueries(1):
+            fields = loaded.fields
+
+        # assert
+        self.assertEqual(fields, self.fields)
+        self.assertEqual(instance.fields, self.fields)
+        self.assertEqual(ModelInstance.objects.filter(fields__isnull=True).count(), 3)
+        self.assertEqual(ModelInstance.objects.get(stepfile_id=2).fields, self.fields)
+        self.assertIsNone(ModelInstance.objects.get(stepfile_id=3).fields)
+        self.assertLess(ModelInstanceFields.objects.get(instance=instance).size, len(self.fields['Description']))
+
+    def test_save_keeps_offloaded_fields_in_side_table(self):
+
+        # arrange
+        with self.settings_storage(instance_fields.COMPRESSED):
+            instance = ModelInstance.objects.create(model=self.model, stepfile_id=1, ifc_type='IfcWall', fields=self.fields)
+        loaded = ModelInstance.objects.get(id=instance.id)
+
+        # act
+        loaded.fields = {'Name': 'Slab'}
+        loaded.save()
+
+        # assert
+        self.assertEqual(ModelInstance.objects.get(id=instance.id).fields, {'Name': 'Slab'})
+        self.assertEqual(ModelInstance.objects.filter(id=instance.id, fields__isnull=True, fields_offloaded=True).count(), 1)
+
+    def test_prefetch_loads_fields_in_one_query(self):
+
+        # arrange
+        with self.settings_storage(instance_fields.COMPRESSED):
+            ModelInstance.objects.bulk_upsert(self.model, [(i, 'IfcWall', {'Name': f'#{i}'}) for i in range(1, 51)])
+        instances = list(self.model.instances.order_by('stepfile_id'))
+
+        # act
+        with self.assertNumQueries(1):
+            instance_fields.prefetch(instances)
+            names = [instance.fields['Name'] for instance in instances]
+
+        # assert
+        self.assertEqual(names, [f'#{i}' for i in range(1, 51)])
+
+    def test_clone_copies_fields_in_the_configured_storage(self):
+
+        # arrange
+        with self.settings_storage(instance_fields.COMPRESSED):
+            ModelInstance.objects.bulk_upsert(self.model, [(i, 'IfcWall', {'Name': f'#{i}'}) for i in range(1, 51)])
+        ModelInstance.objects.create(model=self.model, stepfile_id=51, ifc_type='IfcWall', fields={'Name': '#51'})
+        target = Model.objects.create(file_name='copy.ifc', file='copy.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+        other = Model.objects.create(file_name='other.ifc', file='other.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+        instances = list(self.model.instances.order_by('stepfile_id'))
+
+        # act
+        with self.settings_storage(instance_fields.COMPRESSED), self.assertNumQueries(4):
+            instance_fields.clone(instances, target.id)
+        with self.settings_storage(instance_fields.INLINE):
+            instance_fields.clone(instances, other.id)
+
+        # assert
+        self.assertEqual(target.instances.filter(fields_offloaded=True, fields__isnull=True).count(), 51)
+        self.assertEqual(other.instances.filter(fields_offloaded=False, fields__isnull=False).count(), 51)
+        for model in (target, other):
+            names = [instance.fields['Name'] for instance in model.instances.order_by('stepfile_id')]
+            self.assertEqual(names, [f'#{i}' for i in range(1, 52)])
+
+    def test_offload_command_moves_existing_fields(self):
+
+        # arrange
+        ModelInstance.objects.bulk_upsert(self.model, [(i, 'IfcWall', self.fields) for i in range(1, 6)])
+        out = io.StringIO()
+
+        # act
+        call_command('offload_instance_fields', '--batch-size', '2', stdout=out)
+
+        # assert
+        self.assertIn('Offloaded the fields of 5 Model Instance(s)', out.getvalue())
+        self.assertEqual(ModelInstanceFields.objects.count(), 5)
+        self.assertEqual(ModelInstance.objects.filter(fields_offloaded=True, fields__isnull=True).count(), 5)
+        self.assertEqual(ModelInstance.objects.get(stepfile_id=4).fields, self.fields)
+
+        # act
+        call_command('offload_instance_fields', '--inline', stdout=out)
+
+        # assert
+        self.assertEqual(ModelInstanceFields.objects.count(), 0)
+        self.assertEqual(ModelInstance.objects.filter(fields=self.fields, fields_offloaded=False).count(), 5)
+
+    def test_compressed_storage_is_refused_while_whitelisting_instance_fields(self):
+
+        # arrange
+        entry = WhiteListEntry.objects.create(description='Walls')
+        fragment = WhiteListQueryFragment.objects.create(
+            whitelist_entry=entry,
+            column=WhiteListQueryFragment.OutcomeColumn.INSTANCE_FIELDS,
+            operation=WhiteListQueryFragment.Operation.CONTAINS,
+            right_hand_side='Wall'
+        )
+
+        # act / assert
+        with self.settings_storage(instance_fields.COMPRESSED):
+            with self.assertRaises(ImproperlyConfigured):
+                ModelInstance.objects.create(model=self.model, stepfile_id=1, ifc_type='IfcWall', fields=self.fields)
+            with self.assertRaises(ValidationError):
+                fragment.full_clean()
+        fragment.full_clean()  # inline storage
+        with self.assertRaises(ImproperlyConfigured):
+            call_command('offload_instance_fields', stdout=io.StringIO())
+
+    @staticmethod
+    def settings_storage(value):
+        return mock.patch('apps.ifc_validation_models.settings.INSTANCE_FIELDS_STORAGE', value)
+
+
+class IfcTypeTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+
+    def test_ifc_type_attribute_is_stored_in_lookup_table(self):
+
+        # act
+        wall = ModelInstance.objects.create(model=self.model, stepfile_id=1, ifc_type='IfcWall')
+        ModelInstance.objects.bulk_upsert(self.model, [(2, 'IfcWall', None), (3, 'IfcSlab', None)])
+
+        # assert
+        self.assertEqual(IfcType.objects.count(), 2)
+        self.assertEqual(ModelInstance.objects.get(id=wall.id).ifc_type, 'IfcWall')
+        self.assertEqual(ModelInstance.objects.get(stepfile_id=3).type.name, 'IfcSlab')
+        self.assertEqual(sorted(ModelInstance.objects.of_type('IfcWall').values_list('stepfile_id', flat=True)), [1, 2])
+        self.assertFalse(ModelInstance.objects.of_type('IfcDoor').exists())
+        self.assertFalse(IfcType.objects.filter(name='IfcDoor').exists())
+
+    def test_types_created_in_uncommitted_transaction_are_not_cached(self):
+
+        # act
+        type_id = IfcType.id_of('IfcBeam')
+
+        # assert
+        self.assertNotIn('IfcBeam', IfcType._ids)
+        self.assertEqual(IfcType.name_of(type_id), 'IfcBeam')
+        self.assertNotIn(type_id, IfcType._names)
+
+    def test_whitelist_on_instance_type(self):
+
+        # arrange
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024, model=self.model)
+        task = ValidationTask.objects.create(request=request, type=ValidationTask.Type.NORMATIVE_IA)
+        for stepfile_id, ifc_type in ((1, 'IfcWall'), (2, 'IfcSlab')):
+            instance = ModelInstance.objects.create(model=self.model, stepfile_id=stepfile_id, ifc_type=ifc_type)
+            ValidationOutcome.objects.create(validation_task=task, instance=instance, feature='ALB001 - Alignment',
+                                             severity=ValidationOutcome.OutcomeSeverity.ERROR)
+        entry = WhiteListEntry.objects.create(description='Walls')
+        WhiteListQueryFragment.objects.create(
+            whitelist_entry=entry,
+            column=WhiteListQueryFragment.OutcomeColumn.INSTANCE_TYPE,
+            operation=WhiteListQueryFragment.Operation.EQUALS,
+            right_hand_side='ifcwall'
+        )
+
+        # act
+        outcomes = ValidationOutcome.objects.filter(validation_task=task).with_effective_severity()
+        severities = dict(outcomes.values_list('instance__stepfile_id', 'effective_severity'))
+
+        # assert
+        self.assertEqual(severities, {1: ValidationOutcome.OutcomeSeverity.PASSED, 2: ValidationOutcome.OutcomeSeverity.ERROR})
+
+
+class ModelTypeHistogramTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1), schema='IFC4')
+
+    def test_bulk_upsert_fills_histogram_and_counts(self):
+
+        # arrange
+        rows = [(i, 'IfcWall', None) for i in range(1, 6)] + [(i, 'IfcShapeRepresentation', None) for i in range(6, 9)]
+
+        # act
+        ModelInstance.objects.bulk_upsert(self.model, rows)
+        ModelInstance.objects.bulk_upsert(self.model, rows[:2])
+
+        # assert
+        self.assertEqual(self.model.type_counts(), {'IfcWall': 5, 'IfcShapeRepresentation': 3})
+        self.assertEqual(self.model.type_counts(), ModelTypeHistogram.objects.refresh(self.model))
+        self.assertIsNone(Model.objects.get(id=self.model.id).number_of_geometries)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.model.count_of('IfcWall', 'IfcDoor'), 5)
+
+    def test_derive_instance_counts_keeps_values_that_were_set(self):
+
+        # arrange
+        ModelInstance.objects.bulk_upsert(self.model, [(i, 'IfcShapeRepresentation', None) for i in range(1, 4)])
+        other = Model.objects.create(file_name='other.ifc', file='other.ifc', size=1024, uploaded_by=User.objects.get(id=1), number_of_geometries=42)
+        ModelInstance.objects.bulk_upsert(other, [(1, 'IfcShapeRepresentation', None)])
+
+        # act
+        self.model.derive_instance_counts()
+        other.derive_instance_counts()
+
+        # assert
+        self.assertEqual(Model.objects.get(id=self.model.id).number_of_geometries, 3)
+        self.assertEqual(Model.objects.get(id=other.id).number_of_geometries, 42)
+        other.derive_instance_counts(overwrite=True)
+        self.assertEqual(Model.objects.get(id=other.id).number_of_geometries, 1)
+
+    def test_deletes_are_subtracted_from_histogram(self):
+
+        # arrange
+        ModelInstance.objects.bulk_upsert(self.model, [(i, 'IfcWall', None) for i in range(1, 6)] + [(6, 'IfcSlab', None)])
+        ModelTypeHistogram.objects.add(self.model.id, IfcType.ids_of(['IfcDoor'])['IfcDoor'], 2)
+        ModelTypeHistogram.objects.add(self.model.id, IfcType.ids_of(['IfcDoor'])['IfcDoor'], 1)
+
+        # act
+        ModelInstance.objects.get(model=self.model, stepfile_id=1).delete()
+        ModelInstance.objects.filter(model=self.model, stepfile_id__in=[2, 3, 6]).delete()
+
+        # assert
+        self.assertEqual(self.model.type_counts(), {'IfcWall': 2, 'IfcDoor': 3})
+        self.assertFalse(ModelTypeHistogram.objects.filter(model=self.model, count=0).exists())
+
+    def test_save_keeps_histogram_up_to_date(self):
+
+        # arrange
+        wall = ModelInstance.objects.create(model=self.model, stepfile_id=1, ifc_type='IfcWall')
+        ModelInstance.objects.create(model=self.model, stepfile_id=2, ifc_type='IfcWall')
+
+        # act
+        wall = ModelInstance.objects.get(id=wall.id)
+        wall.ifc_type = 'IfcSlab'
+        wall.save()
+
+        # assert
+        self.assertEqual(self.model.type_counts(), {'IfcWall': 1, 'IfcSlab': 1})
+        self.assertEqual(self.model.type_counts(), ModelTypeHistogram.objects.refresh(self.model))
+
+    def test_instances_of_type_use_composite_index(self):
+
+        # arrange
+        ModelInstance.objects.bulk_upsert(self.model, [(1, 'IfcWall', None)])
+        queryset = ModelInstance.objects.filter(model=self.model).of_type('IfcWall')
+
+        # act
+        plan = queryset.explain()
+
+        # assert
+        self.assertIn(ModelInstance._meta.indexes[0].name, plan)
+
+
+class PublicIdBatchTestCase(TestCase):
+
+    def test_to_public_ids_matches_to_public_id(self):
+
+        # arrange
+        ids = [1, 2, 999_999_999, 123_456_789_012]
+
+        # act
+        public_ids = ValidationTask.to_public_ids(ids)
+        from_array = ValidationTask.to_public_ids(array('q', ids))
+        with_none = IdObfuscator.to_public_ids([5, None], override_cls=ModelInstance)
+
+        # assert
+        self.assertEqual(public_ids, [ValidationTask.to_public_id(id) for id in ids])
+        self.assertEqual(from_array, public_ids)
+        self.assertEqual(with_none, [ModelInstance.to_public_id(5), None])
+
+    def test_to_private_ids_round_trips_and_validates_prefix(self):
+
+        # arrange
+        ids = list(range(1, 1001))
+        public_ids = ValidationRequest.to_public_ids(ids)
+
+        # act
+        private_ids = ValidationRequest.to_private_ids(public_ids)
+
+        # assert
+        self.assertEqual(private_ids, ids)
+        with self.assertRaisesRegex(ValueError, 't123'):
+            ValidationRequest.to_private_ids([public_ids[0], 't123'])
+        with self.assertRaisesRegex(ValueError, 'rabc'):
+            ValidationRequest.to_private_ids(['rabc'])
+
+    def test_to_private_ids_rejects_malformed_bodies(self):
+
+        # arrange
+        malformed = ['r-5', 'r 12', 'r1_000', 'r+7', 'r12 ', 'r\u0661\u0662', 'r']
+
+        for public_id in malformed:
+            with self.subTest(public_id=public_id):
+
+                # act / assert
+                with self.assertRaises(ValueError):
+                    ValidationRequest.to_private_ids([ValidationRequest.to_public_id(1), public_id])
+                with self.assertRaises(ValueError):
+                    ValidationRequest.to_private_id(public_id)
+                with self.assertRaises(ValueError):
+                    ValidationRequest.objects.filter_public([public_id])
+
+    def test_outcome_to_dicts(self):
+
+        # arrange
+        ValidationModelsTestCase.set_user_context()
+        model = Model.objects.create(file_name='test.ifc', file='test.ifc', size=1024, uploaded_by=User.objects.get(id=1))
+        request = ValidationRequest.objects.create(file_name='test.ifc', file='test.ifc', size=1024, model=model)
+        task = ValidationTask.objects.create(request=request, type=ValidationTask.Type.NORMATIVE_IA)
+        instance = ModelInstance.objects.create(model=model, stepfile_id=1, ifc_type='IfcWall')
+        ValidationOutcome.objects.bulk_create([
+            ValidationOutcome(validation_task=task, instance=instance, feature='ALB001 - Alignment', severity=ValidationOutcome.OutcomeSeverity.ERROR),
+            ValidationOutcome(validation_task=task, feature='ALB001 - Alignment', severity=ValidationOutcome.OutcomeSeverity.PASSED),
+        ])
+        outcomes = ValidationOutcome.objects.filter(validation_task=task).order_by('id')
+
+        # act
+        with self.assertNumQueries(2):
+            dicts = ValidationOutcome.to_dicts(outcomes)
+
+        # assert
+        self.assertEqual([d['severity'] for d in dicts], ['Error', 'Passed'])
+        self.assertEqual([d['instance_id'] for d in dicts], [instance.public_id, None])
+        self.assertEqual({d['validation_task_id'] for d in dicts}, {task.public_id})
+        self.assertEqual(outcomes[0].to_dict(), dicts[0])
+
+
+class PublicIdLookupTestCase(TestCase):
+
+    def setUp(self):
+        ValidationModelsTestCase.set_user_context()
+        self.requests = [ValidationRequest.objects.create(file_name=f'test{i}.ifc', file='test.ifc', size=1024) for i in range(3)]
+
+    def test_in_bulk_public_preserves_order_in_one_query(self):
+
+        # arrange
+        unknown = ValidationRequest.to_public_id(10_000)
+        public_ids = [self.requests[2].public_id, unknown, self.requests[0].public_id]
+
+        # act
+        with self.assertNumQueries(1):
+            found = ValidationRequest.objects.in_bulk_public(public_ids)
+
+        # assert
+        self.assertEqual(list(found), [self.requests[2].public_id, self.requests[0].public_id])
+        self.assertEqual(found[self.requests[0].public_id].id, self.requests[0].id)
+        with self.assertRaisesRegex(ValidationRequest.DoesNotExist, unknown):
+            ValidationRequest.objects.in_bulk_public(public_ids, strict=True)
+
+    def test_filter_public_validates_prefix(self):
+
+        # act
+        selected = ValidationRequest.objects.filter_public(r.public_id for r in self.requests[:2])
+
+        # assert
+        self.assertEqual(sorted(selected.values_list('id', flat=True)), [r.id for r in self.requests[:2]])
+        with self.assertRaises(ValueError):
+            ValidationTask.objects.filter_public([self.requests[0].public_id])
+        with self.assertRaises(TypeError):
+            Company.objects.filter_public(['c1'])